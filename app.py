@@ -1,39 +1,180 @@
-from flask import Flask, render_template, request, redirect, url_for, session
+from flask import Flask, render_template, request, redirect, url_for, session, jsonify, Response, stream_with_context
+import importlib
+import json
 import os
+import time
 
-# === Import your methods ===
-from models.bm25_search import search_specific as bm25_specific_search
-from models.hybrid_search import search_general as hybrid_general_search
-from models.fast_genre_recommend import recommend_movies_by_genre_fast
+# Engine modules (and NLTK, pandas, requests behind them) are imported by the
+# routes that use them, so importing the app stays cheap; warmup() loads them
+# all up front in a deployment
+from models.facets import GENRES, DEFAULT_YEAR_RANGE
+from models.result_cache import result_cache
 
 # === Flask App Setup ===
 app = Flask(__name__)
 app.secret_key = 'your-secret-key-here'  # Required for session management
 
+# (stage name, module, loader); a stage's time includes importing its module
+WARMUP_STAGES = (
+    ("specific search engine", "models.bm25_search", "warmup"),
+    ("general search engine", "models.hybrid_search", "warmup"),
+    ("RankNet recommendations", "models.ranknet_engine", "warmup"),
+    ("links catalog", "models.title_catalog", "get_catalog"),
+)
+
+def warmup():
+    """Load every search engine up front so no request pays for imports or deserialization.
+
+    Returns ``[(stage, seconds), ...]``, failed stages included.
+    """
+    timings = []
+    for name, module, loader in WARMUP_STAGES:
+        started = time.perf_counter()
+        try:
+            getattr(importlib.import_module(module), loader)()
+            print(f"🔥 Warmed up {name} in {time.perf_counter() - started:.2f}s")
+        except Exception as e:
+            # Engines fall back to loading lazily on their first request
+            print(f"⚠️  Warmup failed for {name}: {e}")
+        timings.append((name, time.perf_counter() - started))
+    return timings
+
 @app.route('/')
 def home():
     return render_template('user_id_entry.html')
 
+def parse_year(value, field):
+    """A year bound; None or blank leaves that end open, anything else must be an integer"""
+    if value is None or (isinstance(value, str) and not value.strip()):
+        return None
+    if isinstance(value, bool) or (isinstance(value, float) and not value.is_integer()):
+        raise ValueError(f"'{field}' must be an integer year")
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"'{field}' must be an integer year") from None
+
+def year_params(params):
+    """Year range from form or JSON fields; requests without them keep the default filter"""
+    if 'year_from' not in params and 'year_to' not in params:
+        return DEFAULT_YEAR_RANGE
+    return parse_year(params.get('year_from'), 'year_from'), parse_year(params.get('year_to'), 'year_to')
+
+def facet_params(form):
+    """Year range and genres from a search form; raises ValueError for a malformed year"""
+    genres = [genre for genre in form.getlist('genres') if genre.strip()]
+    return year_params(form), genres
+
 @app.route('/search_page')
 def search_page():
-    return render_template('search_page.html')
+    return render_template('search_page.html', genres=GENRES)
+
+def run_search(query, search_type, year_range, genres):
+    # Posters are left to the page, which loads them from /api/posters after rendering
+    if search_type == "specific":
+        from models.bm25_search import search_specific
+        return search_specific(query, year_range=year_range, genres=genres, fetch_posters=False)
+    from models.hybrid_search import search_general
+    return search_general(query, year_range=year_range, genres=genres, fetch_posters=False)
 
 @app.route('/search', methods=['POST'])
 def search():
     query = request.form['query']
     search_type = request.form['search_type']
 
-    print(f"🔎 Received query: {query} | Type: {search_type}")
-
-    if search_type == "specific":
-        lines = bm25_specific_search(query)
-    else:
-        lines = hybrid_general_search(query)
+    try:
+        year_range, genres = facet_params(request.form)
+        print(f"🔎 Received query: {query} | Type: {search_type} | Years: {year_range} | Genres: {genres}")
+        lines = run_search(query, search_type, year_range, genres)
+    except ValueError as e:
+        return render_template('results.html', results=[], message=str(e))
 
     if not lines:
         return render_template('results.html', results=[], message="No match found.")
     return render_template('results.html', results=lines)
 
+@app.route('/api/search', methods=['GET', 'POST'])
+def api_search():
+    """Search results as JSON, without posters: ``{"results": [{title, link1, link2}, ...]}``.
+
+    Takes the search form's fields as query or form parameters.
+    """
+    query = request.values.get('query', '')
+    if not query.strip():
+        return jsonify({'error': "'query' is required"}), 400
+    try:
+        year_range, genres = facet_params(request.values)
+        results = run_search(query, request.values.get('search_type', 'specific'), year_range, genres)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    return jsonify({'results': results})
+
+# Titles accepted per poster request; the results page asks in smaller batches
+MAX_POSTER_TITLES = 50
+
+@app.route('/api/posters', methods=['POST'])
+def api_posters():
+    """Resolve posters for JSON ``{"titles": [...]}``, streamed as NDJSON.
+
+    Each line is ``{"title": ..., "poster_url": ...}`` and is sent as soon as
+    that title's lookup finishes, so cached posters show up without waiting
+    for slow OMDB requests.
+    """
+    payload = request.get_json(silent=True)
+    titles = payload.get('titles') if isinstance(payload, dict) else None
+    if not isinstance(titles, list) or not all(isinstance(t, str) for t in titles):
+        return jsonify({'error': "'titles' must be a list of strings"}), 400
+    if len(titles) > MAX_POSTER_TITLES:
+        return jsonify({'error': f"At most {MAX_POSTER_TITLES} titles per request"}), 400
+
+    from models.omdb_poster import iter_movie_posters
+
+    def lines():
+        for title, poster_url in iter_movie_posters(titles):
+            yield json.dumps({'title': title, 'poster_url': poster_url}) + "\n"
+    return Response(stream_with_context(lines()), mimetype='application/x-ndjson')
+
+# Upper bound on queries per batch request, so one call can't hold a worker for minutes
+MAX_BATCH_QUERIES = 1000
+
+@app.route('/api/search/batch', methods=['POST'])
+def search_batch():
+    """Run many queries in one request: JSON ``{"queries": [...], "search_type": ...}``.
+
+    Optional ``year_from``, ``year_to`` and ``genres`` work as on the search
+    form. Returns ``{"results": [...]}`` with one result list per query, in
+    the format the single search returns, without posters: OMDB allows about
+    ten lookups a second, far too few for a full batch within the worker
+    timeout, so clients resolve the posters they show through /api/posters.
+    """
+    payload = request.get_json(silent=True)
+    if not isinstance(payload, dict):
+        return jsonify({'error': "Expected a JSON object"}), 400
+    queries = payload.get('queries')
+    if not isinstance(queries, list) or not all(isinstance(q, str) for q in queries):
+        return jsonify({'error': "'queries' must be a list of strings"}), 400
+    if len(queries) > MAX_BATCH_QUERIES:
+        return jsonify({'error': f"At most {MAX_BATCH_QUERIES} queries per batch"}), 400
+
+    genres = payload.get('genres') or []
+    if isinstance(genres, str):
+        genres = [genres]
+    if not isinstance(genres, list) or not all(isinstance(g, str) for g in genres):
+        return jsonify({'error': "'genres' must be a string or a list of strings"}), 400
+    genres = [genre for genre in genres if genre.strip()]
+
+    try:
+        year_range = year_params(payload)
+        if payload.get('search_type', 'specific') == "specific":
+            from models.bm25_search import search_specific_batch
+            results = search_specific_batch(queries, year_range=year_range, genres=genres, fetch_posters=False)
+        else:
+            from models.hybrid_search import search_general_batch
+            results = search_general_batch(queries, year_range=year_range, genres=genres, fetch_posters=False)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    return jsonify({'results': results})
+
 @app.route('/genre_recommendations')
 def genre_recommendations():
     return render_template('genre_recommendations.html')
@@ -46,12 +187,41 @@ def get_genre_recommendations():
         return render_template('genre_recommendations.html', error="Please enter your genre preferences.")
     
     print(f"🎯 Running Fast Genre-Based Recommendations for: {genre_preferences}")
-    lines = recommend_movies_by_genre_fast(genre_preferences)
+    from models.fast_genre_recommend import recommend_movies_by_genre_fast
+    lines = recommend_movies_by_genre_fast(genre_preferences, fetch_posters=False)
 
     if not lines:
         return render_template('results.html', results=[], message="No recommendations found for your preferences.")
     return render_template('results.html', results=lines, is_recommendation=True)
 
+@app.route('/user_recommendations', methods=['POST'])
+def user_recommendations():
+    user_id = request.form.get('user_id', '').strip()
+    if not user_id.isdigit():
+        return render_template('user_id_entry.html', error="Please enter a numeric user ID.")
+
+    print(f"👤 Running RankNet Recommendations for user {user_id}")
+    from models.ranknet_engine import recommend_for_user
+    try:
+        lines = recommend_for_user(user_id)
+    except FileNotFoundError as e:
+        print(f"⚠️  {e}")
+        return render_template('results.html', results=[], message="Personalized recommendations are not available right now.")
+
+    if lines is None:
+        return render_template('results.html', results=[], message=f"Unknown user ID {user_id}.")
+    if not lines:
+        return render_template('results.html', results=[], message="No recommendations found for this user.")
+    return render_template('results.html', results=lines, is_recommendation=True)
+
+@app.route('/metrics')
+def metrics():
+    """Cache effectiveness for this worker"""
+    from models.ranknet_engine import user_cache
+    from models.omdb_poster import get_cache_stats
+    return jsonify({'result_cache': result_cache.stats(), 'user_cache': user_cache.stats(),
+                    'poster_cache': get_cache_stats()})
+
 @app.route('/logout')
 def logout():
     session.clear()
@@ -3,12 +3,13 @@
 
 echo "🚀 Starting build process..."
 
-# Download NLTK data
-echo "📥 Downloading NLTK data..."
-python -c "import nltk; nltk.download('punkt'); nltk.download('stopwords'); nltk.download('wordnet')"
-
 # Create cache directory if it doesn't exist
 echo "📁 Creating cache directory..."
 mkdir -p cache
 
+# Install NLTK data and build search and recommendation artifacts, so workers
+# only load them and never touch the network at startup
+echo "🏗️  Building search and recommendation artifacts..."
+python -m models.build || exit 1
+
 echo "✅ Build process completed!" 
\ No newline at end of file
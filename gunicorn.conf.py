@@ -0,0 +1,33 @@
+# Gunicorn picks this file up automatically from the working directory,
+# so the Procfile command line keeps working unchanged.
+import gc
+import os
+import time
+
+# Import the app (and warm its engines) once in the master; workers are
+# forked from it and share those pages copy-on-write
+preload_app = True
+
+def when_ready(server):
+    from app import warmup
+    warmup()
+    # Move everything loaded so far out of the collector's reach, so GC passes
+    # in the workers don't write to (and un-share) the master's objects
+    gc.freeze()
+
+def post_fork(server, worker):
+    worker.forked_at = time.perf_counter()
+
+def post_worker_init(worker):
+    # Without preload_app this builds the engines here; otherwise it is a no-op
+    from app import warmup
+    warmup()
+    # From fork to serving: importing the app (without preload_app) plus warmup;
+    # `python -m models.startup_report` breaks a cold start down by module and stage
+    print(f"🚦 Worker {os.getpid()} ready in {time.perf_counter() - worker.forked_at:.2f}s")
+
+    from models.memory_report import format_row, process_memory
+    try:
+        print(format_row('worker', os.getpid(), process_memory(os.getpid())) + "  (rss/pss/shared/private MB)")
+    except OSError:
+        pass  # /proc is Linux-only
@@ -0,0 +1,144 @@
+import hashlib
+import json
+import os
+import shutil
+import uuid
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: builds are not serialized across processes
+    fcntl = None
+
+# Bump when the layout of any artifact changes so old caches are rebuilt
+ARTIFACT_FORMAT = 3
+
+@contextmanager
+def atomic_write(path):
+    """Yield a temporary path next to ``path``; it is renamed over ``path`` only on success.
+
+    The temporary name ends with the final file name, so writers that key off
+    the extension (``np.save``) behave the same.
+    """
+    directory, name = os.path.split(path)
+    tmp_path = os.path.join(directory, f".{uuid.uuid4().hex}.{name}")
+    try:
+        yield tmp_path
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+def committed_path(namespace, name, cache_dir='cache'):
+    """Path of an artifact in the last committed build of a namespace (for offline tools)"""
+    with open(os.path.join(cache_dir, namespace, ArtifactStore.MANIFEST), 'r', encoding='utf-8') as f:
+        version = json.load(f)['version']
+    return os.path.join(cache_dir, namespace, version, name)
+
+# === Fingerprinted Artifact Store ===
+class ArtifactStore:
+    """A namespace of build artifacts under ``cache/<namespace>/``.
+
+    The fingerprint covers the artifact format, the build parameters and the
+    size + mtime of every source file, so a CSV change invalidates exactly the
+    engines built from it. Each fingerprint gets its own subdirectory and the
+    manifest pointing at it is written last (temp file + rename), so readers
+    never see a half-built or mixed set of files. ``ensure`` serializes builds
+    across processes with a file lock and re-checks validity after taking it,
+    so concurrent workers build at most once.
+    """
+
+    MANIFEST = 'manifest.json'
+
+    def __init__(self, namespace, sources, params=None, cache_dir='cache'):
+        self.namespace = namespace
+        self.sources = list(sources)
+        self.params = dict(params or {})
+        self.root = os.path.join(cache_dir, namespace)
+        self.fingerprint = self._fingerprint()
+        self.version = self.fingerprint[:16]
+        self.directory = os.path.join(self.root, self.version)
+
+    def _fingerprint(self):
+        sources = []
+        for path in self.sources:
+            try:
+                stat = os.stat(path)
+                sources.append([path, stat.st_size, stat.st_mtime_ns])
+            except FileNotFoundError:
+                sources.append([path, None, None])
+        payload = {'format': ARTIFACT_FORMAT, 'params': self.params, 'sources': sources}
+        return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+    def path(self, name):
+        return os.path.join(self.directory, name)
+
+    def read_manifest(self):
+        try:
+            with open(os.path.join(self.root, self.MANIFEST), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def is_valid(self):
+        """Cheap check: the committed manifest matches the current sources and params"""
+        manifest = self.read_manifest()
+        return (manifest is not None
+                and manifest.get('fingerprint') == self.fingerprint
+                and all(os.path.exists(self.path(name)) for name in manifest.get('files', [])))
+
+    def writing(self, name):
+        """Atomic temp-file + rename writer for one artifact of this build"""
+        os.makedirs(self.directory, exist_ok=True)
+        return atomic_write(self.path(name))
+
+    def commit(self):
+        """Publish the current build by writing its manifest, then drop older builds"""
+        files = sorted(f for f in os.listdir(self.directory) if not f.startswith('.'))
+        manifest = {
+            'namespace': self.namespace,
+            'fingerprint': self.fingerprint,
+            'version': self.version,
+            'format': ARTIFACT_FORMAT,
+            'params': self.params,
+            'sources': self.sources,
+            'files': files,
+        }
+        with atomic_write(os.path.join(self.root, self.MANIFEST)) as tmp_path:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(manifest, f, indent=2, default=str)
+
+        for entry in os.listdir(self.root):
+            old = os.path.join(self.root, entry)
+            if entry != self.version and os.path.isdir(old):
+                # Processes still mapping old files keep them alive until they exit
+                shutil.rmtree(old, ignore_errors=True)
+
+    @contextmanager
+    def build_lock(self):
+        os.makedirs(self.root, exist_ok=True)
+        with open(os.path.join(self.root, '.lock'), 'w') as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def ensure(self, build):
+        """Run ``build()`` and commit unless a valid build already exists.
+
+        Returns True if this call built the artifacts.
+        """
+        if self.is_valid():
+            return False
+        with self.build_lock():
+            # Another worker may have finished the build while we waited
+            if self.is_valid():
+                return False
+            print(f"🛠️  Building {self.namespace} artifacts ({self.version})")
+            os.makedirs(self.directory, exist_ok=True)
+            build()
+            self.commit()
+            return True
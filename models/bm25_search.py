@@ -1,40 +1,23 @@
-import pandas as pd
-import numpy as np
-from rank_bm25 import BM25Okapi
-import nltk
 import re
-import os
 import pickle
-from tqdm import tqdm
-from nltk.corpus import stopwords
-from nltk.stem import PorterStemmer
-import requests
-
-# Import OMDB poster fetcher
-from models.omdb_poster import get_movie_poster
-
-# === Ensure NLTK Resources Are Installed ===
-def ensure_nltk_data():
-    try:
-        nltk.data.find('tokenizers/punkt')
-    except LookupError:
-        nltk.download('punkt')
-
-    try:
-        nltk.data.find('corpora/stopwords')
-    except LookupError:
-        nltk.download('stopwords')
-
-ensure_nltk_data()
-
-# === Setup Stopwords and Stemmer ===
-stop_words = set(stopwords.words('english'))
-stemmer = PorterStemmer()
-
+import threading
+
+from models import nltk_resources
+from models.sparse_bm25 import SparseBM25
+from models.ranking import top_k_indices
+from models.title_catalog import get_catalog
+from models.artifacts import ArtifactStore
+from models.string_column import StringColumn
+from models.facets import Facets, DEFAULT_YEAR_RANGE
+from models.result_cache import result_cache, normalize_query
+
+# NLTK data is installed by the build (models.nltk_resources); nothing is
+# downloaded here, and NLTK itself loads with the first tokenized title
 def preprocess_text(text):
     text = text.replace("-", " ")
     text = re.sub(r'[\W_]+', ' ', text)
-    tokens = nltk.word_tokenize(text.lower())
+    stop_words, stemmer = nltk_resources.stop_words(), nltk_resources.stemmer()
+    tokens = nltk_resources.word_tokenize(text.lower())
     tokens = [t for t in tokens if t.isalnum() and t not in stop_words]
     return [stemmer.stem(t) for t in tokens]
 
@@ -42,83 +25,150 @@ def extract_year(title):
     match = re.search(r'\((\d{4})\)', title)
     return int(match.group(1)) if match else None
 
-def load_or_cache_data(movie_path="data/ml-latest/movies.csv", cache_path="cache"):
-    os.makedirs(cache_path, exist_ok=True)
-
-    df_cache_path = os.path.join(cache_path, "movies_df.pkl")
-    tokens_cache_path = os.path.join(cache_path, "tokenized_titles.pkl")
-    bm25_cache_path = os.path.join(cache_path, "bm25_index.pkl")
-
-    if all(os.path.exists(p) for p in [df_cache_path, tokens_cache_path, bm25_cache_path]):
-        with open(df_cache_path, 'rb') as f:
-            df = pickle.load(f)
-        with open(tokens_cache_path, 'rb') as f:
-            tokenized_titles = pickle.load(f)
-        with open(bm25_cache_path, 'rb') as f:
-            bm25 = pickle.load(f)
-    else:
-        df = pd.read_csv(movie_path)
-        df['title'] = df['title'].astype(str)
-        df['year'] = df['title'].apply(extract_year)
-        df['title_tokens'] = df['title'].apply(preprocess_text)
-        tokenized_titles = df['title_tokens'].tolist()
-
-        bm25 = BM25Okapi(tokenized_titles)
-
-        with open(df_cache_path, 'wb') as f:
-            pickle.dump(df, f)
-        with open(tokens_cache_path, 'wb') as f:
-            pickle.dump(tokenized_titles, f)
-        with open(bm25_cache_path, 'wb') as f:
-            pickle.dump(bm25, f)
+# Anything that changes the index contents must be listed here
+TITLE_INDEX_PARAMS = {'k1': 1.5, 'b': 0.75, 'epsilon': 0.25, 'tokenizer': 'punkt+stopwords+porter'}
+
+def title_index_store(movie_path="data/ml-latest/movies.csv", cache_path="cache"):
+    return ArtifactStore('bm25_titles', [movie_path], TITLE_INDEX_PARAMS, cache_path)
+
+def build_title_index(store, movie_path="data/ml-latest/movies.csv", map_fn=map):
+    # map_fn lets the offline build spread tokenization over a process pool
+    import pandas as pd
+    df = pd.read_csv(movie_path)
+    df['title'] = df['title'].astype(str)
+    df['year'] = df['title'].apply(extract_year)
+    tokenized_titles = list(map_fn(preprocess_text, df['title'].tolist()))
+    df['title_tokens'] = tokenized_titles
 
+    bm25 = SparseBM25.from_corpus(tokenized_titles)
+
+    with store.writing("movies_df.pkl") as tmp_path:
+        df.to_pickle(tmp_path)
+    with store.writing("tokenized_titles.pkl") as tmp_path:
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(tokenized_titles, f)
+    with store.writing("bm25.npz") as tmp_path:
+        bm25.save(tmp_path)
+
+    # Flat columns the long-lived engine serves from
+    StringColumn.from_strings(df['title']).save(store.path("titles"))
+    Facets.from_frame(df).save(store)
+
+def load_or_cache_data(movie_path="data/ml-latest/movies.csv", cache_path="cache", map_fn=map):
+    store = title_index_store(movie_path, cache_path)
+    store.ensure(lambda: build_title_index(store, movie_path, map_fn))
+
+    import pandas as pd
+    df = pd.read_pickle(store.path("movies_df.pkl"))
+    with open(store.path("tokenized_titles.pkl"), 'rb') as f:
+        tokenized_titles = pickle.load(f)
+    bm25 = SparseBM25.load(store.path("bm25.npz"))
     return df, tokenized_titles, bm25
 
+def load_title_columns(store):
+    """The title column and the year/genre facets, as flat arrays"""
+    return StringColumn.load(store.path("titles")), Facets.load(store)
+
+# === Long-Lived Search Engine ===
+class BM25SearchEngine:
+    """BM25 title search that keeps its artifacts in memory across requests.
+
+    Everything it holds is NumPy buffers (the index, a packed title column
+    and the facet columns), so an engine warmed in the gunicorn master is shared
+    copy-on-write by every worker.
+    """
+
+    def __init__(self, movie_path="data/ml-latest/movies.csv", cache_path="cache"):
+        self.movie_path = movie_path
+        self.cache_path = cache_path
+        self.bm25 = None
+        self.titles = None
+        self.facets = None
+        self.build_version = None
+        self._lock = threading.Lock()
+
+    def warmup(self, map_fn=map):
+        """Load the title columns and BM25 index once; later calls are no-ops"""
+        if self.bm25 is None:
+            with self._lock:
+                if self.bm25 is None:
+                    # Loads the NLTK data now; fails fast if the build did not install it
+                    nltk_resources.warmup()
+                    store = title_index_store(self.movie_path, self.cache_path)
+                    store.ensure(lambda: build_title_index(store, self.movie_path, map_fn))
+                    self.titles, self.facets = load_title_columns(store)
+                    self.build_version = store.version
+                    self.bm25 = SparseBM25.load(store.path("bm25.npz"))
+        return self
+
+    def search(self, query, top_k=200, txt_path="data/movies_links.txt",
+               year_range=DEFAULT_YEAR_RANGE, genres=None, fetch_posters=True):
+        return self.search_batch([query], top_k, txt_path, year_range, genres, fetch_posters)[0]
+
+    def search_batch(self, queries, top_k=200, txt_path="data/movies_links.txt",
+                     year_range=DEFAULT_YEAR_RANGE, genres=None, fetch_posters=True):
+        """Results of many queries, each in the same format as ``search``.
+
+        With ``fetch_posters=False`` results carry no ``poster_url``, leaving
+        OMDB lookups to the caller (the results page loads them lazily).
+        """
+        self.warmup()
+        facet_mask = self.facets.mask(year_range, genres)
+        catalog = get_catalog(txt_path)
+
+        results = []
+        for query in queries:
+            # AND query inside the index: only titles containing every stemmed query
+            # token and passing the year/genre facets are scored and ranked. Each
+            # query touches just its own postings, so this stays per query
+            query_tokens = preprocess_text(query)
+            doc_ids, bm25_scores = self.bm25.get_sparse_scores(query_tokens, require_all=True, mask=facet_mask)
+            top_idx = doc_ids[top_k_indices(bm25_scores, top_k)]
+
+            # Join with the shared links catalog
+            matched = []
+            for title in self.titles.take(top_idx):
+                row = catalog.find(title)
+                if row is not None:
+                    matched.append(catalog.result(row))
+            results.append(matched)
+
+        # Fetch posters from OMDB API concurrently, once for the whole batch
+        if fetch_posters:
+            from models.omdb_poster import attach_posters
+            attach_posters(results)
+        return results
+
+_engine = None
+_engine_lock = threading.Lock()
+
+def get_engine():
+    """Return the process-wide engine, creating it on first use"""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = BM25SearchEngine()
+    return _engine
+
+def warmup():
+    """Load the BM25 artifacts now instead of on the first request"""
+    return get_engine().warmup()
+
+def result_version(args):
+    """Identifies the index build and links file a cached result was computed from"""
+    return get_engine().warmup().build_version, get_catalog(args['txt_path']).mtime
+
 # === Exposed Function for Flask ===
-def search_specific(query, top_k=200, txt_path="data/movies_links.txt", movie_path="data/ml-latest/movies.csv", tags_path="data/ml-latest/genome-tags.csv", scores_path="data/ml-latest/genome-scores.csv", ratings_path="data/ml-latest/ratings.csv"):
-    df, tokenized_titles, bm25 = load_or_cache_data()
-    query_tokens = preprocess_text(query)
-
-    bm25_scores = bm25.get_scores(query_tokens)
-    df['bm25_score'] = bm25_scores
-    df = df[df['year'].notnull() & (df['year'] >= 1990)]
-    df = df.sort_values(by='bm25_score', ascending=False)
-
-    top_titles = df.head(top_k)['title'].tolist()
-
-    # Search in txt file
-    with open(txt_path, 'r', encoding='utf-8') as f:
-        lines = f.readlines()
-
-    line_dict = {}
-    for line in lines:
-        parts = line.strip().split('|')
-        title = parts[0].strip()
-        line_dict[title.lower()] = line.strip()
-
-    matched_lines = []
-    for title in top_titles:
-        if title.lower() in line_dict:
-            matched_lines.append(line_dict[title.lower()])
-        if len(matched_lines) == top_k:
-            break
-
-    # Filter final lines to contain all query tokens in title
-    matched = []
-    for line in matched_lines:
-        movie_title = line.split('|')[0]
-        title_tokens = set(preprocess_text(movie_title))
-        if all(token in title_tokens for token in query_tokens):
-            parts = line.split('|')
-            
-            # Fetch poster from OMDB API
-            poster_url = get_movie_poster(parts[0].strip())
-            
-            matched.append({
-                "title": parts[0].strip(),
-                "link1": parts[1].strip() if parts[1].strip().lower() != "null" else None,
-                "link2": parts[2].strip() if len(parts) > 2 and parts[2].strip().lower() != "null" else None,
-                "poster_url": poster_url
-            })
-
-    return matched if matched else []
+@result_cache.cached('specific', version=result_version)
+def search_specific(query, top_k=200, txt_path="data/movies_links.txt", movie_path="data/ml-latest/movies.csv", tags_path="data/ml-latest/genome-tags.csv", scores_path="data/ml-latest/genome-scores.csv", ratings_path="data/ml-latest/ratings.csv",
+                    year_range=DEFAULT_YEAR_RANGE, genres=None, fetch_posters=True):
+    return get_engine().search(query, top_k=top_k, txt_path=txt_path, year_range=year_range, genres=genres,
+                               fetch_posters=fetch_posters)
+
+def search_specific_batch(queries, top_k=200, txt_path="data/movies_links.txt",
+                          year_range=DEFAULT_YEAR_RANGE, genres=None, fetch_posters=True):
+    """search_specific for many queries, with one poster fetch for all of them"""
+    # Normalized like the cached single search, so both give the same results
+    return get_engine().search_batch([normalize_query(q) for q in queries], top_k=top_k, txt_path=txt_path,
+                                     year_range=year_range, genres=genres, fetch_posters=fetch_posters)
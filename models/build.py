@@ -0,0 +1,160 @@
+"""Offline artifact build: ``python -m models.build``.
+
+Builds every search and recommendation artifact ahead of time so web workers
+only ever load them, and installs the NLTK data the tokenizers need (workers
+never download it). Tokenization and embedding are chunked across a process
+pool; each stage reports how long it took.
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+
+STAGES = ('nltk', 'specific', 'general', 'ranknet')
+
+# === Process Pool Map ===
+class ParallelMap:
+    """A ``map`` replacement that fans chunks of work out over a process pool.
+
+    Functions and items must be picklable (module-level functions or
+    ``functools.partial`` of them). With one worker it falls back to the
+    builtin ``map`` so results are identical either way.
+    """
+
+    def __init__(self, workers=None, chunk_size=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self._executor = None
+
+    def __call__(self, fn, items):
+        items = list(items)
+        if self.workers <= 1 or len(items) < 2:
+            return map(fn, items)
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        # A few chunks per worker keeps the pool busy without per-item IPC
+        chunk_size = self.chunk_size or max(1, len(items) // (self.workers * 4))
+        return self._executor.map(fn, items, chunksize=chunk_size)
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+# === Stage Timing ===
+class StageTimer:
+    def __init__(self):
+        self.timings = []
+
+    @contextmanager
+    def stage(self, name):
+        print(f"▶️  {name}")
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            self.timings.append((name, elapsed))
+            print(f"⏱️  {name}: {elapsed:.2f}s")
+
+    def report(self):
+        print("\n📊 Build timings")
+        width = max((len(name) for name, _ in self.timings), default=0)
+        for name, elapsed in self.timings:
+            print(f"  {name:<{width}}  {elapsed:8.2f}s")
+        print(f"  {'total':<{width}}  {sum(t for _, t in self.timings):8.2f}s")
+
+# === Stages ===
+def build_nltk(timer):
+    from models import nltk_resources
+    with timer.stage("nltk: tokenizer + stopwords"):
+        print(f"  installed in {nltk_resources.download()}")
+
+def build_specific(timer, map_fn, cache_dir):
+    from models.bm25_search import title_index_store, build_title_index
+    with timer.stage("specific: title BM25 index"):
+        store = title_index_store(cache_path=cache_dir)
+        store.ensure(lambda: build_title_index(store, map_fn=map_fn))
+
+def build_general(timer, map_fn, cache_dir, vector_mode, ann=False):
+    from models import hybrid_search as hs
+
+    engine = hs.HybridSearchEngine(vector_mode=vector_mode, cache_dir=cache_dir)
+    with timer.stage("general: documents + BM25"):
+        paths = (engine.movie_path, engine.tags_path, engine.scores_path, engine.ratings_path)
+        doc_store = hs.hybrid_doc_artifacts(*paths, cache_dir)
+        doc_store.ensure(lambda: hs.build_movie_data(doc_store, *paths, map_fn))
+    with timer.stage("general: GloVe store"):
+        glove_store = hs.glove_artifacts(engine.glove_path, cache_dir)
+        glove = hs.load_glove_embeddings(engine.glove_path, cache_dir)
+    with timer.stage(f"general: document vectors ({vector_mode})"):
+        vector_store = hs.doc_vector_artifacts(doc_store, glove_store, vector_mode, cache_dir)
+        doc_vectors = hs.load_glove_doc_vectors(doc_store, glove, vector_store, mode=vector_mode, map_fn=map_fn)
+    if ann:
+        with timer.stage("general: IVF index"):
+            hs.load_ivf_index(doc_vectors, hs.ivf_artifacts(vector_store, cache_dir=cache_dir))
+
+def build_ranknet(timer, cache_dir, data_dir="data/ml-latest", weights_path=None):
+    from models import ranknet_features as rf
+    from models.user_recs import feature_artifacts, ranknet_artifacts
+
+    weights_path = weights_path or os.path.join(cache_dir, "ranknet_weights.npz")
+    feature_store = feature_artifacts(data_dir, cache_dir)
+    store = ranknet_artifacts(feature_store, weights_path, cache_dir)
+    # Checked before any CSV is read: an up-to-date table needs no data at all
+    if store.is_valid():
+        return
+
+    with timer.stage("ranknet: features"):
+        df, feature_cols, user_ids = rf.load_features(feature_store, data_dir)
+
+    # Scoring reads the exported weights; only a missing export needs the training stack
+    if not os.path.exists(weights_path):
+        with timer.stage("ranknet: model"):
+            from models import ranknet_recommend as rn
+            try:
+                rn.load_or_train_model(df, feature_cols, os.path.join(cache_dir, "ranknet_model.pkl"), weights_path)
+            except ImportError as e:
+                print(f"⚠️  Skipping ranknet: no exported weights and no training stack ({e})")
+                return
+        # The new export is one of the table's sources
+        store = ranknet_artifacts(feature_store, weights_path, cache_dir)
+
+    with timer.stage("ranknet: user recommendations"):
+        store.ensure(lambda: rf.build_user_recs(store, df, feature_cols, weights_path, user_ids))
+
+def main(argv=None):
+    from models.hybrid_search import VECTOR_MODE
+    from models.vector_index import QUANTIZATION_MODES
+
+    parser = argparse.ArgumentParser(description="Build search and recommendation artifacts")
+    parser.add_argument("--workers", type=int, default=None, help="Processes for tokenization/embedding (default: all CPUs)")
+    parser.add_argument("--chunk-size", type=int, default=None, help="Items per task sent to a worker")
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=list(STAGES))
+    parser.add_argument("--cache-dir", default="cache")
+    parser.add_argument("--vector-mode", choices=QUANTIZATION_MODES, default=VECTOR_MODE,
+                        help="Document vector storage type (default: GLOVE_VECTOR_MODE, else float32)")
+    parser.add_argument("--ann", action="store_true", help="Also build the IVF index used when GLOVE_ANN_NPROBE is set")
+    args = parser.parse_args(argv)
+
+    timer = StageTimer()
+    map_fn = ParallelMap(args.workers, args.chunk_size)
+    print(f"🚀 Building {', '.join(args.stages)} with {map_fn.workers} worker(s)")
+    try:
+        if 'nltk' in args.stages:
+            build_nltk(timer)
+        if 'specific' in args.stages:
+            build_specific(timer, map_fn, args.cache_dir)
+        if 'general' in args.stages:
+            build_general(timer, map_fn, args.cache_dir, args.vector_mode, args.ann)
+        if 'ranknet' in args.stages:
+            build_ranknet(timer, args.cache_dir)
+    finally:
+        map_fn.close()
+    timer.report()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,85 @@
+import re
+import numpy as np
+
+# MovieLens genre vocabulary; a movie's genres are stored as one bit each
+GENRES = ('Action', 'Adventure', 'Animation', 'Children', 'Comedy', 'Crime', 'Documentary', 'Drama',
+          'Fantasy', 'Film-Noir', 'Horror', 'IMAX', 'Musical', 'Mystery', 'Romance', 'Sci-Fi',
+          'Thriller', 'War', 'Western')
+GENRE_BITS = {genre.lower(): 1 << i for i, genre in enumerate(GENRES)}
+
+# The filter both search paths have always applied: released in 1990 or later
+DEFAULT_YEAR_RANGE = (1990, None)
+
+YEARS_FILE = 'years.npy'
+GENRES_FILE = 'genre_bits.npy'
+
+def title_year(title):
+    match = re.search(r'\((\d{4})\)', title)
+    return int(match.group(1)) if match else None
+
+def genre_mask_bits(genres):
+    """OR of the bits of the given genre names (case-insensitive)"""
+    bits = 0
+    for genre in genres:
+        bit = GENRE_BITS.get(genre.strip().lower())
+        if bit is None:
+            raise ValueError(f"Unknown genre '{genre}', expected one of {', '.join(GENRES)}")
+        bits |= bit
+    return bits
+
+def parse_genres(genres_field):
+    """Bitmask of a MovieLens ``A|B|C`` genres field; unknown labels are ignored"""
+    if not isinstance(genres_field, str):
+        return 0
+    return sum(GENRE_BITS.get(genre.lower(), 0) for genre in set(genres_field.split('|')))
+
+# === Facet Columns ===
+class Facets:
+    """Per-document year and genre bitmask columns for pre-scoring filters.
+
+    Years come from the ``(YYYY)`` in the title, as the search paths always
+    read them; documents without one have NaN and never pass a year range.
+    """
+
+    def __init__(self, years, genre_bits):
+        self.years = years
+        self.genre_bits = genre_bits
+        self.default_mask = self._mask(DEFAULT_YEAR_RANGE, None)
+
+    @classmethod
+    def from_frame(cls, df):
+        years = np.array([title_year(t) or np.nan for t in df['title']], dtype=float)
+        genre_bits = np.array([parse_genres(g) for g in df['genres']], dtype=np.uint32)
+        return cls(years, genre_bits)
+
+    def save(self, store):
+        for name, array in ((YEARS_FILE, self.years), (GENRES_FILE, self.genre_bits)):
+            with store.writing(name) as tmp_path:
+                np.save(tmp_path, array)
+
+    @classmethod
+    def load(cls, store):
+        return cls(np.load(store.path(YEARS_FILE)), np.load(store.path(GENRES_FILE)))
+
+    def mask(self, year_range=DEFAULT_YEAR_RANGE, genres=None):
+        """Boolean array of the documents passing the filters.
+
+        ``year_range`` is an inclusive ``(min, max)`` pair where either end
+        may be None; None drops the year filter altogether. ``genres`` keeps
+        documents having any of the named genres.
+        """
+        if year_range == DEFAULT_YEAR_RANGE and not genres:
+            return self.default_mask
+        return self._mask(year_range, genres)
+
+    def _mask(self, year_range, genres):
+        mask = np.ones(len(self.years), dtype=bool)
+        if year_range is not None:
+            low, high = year_range
+            if low is not None:
+                mask &= self.years >= low
+            if high is not None:
+                mask &= self.years <= high
+        if genres:
+            mask &= (self.genre_bits & genre_mask_bits(genres)) != 0
+        return mask
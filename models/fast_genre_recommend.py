@@ -1,83 +1,15 @@
-import pandas as pd
 import numpy as np
-import os
-import pickle
 import re
-from collections import defaultdict
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
 import warnings
 warnings.filterwarnings('ignore')
 
-# Import OMDB poster fetcher
-from models.omdb_poster import get_movie_poster
+from models.title_catalog import get_catalog
+from models.title_text import TitleText
+from models.ranking import top_k_indices
+from models.result_cache import result_cache
 
 # === Fast Genre-Based Recommendation System ===
 
-def load_movies_from_links(cache_path="cache/movies_data.pkl"):
-    """Load and process movies from movies_links.txt with caching"""
-    if os.path.exists(cache_path):
-        with open(cache_path, 'rb') as f:
-            return pickle.load(f)
-    
-    movies = []
-    file_path = "data/movies_links.txt"
-    
-    if not os.path.exists(file_path):
-        print(f"Error: {file_path} not found")
-        return []
-    
-    with open(file_path, 'r', encoding='utf-8') as f:
-        for line in f:
-            line = line.strip()
-            if line:
-                parts = line.split('|')
-                if len(parts) >= 3:
-                    title = parts[0].strip()
-                    link1 = parts[1].strip() if parts[1].strip().lower() != "null" else None
-                    link2 = parts[2].strip() if len(parts) > 2 and parts[2].strip().lower() != "null" else None
-                    
-                    # Extract year from title
-                    year_match = re.search(r'\((\d{4})\)', title)
-                    year = int(year_match.group(1)) if year_match else 1900
-                    
-                    # Clean title (remove year)
-                    clean_title = re.sub(r'\(\d{4}\)', '', title).strip()
-                    
-                    movies.append({
-                        'title': title,
-                        'clean_title': clean_title,
-                        'year': year,
-                        'link1': link1,
-                        'link2': link2,
-                        'original_line': line
-                    })
-    
-    # Create processed data
-    processed_data = {
-        'movies': movies,
-        'title_to_movie': {movie['title'].lower(): movie for movie in movies},
-        'year_groups': defaultdict(list),
-        'title_keywords': {}
-    }
-    
-    # Group by decades for faster filtering
-    for movie in movies:
-        decade = (movie['year'] // 10) * 10
-        processed_data['year_groups'][decade].append(movie)
-    
-    # Extract keywords from titles for genre matching
-    for movie in movies:
-        title_lower = movie['clean_title'].lower()
-        keywords = set(re.findall(r'\b\w+\b', title_lower))
-        processed_data['title_keywords'][movie['title']] = keywords
-    
-    # Cache the processed data
-    with open(cache_path, 'wb') as f:
-        pickle.dump(processed_data, f)
-    
-    return processed_data
-
 def create_genre_keywords():
     """Create comprehensive genre keyword mappings"""
     return {
@@ -99,6 +31,90 @@ def create_genre_keywords():
         'hollywood': ['hollywood', 'american', 'english', 'usa']
     }
 
+# === Precompiled Genre Index ===
+class GenreIndex:
+    """Genre, year and title-length scoring of every catalog movie, precomputed as arrays.
+
+    For every genre a boolean array marks the movies whose clean title
+    contains one of its keywords (a keyword that is a whole title word is also
+    a substring, so the substring test alone decides a match). Years and the
+    short-title flag are NumPy columns, so scoring a request is a few array
+    additions, applied in the order of the original per-movie loop so the
+    floating point scores are identical (test_genre_index.py keeps that loop
+    as the reference).
+    """
+
+    def __init__(self, catalog):
+        self.catalog = catalog
+        years, clean_titles = [], []
+        for title in catalog.titles:
+            year_match = re.search(r'\((\d{4})\)', title)
+            years.append(int(year_match.group(1)) if year_match else 1900)
+            clean_titles.append(re.sub(r'\(\d{4}\)', '', title).strip())
+
+        self.years = np.array(years, dtype=np.int64)
+        self.short_title = np.array([len(t) < 30 for t in clean_titles], dtype=bool)
+        title_text = TitleText(clean_titles)
+        self.genre_matches = {
+            genre: title_text.contains_any(keywords)
+            for genre, keywords in create_genre_keywords().items()
+        }
+
+    def __len__(self):
+        return len(self.years)
+
+    def scores(self, user_genres, user_years):
+        score = np.zeros(len(self), dtype=np.float64)
+        for genre in user_genres:
+            if genre in self.genre_matches:
+                score += 2 * self.genre_matches[genre]
+        for year in user_years:
+            try:
+                target_year = int(year)
+            except ValueError:
+                continue
+            score += np.abs(self.years - target_year) <= 5
+        if 'latest' in user_genres:
+            score += 3 * (self.years >= 2020)
+        if 'classic' in user_genres:
+            score += 3 * (self.years < 2000)
+        score += np.where(self.years >= 2010, 0.5, 0)
+        score += np.where(self.short_title, 0.3, 0)
+        return score
+
+    def top(self, user_genres, user_years, n):
+        """Rows of the n best-scoring movies with a positive score, one per lowercased title.
+
+        Same order as a stable descending sort followed by de-duplication.
+        """
+        score = self.scores(user_genres, user_years)
+        relevant = score > 0
+        k = n
+        while True:
+            rows, seen = [], set()
+            ranked = top_k_indices(score, k, mask=relevant)
+            for row in ranked.tolist():
+                title_lower = self.catalog.titles[row].lower()
+                if title_lower not in seen:
+                    seen.add(title_lower)
+                    rows.append(row)
+                    if len(rows) == n:
+                        break
+            # Duplicates can push unique titles past the first k; widen and retry
+            if len(rows) == n or len(ranked) < k:
+                return rows, score[rows]
+            k *= 2
+
+_genre_indexes = {}
+
+def get_genre_index(txt_path="data/movies_links.txt"):
+    """The genre index for the current catalog, rebuilt only when the catalog changes"""
+    catalog = get_catalog(txt_path)
+    index = _genre_indexes.get(txt_path)
+    if index is None or index.catalog is not catalog:
+        index = _genre_indexes[txt_path] = GenreIndex(catalog)
+    return index
+
 def parse_user_preferences(preferences_text):
     """Parse user genre preferences from text input"""
     preferences = preferences_text.lower()
@@ -124,58 +140,13 @@ def parse_user_preferences(preferences_text):
     
     return matched_genres, years
 
-def calculate_movie_score(movie, user_genres, user_years, title_keywords):
-    """Calculate a score for a movie based on user preferences"""
-    score = 0
-    movie_title = movie['clean_title'].lower()
-    movie_year = movie['year']
-    movie_keywords = title_keywords.get(movie['title'], set())
-    
-    # Genre matching
-    for genre in user_genres:
-        genre_keywords = create_genre_keywords().get(genre, [])
-        for keyword in genre_keywords:
-            if keyword in movie_title or keyword in movie_keywords:
-                score += 2
-                break
-    
-    # Year matching
-    if user_years:
-        for year in user_years:
-            try:
-                target_year = int(year)
-                if abs(movie_year - target_year) <= 5:
-                    score += 1
-            except ValueError:
-                continue
-    
-    # Latest movies preference
-    if 'latest' in user_genres and movie_year >= 2020:
-        score += 3
-    
-    # Classic movies preference
-    if 'classic' in user_genres and movie_year < 2000:
-        score += 3
-    
-    # Recent movies bonus (2010+)
-    if movie_year >= 2010:
-        score += 0.5
-    
-    # Title length bonus (shorter titles often better)
-    if len(movie['clean_title']) < 30:
-        score += 0.3
-    
-    return score
-
-def get_fast_recommendations(user_preferences, n_recommendations=15):
+def get_fast_recommendations(user_preferences, n_recommendations=15, fetch_posters=True):
     """Get fast movie recommendations based on user preferences"""
-    # Load cached data
-    processed_data = load_movies_from_links()
-    if not processed_data:
+    index = get_genre_index()
+    if not len(index):
+        print("Error: data/movies_links.txt not found")
         return []
-    
-    movies = processed_data['movies']
-    title_keywords = processed_data['title_keywords']
+    catalog = index.catalog
     
     # Parse user preferences
     user_genres, user_years = parse_user_preferences(user_preferences)
@@ -184,40 +155,30 @@ def get_fast_recommendations(user_preferences, n_recommendations=15):
     if not user_genres and not user_years:
         user_genres = ['action', 'comedy', 'drama']
     
-    # Calculate scores for all movies
-    scored_movies = []
-    for movie in movies:
-        score = calculate_movie_score(movie, user_genres, user_years, title_keywords)
-        if score > 0:  # Only include movies with some relevance
-            scored_movies.append((movie, score))
-    
-    # Sort by score and get top recommendations
-    scored_movies.sort(key=lambda x: x[1], reverse=True)
+    # Score every movie with array arithmetic, then keep the best unique titles
+    rows, scores = index.top(user_genres, user_years, n_recommendations)
     
-    # Remove duplicates and format results
-    seen_titles = set()
     recommendations = []
-    
-    for movie, score in scored_movies:
-        title_lower = movie['title'].lower()
-        if title_lower not in seen_titles and len(recommendations) < n_recommendations:
-            seen_titles.add(title_lower)
-            
-            # Fetch poster from OMDB API
-            poster_url = get_movie_poster(movie['title'])
-            
-            recommendations.append({
-                'movieId': movie.get('movieId', 0),
-                'title': movie['title'],
-                'genres': movie.get('genres', ''),
-                'year': movie['year'],
-                'avg_rating': movie.get('avg_rating', 0),
-                'rating_count': movie.get('rating_count', 0),
-                'score': score,
-                'link1': movie['link1'],
-                'link2': movie['link2'],
-                'poster_url': poster_url
-            })
+    for row, score in zip(rows, scores.tolist()):
+        link1, link2 = catalog.links(row)
+        recommendations.append({
+            'movieId': 0,
+            'title': catalog.titles[row],
+            'genres': '',
+            'year': int(index.years[row]),
+            'avg_rating': 0,
+            'rating_count': 0,
+            'score': score,
+            'link1': link1,
+            'link2': link2
+        })
+    
+    # Fetch posters from OMDB API concurrently
+    if fetch_posters:
+        from models.omdb_poster import get_movie_posters
+        posters = get_movie_posters([rec['title'] for rec in recommendations])
+        for rec, poster_url in zip(recommendations, posters):
+            rec['poster_url'] = poster_url
     
     return recommendations
 
@@ -229,26 +190,17 @@ def get_popular_genres():
         'Latest', 'Classic', 'Indian', 'Hollywood'
     ]
 
-def load_title_link_map(txt_path="data/movies_links.txt"):
-    """Load movie title to link mapping"""
-    title_map = {}
-    if os.path.exists(txt_path):
-        with open(txt_path, 'r', encoding='utf-8') as f:
-            for line in f:
-                parts = line.strip().split('|')
-                title = parts[0].strip().lower()
-                title_map[title] = line.strip()
-    return title_map
-
 # === Main API Function ===
-def recommend_movies_by_genre_fast(genre_preferences):
+@result_cache.cached('genre', version=lambda args: get_catalog().mtime)
+def recommend_movies_by_genre_fast(genre_preferences, fetch_posters=True):
     """Main function to get fast movie recommendations based on genre preferences"""
     try:
         if not genre_preferences.strip():
             return []
         
         # Get recommendations
-        recommendations = get_fast_recommendations(genre_preferences, n_recommendations=20)
+        recommendations = get_fast_recommendations(genre_preferences, n_recommendations=20,
+                                                   fetch_posters=fetch_posters)
         
         # Format results (limit to 10 for display)
         results = []
@@ -257,7 +209,7 @@ def recommend_movies_by_genre_fast(genre_preferences):
                 "title": rec['title'],
                 "link1": rec['link1'],
                 "link2": rec['link2'],
-                "poster_url": rec['poster_url']
+                "poster_url": rec.get('poster_url')
             })
         
         return results
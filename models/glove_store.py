@@ -0,0 +1,70 @@
+import os
+import numpy as np
+
+from models.artifacts import atomic_write
+from models.string_column import find_sorted
+
+# === Memory-Mapped GloVe Vectors ===
+class GloVeStore:
+    """GloVe vectors held in one contiguous float32 matrix opened with mmap.
+
+    The vocabulary is a sorted fixed-width byte array, so a word's row id is
+    found with a binary search and no per-word Python objects are created.
+    Every worker mapping the same files shares the pages via the OS page cache.
+    """
+
+    VOCAB_FILE = 'glove_vocab.npy'
+    MATRIX_FILE = 'glove_vectors.npy'
+
+    def __init__(self, vocab, matrix, directory=None):
+        self.directory = directory
+        self.vocab = vocab
+        self.matrix = matrix
+        self.dim = matrix.shape[1]
+
+    @classmethod
+    def build(cls, glove_path, cache_dir='cache'):
+        """Parse the GloVe text file once and write the vocab and matrix files"""
+        rows = {}
+        with open(glove_path, 'r', encoding='utf8') as f:
+            for line in f:
+                parts = line.strip().split()
+                # Later duplicates win, like the old word -> vector dict
+                rows[parts[0].encode('utf-8')] = parts[1:]
+
+        words = sorted(rows)
+        vocab = np.array(words, dtype=bytes)
+        matrix = np.array([rows[w] for w in words], dtype=np.float32)
+
+        os.makedirs(cache_dir, exist_ok=True)
+        for name, array in ((cls.VOCAB_FILE, vocab), (cls.MATRIX_FILE, matrix)):
+            with atomic_write(os.path.join(cache_dir, name)) as tmp_path:
+                np.save(tmp_path, array)
+        return cls.load(cache_dir)
+
+    @classmethod
+    def load(cls, cache_dir='cache'):
+        vocab = np.load(os.path.join(cache_dir, cls.VOCAB_FILE), mmap_mode='r')
+        matrix = np.load(os.path.join(cache_dir, cls.MATRIX_FILE), mmap_mode='r')
+        return cls(vocab, matrix, cache_dir)
+
+    def lookup(self, words):
+        """Row ids of the words present in the vocabulary, in input order"""
+        pos = find_sorted(self.vocab, [w.encode('utf-8') for w in words])
+        return pos[pos >= 0]
+
+    def __contains__(self, word):
+        return len(self.lookup([word])) > 0
+
+    def __getitem__(self, word):
+        ids = self.lookup([word])
+        if not len(ids):
+            raise KeyError(word)
+        return self.matrix[ids[0]]
+
+    def mean_vector(self, words):
+        """Average of the known word vectors, or None if no word is known"""
+        ids = self.lookup(words)
+        if not len(ids):
+            return None
+        return self.matrix[ids].mean(axis=0)
@@ -1,190 +1,358 @@
 import os
-import re
 import pickle
+import threading
+from functools import partial
 import numpy as np
-import pandas as pd
-from rank_bm25 import BM25Okapi
-from sklearn.metrics.pairwise import cosine_similarity
-from rapidfuzz import process, fuzz
-import nltk
-import requests
 
-# Import OMDB poster fetcher
-from models.omdb_poster import get_movie_poster
-
-# Ensure NLTK Resources
-def ensure_nltk_data():
-    try: nltk.data.find('tokenizers/punkt')
-    except LookupError: nltk.download('punkt')
-
-ensure_nltk_data()
+from models import nltk_resources
+from models.sparse_bm25 import SparseBM25
+from models.ranking import top_k_indices
+from models.glove_store import GloVeStore
+from models.vector_index import DocVectorIndex, IVFIndex
+from models.title_catalog import get_catalog
+from models.artifacts import ArtifactStore
+from models.string_column import StringColumn
+from models.title_text import TitleText
+from models.facets import Facets, DEFAULT_YEAR_RANGE
+from models.result_cache import result_cache, normalize_query
 
 # === GloVe Loader with Cache ===
-def load_glove_embeddings(path, cache_file='cache/glove_dict.pkl'):
-    if os.path.exists(cache_file):
-        with open(cache_file, 'rb') as f:
-            return pickle.load(f)
-
-    glove_dict = {}
-    with open(path, 'r', encoding='utf8') as f:
-        for line in f:
-            parts = line.strip().split()
-            word = parts[0]
-            vec = np.array(parts[1:], dtype='float32')
-            glove_dict[word] = vec
-
-    with open(cache_file, 'wb') as f:
-        pickle.dump(glove_dict, f)
-    return glove_dict
+def glove_artifacts(path, cache_dir='cache'):
+    return ArtifactStore('glove', [path], {'dtype': 'float32'}, cache_dir)
+
+def load_glove_embeddings(path, cache_dir='cache'):
+    store = glove_artifacts(path, cache_dir)
+    store.ensure(lambda: GloVeStore.build(path, store.directory))
+    return GloVeStore.load(store.directory)
 
 # === Tokenize and Embed ===
-def embed_text_glove(text, glove_dict, dim=100):
-    words = nltk.word_tokenize(text.lower())
-    vectors = [glove_dict[w] for w in words if w in glove_dict]
-    return np.mean(vectors, axis=0) if vectors else np.zeros(dim)
+def tokenize_doc(doc):
+    return nltk_resources.word_tokenize(doc.lower())
+
+def embed_text_glove(text, glove, dim=100):
+    words = nltk_resources.word_tokenize(text.lower())
+    vector = glove.mean_vector(words)
+    return vector if vector is not None else np.zeros(dim)
+
+_glove_by_dir = {}
+
+def embed_doc_from_dir(glove_dir, doc):
+    # Picklable for process pools: each worker maps the GloVe files itself
+    glove = _glove_by_dir.get(glove_dir)
+    if glove is None:
+        glove = _glove_by_dir[glove_dir] = GloVeStore.load(glove_dir)
+    return embed_text_glove(doc, glove)
 
 def correct_query(query, all_titles, min_score=85):
+    if hasattr(all_titles, 'correct'):
+        # A TitleCorrector: indexed shortlist + memo; same answer as the full scan below
+        return all_titles.correct(query, min_score)
+    from rapidfuzz import process, fuzz
     best_match, score, _ = process.extractOne(query, all_titles, scorer=fuzz.token_sort_ratio)
     return best_match if score > min_score else query
 
 # === Boosters ===
-def boost_title_matches(df, query_tokens, bm25_scores, boost=0.5):
-    boost_vector = np.array([
-        any(token in title.lower() for token in query_tokens)
-        for title in df['title']
-    ], dtype=float)
+# Both boosts are substring tests on the lowercased title; a prebuilt TitleText
+# answers them for all titles at once instead of looping in Python
+def boost_title_matches(titles, query_tokens, bm25_scores, boost=0.5):
+    title_text = titles if isinstance(titles, TitleText) else TitleText(titles)
+    boost_vector = title_text.contains_any(query_tokens).astype(float)
     return bm25_scores + boost * boost_vector
 
-def boost_phrase_matches(df, query, scores, boost_val=0.5):
-    return scores + np.array([boost_val if query.lower() in title.lower() else 0 for title in df['title']])
+def boost_phrase_matches(titles, query, scores, boost_val=0.5):
+    title_text = titles if isinstance(titles, TitleText) else TitleText(titles)
+    return scores + np.where(title_text.contains(query.lower()), boost_val, 0)
 
 # === Load + Cache Movie Data ===
-def load_movie_data_cached(movie_path, tags_path, scores_path, ratings_path, cache_dir='cache'):
-    os.makedirs(cache_dir, exist_ok=True)
-    df_path = os.path.join(cache_dir, 'movie_df.pkl')
-    token_path = os.path.join(cache_dir, 'tokenized_docs.pkl')
-
-    if os.path.exists(df_path) and os.path.exists(token_path):
-        df = pd.read_pickle(df_path)
-        with open(token_path, 'rb') as f:
-            tokenized = pickle.load(f)
-        return df, tokenized
-
-    movies_df = pd.read_csv(movie_path)
-    tags_df = pd.read_csv(tags_path)
-    scores_df = pd.read_csv(scores_path)
-    ratings_df = pd.read_csv(ratings_path)
+# Anything that changes the documents or their index must be listed here
+HYBRID_DOC_PARAMS = {'min_relevance': 0.3, 'tokenizer': 'punkt', 'k1': 1.5, 'b': 0.75, 'epsilon': 0.25}
 
-    top_tags = scores_df[scores_df['relevance'] > 0.3].merge(tags_df, on='tagId')
-    tag_groups = top_tags.groupby('movieId')['tag'].apply(lambda tags: ' '.join(tags)).reset_index()
+def hybrid_doc_artifacts(movie_path, tags_path, scores_path, ratings_path, cache_dir='cache'):
+    return ArtifactStore('hybrid_docs', [movie_path, tags_path, scores_path, ratings_path],
+                         HYBRID_DOC_PARAMS, cache_dir)
 
-    rating_summary = ratings_df.groupby('movieId').agg({'rating': 'mean', 'userId': 'count'}).reset_index()
-    rating_summary.columns = ['movieId', 'avg_rating', 'rating_count']
+def build_movie_data(store, movie_path, tags_path, scores_path, ratings_path, map_fn=map):
+    import pandas as pd
+    from models.ratings_stream import rating_summary, relevant_tag_text
+    movies_df = pd.read_csv(movie_path, dtype={'movieId': np.int32})
+    # Ratings and genome scores are streamed in chunks; neither is held in full
+    tag_groups = relevant_tag_text(scores_path, tags_path)
+    ratings_summary = rating_summary(ratings_path)
 
     df = movies_df.merge(tag_groups, on='movieId', how='left')
-    df = df.merge(rating_summary, on='movieId', how='left')
+    df = df.merge(ratings_summary, on='movieId', how='left')
     df = df.fillna({'tag': '', 'avg_rating': 0, 'rating_count': 0})
     df['doc'] = df['title'] + ' ' + df['genres'] + ' ' + df['tag']
 
-    tokenized = [nltk.word_tokenize(doc.lower()) for doc in df['doc']]
-
-    df.to_pickle(df_path)
-    with open(token_path, 'rb') as f:
-        pickle.dump(tokenized, f)
-
+    tokenized = list(map_fn(tokenize_doc, df['doc'].tolist()))
+
+    with store.writing('movie_df.pkl') as tmp_path:
+        df.to_pickle(tmp_path)
+    with store.writing('tokenized_docs.pkl') as tmp_path:
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(tokenized, f)
+    with store.writing('bm25.npz') as tmp_path:
+        SparseBM25.from_corpus(tokenized).save(tmp_path)
+
+    # Flat columns the long-lived engine serves from
+    StringColumn.from_strings(df['title']).save(store.path('titles'))
+    with store.writing('avg_rating.npy') as tmp_path:
+        np.save(tmp_path, df['avg_rating'].to_numpy(dtype=float))
+    Facets.from_frame(df).save(store)
+
+def load_movie_data_cached(movie_path, tags_path, scores_path, ratings_path, cache_dir='cache', map_fn=map):
+    store = hybrid_doc_artifacts(movie_path, tags_path, scores_path, ratings_path, cache_dir)
+    store.ensure(lambda: build_movie_data(store, movie_path, tags_path, scores_path, ratings_path, map_fn))
+
+    import pandas as pd
+    df = pd.read_pickle(store.path('movie_df.pkl'))
+    with open(store.path('tokenized_docs.pkl'), 'rb') as f:
+        tokenized = pickle.load(f)
     return df, tokenized
 
-def load_bm25_index(tokenized_docs, cache_file='cache/bm25_index.pkl'):
-    if os.path.exists(cache_file):
-        with open(cache_file, 'rb') as f:
-            return pickle.load(f)
-    bm25 = BM25Okapi(tokenized_docs)
-    with open(cache_file, 'wb') as f:
-        pickle.dump(bm25, f)
-    return bm25
-
-def load_glove_doc_vectors(df, glove_dict, cache_file='cache/glove_doc_vectors.npy'):
-    if os.path.exists(cache_file):
-        return np.load(cache_file)
-    vectors = np.array([
-        embed_text_glove(doc, glove_dict) for doc in df['doc']
-    ])
-    np.save(cache_file, vectors)
-    return vectors
+def load_doc_columns(doc_store):
+    """The columns hybrid scoring reads, as flat arrays instead of a DataFrame"""
+    titles = StringColumn.load(doc_store.path('titles'))
+    return {
+        'title': titles,
+        'title_text': TitleText(titles),
+        'avg_rating': np.load(doc_store.path('avg_rating.npy')),
+        'facets': Facets.load(doc_store),
+    }
+
+def load_bm25_index(doc_store):
+    # Built together with the documents, so it is always in step with them
+    return SparseBM25.load(doc_store.path('bm25.npz'))
+
+def doc_vector_artifacts(doc_store, glove_store, mode='float32', cache_dir='cache'):
+    params = {'mode': mode, 'docs': doc_store.version, 'glove': glove_store.version}
+    return ArtifactStore(f'glove_doc_vectors_{mode}', doc_store.sources + glove_store.sources, params, cache_dir)
+
+def load_glove_doc_vectors(doc_store, glove, store, mode='float32', map_fn=map):
+    # Vectors are persisted L2-normalised (optionally quantised) so a query is one mat-vec
+    def build():
+        import pandas as pd
+        docs = pd.read_pickle(doc_store.path('movie_df.pkl'))['doc'].tolist()
+        vectors = np.array(list(map_fn(partial(embed_doc_from_dir, glove.directory), docs)))
+        DocVectorIndex.from_vectors(vectors, mode).save(store.path('doc_vectors.npy'))
+
+    store.ensure(build)
+    return DocVectorIndex.load(store.path('doc_vectors.npy'), mode)
+
+def ivf_artifacts(vector_store, n_lists=None, cache_dir='cache'):
+    params = {'vectors': vector_store.version, 'n_lists': n_lists}
+    return ArtifactStore(f'{vector_store.namespace}_ivf', vector_store.sources, params, cache_dir)
+
+def load_ivf_index(doc_vectors, store, n_lists=None, nprobe=8):
+    # Clustering happens offline; at query time only the nprobe closest lists are scanned
+    store.ensure(lambda: IVFIndex.build(doc_vectors, n_lists).save(store.path('ivf.npz')))
+    return IVFIndex.load(store.path('ivf.npz'), doc_vectors, nprobe)
 
 # === Hybrid Search Core ===
-def hybrid_search(query, bm25, tokenized_docs, glove_doc_vectors, all_titles, df, glove_dict, alpha=0.6):
-    corrected = correct_query(query, all_titles)
-    query_tokens = nltk.word_tokenize(corrected.lower())
-
-    bm25_raw = bm25.get_scores(query_tokens)
-    bm25_boosted = boost_title_matches(df, query_tokens, bm25_raw)
-    bm25_boosted = boost_phrase_matches(df, corrected, bm25_boosted)
-
-    query_vec = embed_text_glove(corrected, glove_dict).reshape(1, -1)
-    cosine_scores = cosine_similarity(glove_doc_vectors, query_vec).flatten()
-
-    # Normalize
-    bm25_norm = (bm25_boosted - bm25_boosted.min()) / (bm25_boosted.max() - bm25_boosted.min() + 1e-8)
-    cosine_norm = (cosine_scores - cosine_scores.min()) / (cosine_scores.max() - cosine_scores.min() + 1e-8)
-
-    hybrid_scores = alpha * bm25_norm + (1 - alpha) * cosine_norm
-    hybrid_scores *= (df['avg_rating'] / 5).values
-
-    df['score'] = hybrid_scores
-    return df.sort_values('score', ascending=False)
+def hybrid_scores(query, bm25, glove_doc_vectors, all_titles, df, glove, alpha=0.6):
+    return hybrid_scores_batch([query], bm25, glove_doc_vectors, all_titles, df, glove, alpha=alpha)[0]
+
+def hybrid_scores_batch(queries, bm25, glove_doc_vectors, all_titles, df, glove, alpha=0.6):
+    """Hybrid scores of several queries at once (n_queries x n_docs).
+
+    BM25 runs as one sparse query-matrix x index product and the GloVe
+    cosines as one matrix-matrix multiply; boosting and normalisation stay
+    per query. A one-query batch gives exactly the single-query scores; in a
+    larger batch BLAS may round the cosines differently in the last float32
+    bit.
+    """
+    corrected = [correct_query(query, all_titles) for query in queries]
+    query_tokens = [nltk_resources.word_tokenize(text.lower()) for text in corrected]
+
+    bm25_raw = bm25.get_scores_batch(query_tokens)
+    titles = df['title_text'] if 'title_text' in df else TitleText(df['title'])
+
+    query_vecs = np.array([embed_text_glove(text, glove) for text in corrected]).reshape(len(queries), -1)
+    cosine_matrix = glove_doc_vectors.cosine_matrix(query_vecs)
+    rating_weight = np.asarray(df['avg_rating']) / 5
+
+    all_scores = np.empty(bm25_raw.shape)
+    for i, text in enumerate(corrected):
+        bm25_boosted = boost_title_matches(titles, query_tokens[i], bm25_raw[i])
+        bm25_boosted = boost_phrase_matches(titles, text, bm25_boosted)
+        cosine_scores = cosine_matrix[:, i]
+
+        # Normalize
+        bm25_norm = (bm25_boosted - bm25_boosted.min()) / (bm25_boosted.max() - bm25_boosted.min() + 1e-8)
+        cosine_norm = (cosine_scores - cosine_scores.min()) / (cosine_scores.max() - cosine_scores.min() + 1e-8)
+
+        scores = alpha * bm25_norm + (1 - alpha) * cosine_norm
+        scores *= rating_weight
+        all_scores[i] = scores
+    return all_scores
+
+def hybrid_search(query, bm25, tokenized_docs, glove_doc_vectors, all_titles, df, glove, alpha=0.6):
+    scores = hybrid_scores(query, bm25, glove_doc_vectors, all_titles, df, glove, alpha=alpha)
+    return df.assign(score=scores).sort_values('score', ascending=False)
+
+# === Long-Lived Search Engine ===
+class HybridSearchEngine:
+    """Hybrid BM25 + GloVe search that keeps its artifacts in memory across requests.
+
+    Scoring reads flat columns (packed titles, a ratings array) rather than
+    the build-time DataFrame, and the vectors are memory-mapped, so an engine
+    warmed in the gunicorn master is shared copy-on-write by every worker.
+    With ``ann_nprobe`` set, the GloVe channel scores only the documents of
+    the ``ann_nprobe`` closest IVF lists instead of scanning every vector.
+    """
+
+    def __init__(self, movie_path="data/ml-latest/movies.csv",
+                 tags_path="data/ml-latest/genome-tags.csv",
+                 scores_path="data/ml-latest/genome-scores.csv",
+                 ratings_path="data/ml-latest/ratings.csv",
+                 glove_path="models/glove.6B.100d.txt",
+                 vector_mode='float32', cache_dir='cache', ann_nprobe=None, ann_lists=None):
+        self.movie_path = movie_path
+        self.tags_path = tags_path
+        self.scores_path = scores_path
+        self.ratings_path = ratings_path
+        self.glove_path = glove_path
+        self.vector_mode = vector_mode
+        self.cache_dir = cache_dir
+        self.ann_nprobe = ann_nprobe
+        self.ann_lists = ann_lists
+        self.build_version = None
+        self.columns = None
+        self.glove = None
+        self.bm25 = None
+        self.glove_doc_vectors = None
+        self.all_titles = None
+        self.corrector = None
+        self._lock = threading.Lock()
+
+    def warmup(self, map_fn=map):
+        """Load every artifact once; later calls are no-ops"""
+        if self.all_titles is None:
+            with self._lock:
+                if self.all_titles is None:
+                    # Loads the punkt tables now; fails fast if the build did not install them
+                    nltk_resources.word_tokenize("warm up")
+                    paths = (self.movie_path, self.tags_path, self.scores_path, self.ratings_path)
+                    doc_store = hybrid_doc_artifacts(*paths, self.cache_dir)
+                    glove_store = glove_artifacts(self.glove_path, self.cache_dir)
+                    vector_store = doc_vector_artifacts(doc_store, glove_store, self.vector_mode, self.cache_dir)
+
+                    doc_store.ensure(lambda: build_movie_data(doc_store, *paths, map_fn))
+                    glove = load_glove_embeddings(self.glove_path, self.cache_dir)
+                    self.bm25 = load_bm25_index(doc_store)
+                    self.glove_doc_vectors = load_glove_doc_vectors(doc_store, glove, vector_store, mode=self.vector_mode, map_fn=map_fn)
+                    stores = [doc_store, glove_store, vector_store]
+                    if self.ann_nprobe:
+                        ivf_store = ivf_artifacts(vector_store, self.ann_lists, self.cache_dir)
+                        self.glove_doc_vectors = load_ivf_index(self.glove_doc_vectors, ivf_store,
+                                                                self.ann_lists, self.ann_nprobe)
+                        stores.append(ivf_store)
+                    self.build_version = '+'.join(s.version for s in stores) + (f'@{self.ann_nprobe}' if self.ann_nprobe else '')
+                    self.columns, self.glove = load_doc_columns(doc_store), glove
+                    from models.title_corrector import TitleCorrector
+                    self.corrector = TitleCorrector(self.columns['title'])
+                    self.all_titles = self.columns['title']
+        return self
+
+    # Queries scored together per batch; each holds an n_docs score row
+    BATCH_SIZE = 64
+
+    def search(self, query, top_k=200, txt_path="data/movies_links.txt",
+               year_range=DEFAULT_YEAR_RANGE, genres=None, fetch_posters=True):
+        return self.search_batch([query], top_k, txt_path, year_range, genres, fetch_posters)[0]
+
+    def search_batch(self, queries, top_k=200, txt_path="data/movies_links.txt",
+                     year_range=DEFAULT_YEAR_RANGE, genres=None, fetch_posters=True):
+        """Results of many queries, each in the same format as ``search``.
+
+        With ``fetch_posters=False`` results carry no ``poster_url``, leaving
+        OMDB lookups to the caller (the results page loads them lazily).
+        """
+        self.warmup()
+        facet_mask = self.columns['facets'].mask(year_range, genres)
+        catalog = get_catalog(txt_path)
+
+        results = []
+        for start in range(0, len(queries), self.BATCH_SIZE):
+            # Scores are min-max normalised over the whole corpus, so every row is
+            # scored; the year/genre facets then restrict ranking, so the top_k is
+            # always filled from the rows that pass them
+            batch_scores = hybrid_scores_batch(queries[start:start + self.BATCH_SIZE], self.bm25,
+                                               self.glove_doc_vectors, self.corrector,
+                                               self.columns, self.glove, alpha=0.6)
+            for scores in batch_scores:
+                top_titles = self.all_titles.take(top_k_indices(scores, top_k, mask=facet_mask))
+                results.append(self._match_links(catalog, top_titles))
+
+        if fetch_posters:
+            from models.omdb_poster import attach_posters
+            attach_posters(results)
+        return results
+
+    @staticmethod
+    def _match_links(catalog, top_titles):
+        # Match titles against the shared links catalog
+        matched = []
+        count = 0
+        for title in top_titles:
+            row = catalog.find(title)
+            if row is not None:
+                matched.append(catalog.result(row))
+            count += 1
+            if len(matched) >= 10 or count >= 100:
+                break
+        return matched  # list of dicts or empty list
+
+# IVF lists the GloVe channel probes per query; unset or 0 keeps the exact scan
+ANN_NPROBE = int(os.environ.get('GLOVE_ANN_NPROBE', '0')) or None
+# Storage type of the document vectors served (float32, float16 or int8); the build defaults to it too
+VECTOR_MODE = os.environ.get('GLOVE_VECTOR_MODE', 'float32')
+
+_engines = {}
+_engines_lock = threading.Lock()
+
+def get_engine(movie_path="data/ml-latest/movies.csv",
+               tags_path="data/ml-latest/genome-tags.csv",
+               scores_path="data/ml-latest/genome-scores.csv",
+               ratings_path="data/ml-latest/ratings.csv",
+               glove_path="models/glove.6B.100d.txt"):
+    """Return the process-wide engine for these source paths, creating it on first use"""
+    key = (movie_path, tags_path, scores_path, ratings_path, glove_path)
+    engine = _engines.get(key)
+    if engine is None:
+        with _engines_lock:
+            engine = _engines.get(key)
+            if engine is None:
+                engine = _engines[key] = HybridSearchEngine(*key, vector_mode=VECTOR_MODE, ann_nprobe=ANN_NPROBE)
+    return engine
+
+def warmup():
+    """Load the hybrid artifacts now instead of on the first request"""
+    return get_engine().warmup()
+
+def result_version(args):
+    """Identifies the artifact builds and links file a cached result was computed from"""
+    engine = get_engine(args['movie_path'], args['tags_path'], args['scores_path'],
+                        args['ratings_path'], args['glove_path'])
+    return engine.warmup().build_version, get_catalog(args['txt_path']).mtime
 
 # === Final API Function ===
+@result_cache.cached('general', version=result_version)
 def search_general(query, top_k=200, txt_path="data/movies_links.txt",
                    movie_path="data/ml-latest/movies.csv",
                    tags_path="data/ml-latest/genome-tags.csv",
                    scores_path="data/ml-latest/genome-scores.csv",
                    ratings_path="data/ml-latest/ratings.csv",
-                   glove_path="models/glove.6B.100d.txt"):
-
-    # Load data + cache
-    df, tokenized_docs = load_movie_data_cached(movie_path, tags_path, scores_path, ratings_path)
-    glove_dict = load_glove_embeddings(glove_path)
-    bm25 = load_bm25_index(tokenized_docs)
-    glove_doc_vectors = load_glove_doc_vectors(df, glove_dict)
-    all_titles = df['title'].tolist()
-
-    # Rank by hybrid
-    ranked_df = hybrid_search(query, bm25, tokenized_docs, glove_doc_vectors, all_titles, df, glove_dict, alpha=0.6)
-
-    # Filter top_k with year ≥ 1990
-    def extract_year(title):
-        match = re.search(r'\((\d{4})\)', title)
-        return int(match.group(1)) if match else None
-
-    top_df = ranked_df.head(500).copy()
-    top_df['year'] = top_df['title'].apply(extract_year)
-    top_df = top_df[top_df['year'].notnull() & (top_df['year'] >= 1990)].head(top_k)
-
-    # Load txt file
-    with open(txt_path, 'r', encoding='utf-8') as f:
-        lines = f.readlines()
-    title_to_line = {line.split('|')[0].strip().lower(): line.strip() for line in lines}
-
-    # Match titles and build results with poster fetching
-    matched = []
-    count = 0
-    for _, row in top_df.iterrows():
-        title = row['title']
-        key = title.lower()
-        if key in title_to_line:
-            parts = title_to_line[key].split('|')
-            
-            # Fetch poster from OMDB API
-            poster_url = get_movie_poster(parts[0].strip())
-            
-            matched.append({
-                "title": parts[0].strip(),
-                "link1": parts[1].strip() if parts[1].strip().lower() != 'null' else None,
-                "link2": parts[2].strip() if len(parts) > 2 and parts[2].strip().lower() != 'null' else None,
-                "poster_url": poster_url
-            })
-        count += 1
-        if len(matched) >= 10 or count >= 100:
-            break
-    return matched  # list of dicts or empty list
+                   glove_path="models/glove.6B.100d.txt",
+                   year_range=DEFAULT_YEAR_RANGE, genres=None, fetch_posters=True):
+    engine = get_engine(movie_path=movie_path, tags_path=tags_path, scores_path=scores_path,
+                        ratings_path=ratings_path, glove_path=glove_path)
+    return engine.search(query, top_k=top_k, txt_path=txt_path, year_range=year_range, genres=genres,
+                         fetch_posters=fetch_posters)
+
+def search_general_batch(queries, top_k=200, txt_path="data/movies_links.txt",
+                         year_range=DEFAULT_YEAR_RANGE, genres=None, fetch_posters=True):
+    """search_general for many queries, scored together in batches"""
+    # Normalized like the cached single search, so both give the same results
+    return get_engine().search_batch([normalize_query(q) for q in queries], top_k=top_k, txt_path=txt_path,
+                                     year_range=year_range, genres=genres, fetch_posters=fetch_posters)
@@ -0,0 +1,62 @@
+"""Shared vs private memory of gunicorn workers: ``python -m models.memory_report <master_pid>``.
+
+Reads ``/proc/<pid>/smaps_rollup`` (Linux), so pages a worker still shares
+copy-on-write with the master, or maps from the same files, show up as
+shared; pages it has written to show up as private.
+"""
+import argparse
+import os
+import sys
+
+FIELDS = ('Rss', 'Pss', 'Shared_Clean', 'Shared_Dirty', 'Private_Clean', 'Private_Dirty')
+
+def process_memory(pid):
+    """Memory of one process in kB, keyed by the smaps field names plus 'Shared' and 'Private'"""
+    path = f"/proc/{pid}/smaps_rollup"
+    if not os.path.exists(path):
+        path = f"/proc/{pid}/smaps"
+    totals = dict.fromkeys(FIELDS, 0)
+    with open(path, 'r') as f:
+        for line in f:
+            key, _, value = line.partition(':')
+            if key in totals:
+                totals[key] += int(value.split()[0])
+    totals['Shared'] = totals['Shared_Clean'] + totals['Shared_Dirty']
+    totals['Private'] = totals['Private_Clean'] + totals['Private_Dirty']
+    return totals
+
+def child_pids(pid):
+    children = []
+    task_dir = f"/proc/{pid}/task"
+    for tid in os.listdir(task_dir):
+        try:
+            with open(os.path.join(task_dir, tid, 'children'), 'r') as f:
+                children.extend(int(p) for p in f.read().split())
+        except FileNotFoundError:
+            pass
+    return sorted(children)
+
+def format_row(label, pid, memory):
+    mb = lambda kb: f"{kb / 1024:9.1f}"
+    return f"{label:<8} {pid:>7} {mb(memory['Rss'])} {mb(memory['Pss'])} {mb(memory['Shared'])} {mb(memory['Private'])}"
+
+def report(master_pid):
+    """Print one row for the master and each of its workers, in MB"""
+    print(f"{'process':<8} {'pid':>7} {'rss':>9} {'pss':>9} {'shared':>9} {'private':>9}")
+    print(format_row('master', master_pid, process_memory(master_pid)))
+    private_total = 0
+    for i, pid in enumerate(child_pids(master_pid)):
+        memory = process_memory(pid)
+        private_total += memory['Private']
+        print(format_row(f'worker{i}', pid, memory))
+    print(f"Workers' private memory in total: {private_total / 1024:.1f} MB")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Shared vs private memory of a gunicorn master and its workers")
+    parser.add_argument("master_pid", type=int)
+    args = parser.parse_args(argv)
+    report(args.master_pid)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
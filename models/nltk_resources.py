@@ -0,0 +1,90 @@
+"""NLTK data the search engines tokenize with, installed at build time only.
+
+``python -m models.build --stages nltk`` downloads the tokenizer tables and
+the stopword list into ``NLTK_DATA_DIR``. At runtime they are only looked
+up: a missing resource raises ``LookupError`` naming the build command, and
+nothing here ever reaches the network. NLTK itself is imported on first
+use, so modules that merely import this one stay cheap to load.
+"""
+import functools
+import os
+
+NLTK_DATA_DIR = os.path.join('cache', 'nltk_data')
+
+STOPWORDS = 'stopwords'
+RESOURCE_PATHS = {
+    'punkt': 'tokenizers/punkt',
+    'punkt_tab': 'tokenizers/punkt_tab/english/',
+    STOPWORDS: 'corpora/stopwords',
+}
+
+BUILD_COMMAND = "python -m models.build --stages nltk"
+
+def _nltk():
+    import nltk
+    # Searched before NLTK's own locations (NLTK_DATA, ~/nltk_data, ...)
+    if NLTK_DATA_DIR not in nltk.data.path:
+        nltk.data.path.insert(0, NLTK_DATA_DIR)
+    return nltk
+
+def tokenizer_package():
+    """The punkt package ``word_tokenize`` loads: NLTK 3.8.2+ reads the pickle-free ``punkt_tab``"""
+    from nltk.tokenize import punkt
+    return 'punkt_tab' if hasattr(punkt, 'PunktTokenizer') else 'punkt'
+
+def packages():
+    return [tokenizer_package(), STOPWORDS]
+
+def missing(names):
+    """The packages among ``names`` that no NLTK data directory holds"""
+    nltk = _nltk()
+    absent = []
+    for name in names:
+        try:
+            nltk.data.find(RESOURCE_PATHS[name])
+        except LookupError:
+            absent.append(name)
+    return absent
+
+def require(*names):
+    """Raise LookupError unless every named package is installed; never downloads"""
+    absent = missing(names)
+    if absent:
+        raise LookupError(f"NLTK data {', '.join(absent)} not found; install it with `{BUILD_COMMAND}`")
+
+def download(data_dir=NLTK_DATA_DIR):
+    """Build time only: fetch every package the engines need into ``data_dir``"""
+    nltk = _nltk()
+    os.makedirs(data_dir, exist_ok=True)
+    for name in packages():
+        if name in missing([name]):
+            if not nltk.download(name, download_dir=data_dir, quiet=True):
+                raise RuntimeError(f"Could not download NLTK package '{name}'")
+    return data_dir
+
+# === Tokenizer, Stopwords and Stemmer ===
+@functools.lru_cache(maxsize=None)
+def _word_tokenize():
+    require(tokenizer_package())
+    return _nltk().word_tokenize
+
+def word_tokenize(text):
+    return _word_tokenize()(text)
+
+@functools.lru_cache(maxsize=None)
+def stop_words():
+    require(STOPWORDS)
+    from nltk.corpus import stopwords
+    return frozenset(stopwords.words('english'))
+
+@functools.lru_cache(maxsize=None)
+def stemmer():
+    _nltk()
+    from nltk.stem import PorterStemmer
+    return PorterStemmer()
+
+def warmup():
+    """Load the tokenizer tables, stopwords and stemmer now; raises LookupError if not installed"""
+    word_tokenize("warm up")
+    stop_words()
+    stemmer()
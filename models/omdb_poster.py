@@ -1,18 +1,55 @@
 import requests
 import re
 import time
-from typing import Optional, Dict, Any, Tuple
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from requests.adapters import HTTPAdapter
+from typing import Optional, Dict, Any, Tuple, List, Iterator
+
+from models.poster_cache import PosterCache, MISS
+
+class TokenBucket:
+    """Thread-safe token bucket: ``rate`` requests per second, bursts up to ``capacity``"""
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available, then take it"""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
 
 class OMDBPosterFetcher:
     """Fetch movie posters from OMDB API"""
     
-    def __init__(self, api_key: str = "64357812"):
+    def __init__(self, api_key: str = "64357812", base_url: str = "http://www.omdbapi.com/",
+                 max_workers: int = 8, requests_per_second: float = 10.0, burst: int = 5,
+                 cache: Optional[PosterCache] = None):
         self.api_key = api_key
-        self.base_url = "http://www.omdbapi.com/"
+        self.cache = cache
+        self.base_url = base_url
+        self.max_workers = max_workers
+        # One pooled session shared by every worker thread
         self.session = requests.Session()
-        # Add delay to respect API rate limits
-        self.last_request_time = 0
-        self.min_delay = 0.1  # 100ms between requests
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        # Token bucket replaces the old global sleep between requests
+        self.rate_limiter = TokenBucket(requests_per_second, burst)
+        self._executor = None
+        self._executor_lock = threading.Lock()
     
     def extract_title_and_year(self, movie_title: str) -> Tuple[str, Optional[str]]:
         """Extract title and year from movie title string"""
@@ -28,36 +65,52 @@ class OMDBPosterFetcher:
         else:
             return movie_title.strip(), None
     
+    def _query(self, title: str, year: Optional[str]) -> Dict[str, Any]:
+        """Look a title up on OMDB and return the raw JSON response"""
+        self.rate_limiter.acquire()
+        
+        # Prepare API request
+        params = {
+            't': title,
+            'apikey': self.api_key
+        }
+        
+        if year:
+            params['y'] = year
+        
+        # Make API request
+        response = self.session.get(self.base_url, params=params, timeout=5)
+        response.raise_for_status()
+        return response.json()
+    
+    def _lookup(self, movie_title: str) -> Optional[Dict[str, Any]]:
+        """OMDB payload for a title (None if not found), served from the cache when fresh"""
+        title, year = self.extract_title_and_year(movie_title)
+        if self.cache is not None:
+            cached = self.cache.get(title, year)
+            if cached is not MISS:
+                return cached
+        
+        data = self._query(title, year)
+        if data.get('Response') == 'True':
+            found = data
+        elif data.get('Error') == 'Movie not found!':
+            found = None
+        else:
+            # Quota or key errors say nothing about the movie, so don't cache them
+            return None
+        
+        if self.cache is not None:
+            self.cache.put(title, year, found)
+        return found
+    
     def fetch_movie_poster(self, movie_title: str) -> Optional[str]:
         """Fetch movie poster URL from OMDB API"""
         try:
-            # Respect rate limits
-            current_time = time.time()
-            time_since_last = current_time - self.last_request_time
-            if time_since_last < self.min_delay:
-                time.sleep(self.min_delay - time_since_last)
-            
-            # Extract title and year
-            title, year = self.extract_title_and_year(movie_title)
-            
-            # Prepare API request
-            params = {
-                't': title,
-                'apikey': self.api_key
-            }
-            
-            if year:
-                params['y'] = year
-            
-            # Make API request
-            response = self.session.get(self.base_url, params=params, timeout=5)
-            response.raise_for_status()
-            
-            data = response.json()
-            self.last_request_time = time.time()
+            data = self._lookup(movie_title)
             
             # Check if movie found and has poster
-            if data.get('Response') == 'True' and data.get('Poster'):
+            if data and data.get('Poster'):
                 poster_url = data.get('Poster')
                 # Check if poster URL is valid (not N/A)
                 if poster_url and poster_url != 'N/A':
@@ -75,33 +128,10 @@ class OMDBPosterFetcher:
     def fetch_movie_details(self, movie_title: str) -> Optional[Dict[str, Any]]:
         """Fetch complete movie details from OMDB API"""
         try:
-            # Respect rate limits
-            current_time = time.time()
-            time_since_last = current_time - self.last_request_time
-            if time_since_last < self.min_delay:
-                time.sleep(self.min_delay - time_since_last)
-            
-            # Extract title and year
-            title, year = self.extract_title_and_year(movie_title)
-            
-            # Prepare API request
-            params = {
-                't': title,
-                'apikey': self.api_key
-            }
-            
-            if year:
-                params['y'] = year
-            
-            # Make API request
-            response = self.session.get(self.base_url, params=params, timeout=5)
-            response.raise_for_status()
-            
-            data = response.json()
-            self.last_request_time = time.time()
+            data = self._lookup(movie_title)
             
             # Check if movie found
-            if data.get('Response') == 'True':
+            if data:
                 return {
                     'title': data.get('Title'),
                     'year': data.get('Year'),
@@ -121,9 +151,33 @@ class OMDBPosterFetcher:
         except Exception as e:
             print(f"Error fetching details for '{movie_title}': {e}")
             return None
+    
+    def fetch_movie_posters(self, movie_titles: List[str]) -> List[Optional[str]]:
+        """Fetch posters for many titles concurrently, returned in input order"""
+        unique_titles = list(dict.fromkeys(movie_titles))
+        if len(unique_titles) <= 1:
+            posters = {title: self.fetch_movie_poster(title) for title in unique_titles}
+        else:
+            posters = dict(zip(unique_titles, self._get_executor().map(self.fetch_movie_poster, unique_titles)))
+        return [posters[title] for title in movie_titles]
+
+    def iter_movie_posters(self, movie_titles: List[str]) -> Iterator[Tuple[str, Optional[str]]]:
+        """Yield ``(title, poster_url)`` per distinct title as soon as its lookup finishes"""
+        futures = {self._get_executor().submit(self.fetch_movie_poster, title): title
+                   for title in dict.fromkeys(movie_titles)}
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+    
+    def _get_executor(self) -> ThreadPoolExecutor:
+        # Bounded pool, created on first batch and reused by later requests
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="omdb")
+        return self._executor
 
-# Global instance for reuse
-poster_fetcher = OMDBPosterFetcher()
+# Global instance for reuse, backed by the shared on-disk cache
+poster_fetcher = OMDBPosterFetcher(cache=PosterCache())
 
 def get_movie_poster(movie_title: str) -> Optional[str]:
     """Get movie poster URL for a given movie title"""
@@ -131,4 +185,43 @@ def get_movie_poster(movie_title: str) -> Optional[str]:
 
 def get_movie_details(movie_title: str) -> Optional[Dict[str, Any]]:
     """Get complete movie details for a given movie title"""
-    return poster_fetcher.fetch_movie_details(movie_title) 
\ No newline at end of file
+    return poster_fetcher.fetch_movie_details(movie_title)
+
+def get_movie_posters(movie_titles: List[str]) -> List[Optional[str]]:
+    """Get poster URLs for many titles at once, in the same order as the input"""
+    return poster_fetcher.fetch_movie_posters(movie_titles)
+
+def iter_movie_posters(movie_titles: List[str]) -> Iterator[Tuple[str, Optional[str]]]:
+    """Posters for many titles in completion order, so slow lookups don't hold up fast ones"""
+    return poster_fetcher.iter_movie_posters(movie_titles)
+
+def attach_posters(results: List[List[Dict[str, Any]]]) -> None:
+    """Set ``poster_url`` on every movie of several result lists, fetched in one batch"""
+    movies = [movie for matched in results for movie in matched]
+    posters = get_movie_posters([movie["title"] for movie in movies])
+    for movie, poster_url in zip(movies, posters):
+        movie["poster_url"] = poster_url
+
+def get_cache_stats() -> Dict[str, Any]:
+    """Hit/miss counters of the poster cache in this process"""
+    return poster_fetcher.cache.stats() if poster_fetcher.cache else {}
+
+def prefetch_catalog(txt_path: str = "data/movies_links.txt", batch_size: int = 200) -> Dict[str, Any]:
+    """Warm the poster cache for every title in the links catalogue"""
+    from tqdm import tqdm
+
+    with open(txt_path, 'r', encoding='utf-8') as f:
+        titles = list(dict.fromkeys(line.split('|')[0].strip() for line in f if line.strip()))
+
+    for start in tqdm(range(0, len(titles), batch_size), desc="Prefetching posters"):
+        get_movie_posters(titles[start:start + batch_size])
+    return get_cache_stats()
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Fill the OMDB poster cache for the whole catalogue")
+    parser.add_argument("--txt-path", default="data/movies_links.txt")
+    parser.add_argument("--batch-size", type=int, default=200)
+    args = parser.parse_args()
+    print(prefetch_catalog(args.txt_path, args.batch_size))
@@ -0,0 +1,87 @@
+import json
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from models.sqlite_wal import WALConnection
+
+MISS = object()
+
+class PosterCache:
+    """OMDB responses cached on disk in SQLite (WAL mode), shared by all workers.
+
+    Entries are keyed by normalized title and year. Found movies live for
+    ``positive_ttl`` seconds, "not found" answers for ``negative_ttl`` seconds.
+    Each thread (and each forked process) opens its own connection, and WAL
+    lets readers proceed while another process writes.
+    """
+
+    def __init__(self, path: str = "cache/omdb_cache.sqlite3",
+                 positive_ttl: float = 30 * 24 * 3600, negative_ttl: float = 24 * 3600):
+        self.path = path
+        self.positive_ttl = positive_ttl
+        self.negative_ttl = negative_ttl
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self._stats_lock = threading.Lock()
+        self._db = WALConnection(path, (
+            "CREATE TABLE IF NOT EXISTS omdb ("
+            " title TEXT NOT NULL,"
+            " year TEXT NOT NULL,"
+            " found INTEGER NOT NULL,"
+            " payload TEXT,"
+            " fetched_at REAL NOT NULL,"
+            " PRIMARY KEY (title, year))"
+        ))
+
+    def _connect(self) -> sqlite3.Connection:
+        return self._db.get()
+
+    @staticmethod
+    def normalize_key(title: str, year: Optional[str]) -> Tuple[str, str]:
+        return re.sub(r'\s+', ' ', title).strip().lower(), year or ''
+
+    def get(self, title: str, year: Optional[str]) -> Any:
+        """Cached OMDB payload (None for a cached miss), or MISS if absent or expired"""
+        key = self.normalize_key(title, year)
+        row = self._connect().execute(
+            "SELECT found, payload, fetched_at FROM omdb WHERE title = ? AND year = ?", key
+        ).fetchone()
+
+        if row is not None:
+            found, payload, fetched_at = row
+            ttl = self.positive_ttl if found else self.negative_ttl
+            if time.time() - fetched_at < ttl:
+                with self._stats_lock:
+                    if found:
+                        self.hits += 1
+                    else:
+                        self.negative_hits += 1
+                return json.loads(payload) if found else None
+
+        with self._stats_lock:
+            self.misses += 1
+        return MISS
+
+    def put(self, title: str, year: Optional[str], payload: Optional[Dict[str, Any]]):
+        """Store an OMDB payload, or None to remember that the movie was not found"""
+        conn = self._connect()
+        conn.execute(
+            "INSERT OR REPLACE INTO omdb (title, year, found, payload, fetched_at) VALUES (?, ?, ?, ?, ?)",
+            (*self.normalize_key(title, year), int(payload is not None),
+             json.dumps(payload) if payload is not None else None, time.time())
+        )
+        conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            lookups = self.hits + self.negative_hits + self.misses
+            return {
+                'hits': self.hits,
+                'negative_hits': self.negative_hits,
+                'misses': self.misses,
+                'hit_ratio': (self.hits + self.negative_hits) / lookups if lookups else 0.0,
+            }
@@ -0,0 +1,32 @@
+import numpy as np
+
+# === Top-k Selection ===
+def top_k_indices(scores, k, mask=None):
+    """Indices of the k highest scores, best first, without sorting the whole array.
+
+    Uses argpartition to find the winners in O(n) and only sorts that slice.
+    Ties are broken by position, so the result equals the first k entries of a
+    stable descending sort. Rows where ``mask`` is False are never returned.
+    """
+    scores = np.asarray(scores)
+    candidates = None
+    if mask is not None:
+        candidates = np.flatnonzero(mask)
+        scores = scores[candidates]
+
+    n = len(scores)
+    k = min(int(k), n)
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+
+    if k < n:
+        kth = np.partition(scores, n - k)[n - k]
+        above = np.flatnonzero(scores > kth)
+        tied = np.flatnonzero(scores == kth)[:k - len(above)]
+        idx = np.concatenate([above, tied])
+    else:
+        idx = np.arange(n)
+
+    # lexsort orders by the last key first: score descending, then position
+    idx = idx[np.lexsort((idx, -scores[idx]))]
+    return candidates[idx] if candidates is not None else idx
@@ -0,0 +1,114 @@
+import threading
+
+from models.user_recs import UserRecTable, MovieMatrix, feature_artifacts, ranknet_artifacts
+from models.ranknet_numpy import NumpyRankNet
+from models.title_catalog import get_catalog
+from models.result_cache import ResultCache
+
+# === Long-Lived RankNet Engine ===
+class RankNetEngine:
+    """Per-user RankNet recommendations served from prebuilt artifacts.
+
+    The exported model weights and the candidate movie matrix are loaded
+    once from the ``ranknet`` artifact namespace, which is fingerprinted on
+    the MovieLens CSVs and the weights. The model's features describe movies
+    only, so the ranking is the same for every user: it is one batched NumPy
+    forward pass over the matrix (no torch), run once per build in
+    ``warmup``, and each known user is served from it. When the weights
+    can't be used, the precomputed ``UserRecTable`` answers instead. Users
+    outside the table are unknown either way.
+    """
+
+    def __init__(self, cache_dir='cache', weights_path="cache/ranknet_weights.npz", top_n=200,
+                 data_dir="data/ml-latest"):
+        self.cache_dir = cache_dir
+        self.weights_path = weights_path
+        self.top_n = top_n
+        self.data_dir = data_dir
+        self.table = None
+        self.movies = None
+        self.score_fn = None
+        self.ranking = None
+        self.build_version = None
+        self._lock = threading.Lock()
+
+    def warmup(self):
+        """Load the table, the movie matrix and the model once; later calls are no-ops"""
+        if self.table is None:
+            with self._lock:
+                if self.table is None:
+                    store = ranknet_artifacts(feature_artifacts(self.data_dir, self.cache_dir),
+                                              self.weights_path, self.cache_dir)
+                    if not store.is_valid():
+                        raise FileNotFoundError(f"No user recommendations for the current data and weights in "
+                                                f"{store.root}; run `python -m models.build --stages ranknet`")
+                    self.movies = MovieMatrix.load(store.path('movies'))
+                    self.score_fn = self._load_score_fn()
+                    self.build_version = store.version
+                    if self.score_fn is not None:
+                        # Ranked once for this build; every user shares it
+                        movie_ids, _ = self.movies.top(self.score_fn, self.top_n)
+                        self.ranking = self.movies.titles_of(movie_ids)
+                    self.table = UserRecTable.load(store.path('user_recs'))
+        return self
+
+    def _load_score_fn(self):
+        try:
+            net = NumpyRankNet.load(self.weights_path)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"⚠️  RankNet weights unavailable, serving precomputed recommendations: {e}")
+            return None
+        if net.num_features != self.movies.features.shape[1]:
+            print("⚠️  RankNet weights don't match the movie features, serving precomputed recommendations")
+            return None
+        return net
+
+    def ranked_titles(self, user_id):
+        """Titles of the user's top movies, best first, or None for an unknown user"""
+        self.warmup()
+        if user_id not in self.table:
+            return None
+        if self.ranking is not None:
+            return list(self.ranking)
+        movie_ids, _ = self.table.recs(user_id)
+        return self.table.titles_of(movie_ids)
+
+    def recommend(self, user_id, top_k=10, txt_path="data/movies_links.txt"):
+        """Up to ``top_k`` catalog results for the user; None for an unknown user"""
+        titles = self.ranked_titles(user_id)
+        if titles is None:
+            return None
+        catalog = get_catalog(txt_path)
+        results = []
+        for title in titles:
+            row = catalog.find(title)
+            if row is not None:
+                results.append(catalog.result(row))
+            if len(results) >= top_k:
+                break
+        return results
+
+_engine = None
+_engine_lock = threading.Lock()
+
+def get_engine():
+    """Return the process-wide engine, creating it on first use"""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = RankNetEngine()
+    return _engine
+
+def warmup():
+    """Load the RankNet artifacts now instead of on the first request"""
+    return get_engine().warmup()
+
+# Recently seen users; bounded, and local to each worker
+user_cache = ResultCache(maxsize=2048, ttl=3600)
+
+@user_cache.cached('ranknet', version=lambda args: (get_engine().warmup().build_version,
+                                                   get_catalog(args['txt_path']).mtime))
+def recommend_for_user(user_id, top_k=10, txt_path="data/movies_links.txt"):
+    """RankNet results for a user id (string or int); None when the user is unknown"""
+    return get_engine().recommend(user_id, top_k=top_k, txt_path=txt_path)
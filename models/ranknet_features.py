@@ -0,0 +1,77 @@
+import os
+import numpy as np
+import pandas as pd
+
+from models.ratings_stream import RatedUsers, stream_ratings, relevant_tag_text, CHUNK_ROWS
+from models.user_recs import UserRecTable, MovieMatrix, FEATURES, SAMPLE_SIZE
+from models.ranknet_numpy import NumpyRankNet
+
+# Everything RankNet serves from is built here with pandas and NumPy only: the
+# exported weights score the movies, so a deployment without torch, skorch or
+# scikit-learn still builds its recommendation table. Training lives in
+# ranknet_recommend.
+
+# === Load and Cache Features ===
+def load_data(sample_size=SAMPLE_SIZE, chunk_size=CHUNK_ROWS, data_dir="data/ml-latest", users=None):
+    # One chunked pass over ratings.csv keeps a reservoir sample and per-movie
+    # aggregates (and fills ``users``, a RatedUsers, if given), so memory
+    # depends on chunk_size rather than the file size; movie and tag text are
+    # joined onto the sampled rows only
+    sample, aggregates = stream_ratings(os.path.join(data_dir, "ratings.csv"), sample_size, chunk_size, seed=42,
+                                        users=users)
+    movies = pd.read_csv(os.path.join(data_dir, "movies.csv"), dtype={'movieId': np.int32})
+    tag_text = relevant_tag_text(os.path.join(data_dir, "genome-scores.csv"),
+                                 os.path.join(data_dir, "genome-tags.csv"), chunk_size=chunk_size)
+
+    df = sample.merge(movies, on='movieId')
+    df = df.merge(tag_text, on='movieId', how='left')
+    df = df.merge(aggregates, on='movieId', how='left')
+    df['tag'] = df['tag'].fillna('')
+    return df
+
+def create_features(df):
+    df['text'] = (df['title'] + ' ' + df['genres'] + ' ' + df['tag']).fillna('')
+    df['text_len'] = df['text'].apply(lambda x: len(x.split()))
+    df['genre_count'] = df['genres'].apply(lambda x: len(x.split('|')) if isinstance(x, str) else 0)
+    df['rating_norm'] = (df['rating'] - df['rating'].min()) / (df['rating'].max() - df['rating'].min())
+
+    # Dense ids in sorted order, as sklearn's LabelEncoder assigns them
+    df['user_idx'] = np.unique(df['userId'], return_inverse=True)[1]
+    df['movie_idx'] = np.unique(df['movieId'], return_inverse=True)[1]
+    return df, list(FEATURES)
+
+def build_features(store, data_dir="data/ml-latest", sample_size=SAMPLE_SIZE):
+    # Every rated user gets recommendations, not only those in the sample;
+    # their ids are collected in the same pass over ratings.csv
+    users = RatedUsers()
+    df, _ = create_features(load_data(sample_size, data_dir=data_dir, users=users))
+    with store.writing('features.pkl') as tmp_path:
+        df.to_pickle(tmp_path)
+    with store.writing('user_ids.npy') as tmp_path:
+        np.save(tmp_path, users.ids())
+
+def load_features(store, data_dir="data/ml-latest", sample_size=SAMPLE_SIZE):
+    """``(df, feature_cols, user_ids)`` from ``store`` (see ``feature_artifacts``), built on first use"""
+    store.ensure(lambda: build_features(store, data_dir, sample_size))
+    return pd.read_pickle(store.path('features.pkl')), list(FEATURES), np.load(store.path('user_ids.npy'))
+
+# === Recommendation Table ===
+def build_user_recs(store, df, features, weights_path="cache/ranknet_weights.npz", user_ids=None,
+                    top_n=200, batch_size=65536):
+    """Top ``top_n`` recent movies per user, saved to ``store`` as a memory-mapped ``UserRecTable``.
+
+    ``store`` is the ``ranknet_artifacts`` namespace; ``ensure`` it around
+    this call. The movie feature matrix and the 1990+ year filter are built
+    once (and saved as ``movies`` for on-demand ranking) and scored in large
+    batches with the exported weights. The model's features describe movies
+    only, so every user's ranking is the same: it is scored once and shared
+    by all users (``user_ids``, default the users in ``df``) in the table.
+    """
+    matrix = MovieMatrix.from_frame(df, features)
+    matrix.save(store.path('movies'))
+
+    # Scored with the same NumPy forward pass the web workers use
+    forward = NumpyRankNet.load(weights_path)
+    movie_ids, top_scores = matrix.top(forward, top_n, batch_size)
+    users = df['userId'].to_numpy() if user_ids is None else user_ids
+    UserRecTable.shared(users, movie_ids, top_scores, matrix.titles_by_id()).save(store.path('user_recs'))
@@ -0,0 +1,56 @@
+import numpy as np
+
+from models.artifacts import atomic_write
+
+# === Torch-Free RankNet Inference ===
+class NumpyRankNet:
+    """RankNet's MLP as plain float32 arrays: Linear layers with ReLU between them.
+
+    Weights come from the trained torch module's ``state_dict`` (see
+    ``export_weights``), so serving needs neither torch nor skorch.
+    """
+
+    def __init__(self, weights, biases):
+        self.weights = [np.asarray(w, dtype=np.float32) for w in weights]
+        self.biases = [np.asarray(b, dtype=np.float32) for b in biases]
+
+    @classmethod
+    def from_state_dict(cls, state_dict):
+        """Linear layers in module order: every ``*.weight`` with its matching ``*.bias``"""
+        arrays = {name: np.asarray(value.detach().cpu().numpy() if hasattr(value, 'detach') else value)
+                  for name, value in state_dict.items()}
+        names = [name[:-len('.weight')] for name in arrays if name.endswith('.weight')]
+        return cls([arrays[f'{n}.weight'] for n in names], [arrays[f'{n}.bias'] for n in names])
+
+    @property
+    def num_features(self):
+        return self.weights[0].shape[1]
+
+    def __call__(self, batch):
+        """Scores of a ``(n, num_features)`` batch, shape ``(n, 1)`` like the torch module"""
+        x = np.asarray(batch, dtype=np.float32)
+        for i, (weight, bias) in enumerate(zip(self.weights, self.biases)):
+            x = x @ weight.T + bias
+            if i < len(self.weights) - 1:
+                np.maximum(x, 0, out=x)
+        return x
+
+    # === Persistence ===
+    def save(self, path):
+        arrays = {}
+        for i, (weight, bias) in enumerate(zip(self.weights, self.biases)):
+            arrays[f'weight_{i}'], arrays[f'bias_{i}'] = weight, bias
+        with atomic_write(path) as tmp_path:
+            np.savez(tmp_path, **arrays)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            n_layers = sum(1 for name in data.files if name.startswith('weight_'))
+            return cls([data[f'weight_{i}'] for i in range(n_layers)], [data[f'bias_{i}'] for i in range(n_layers)])
+
+def export_weights(model, path):
+    """Write a trained torch RankNet's weights to ``path`` (.npz) and return the NumPy net"""
+    net = NumpyRankNet.from_state_dict(model.state_dict())
+    net.save(path)
+    return net
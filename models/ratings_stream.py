@@ -0,0 +1,129 @@
+import numpy as np
+import pandas as pd
+
+# Narrowest types that hold every MovieLens id and rating (half-star steps)
+RATING_DTYPES = {'userId': np.int32, 'movieId': np.int32, 'rating': np.float32}
+GENOME_DTYPES = {'movieId': np.int32, 'tagId': np.int32, 'relevance': np.float32}
+
+CHUNK_ROWS = 1_000_000
+
+# === Reservoir Sampling ===
+class ReservoirSampler:
+    """Uniform sample of ``size`` rows from a stream of DataFrame chunks (Algorithm R).
+
+    Each chunk is handled with array operations: row ``i`` of the stream
+    draws a slot in ``[0, i]`` and replaces that slot when it falls inside
+    the reservoir, the last writer winning as in the row-by-row algorithm.
+    Memory is the reservoir plus one chunk, however long the stream.
+    """
+
+    def __init__(self, size, seed=42):
+        self.size = size
+        self.rng = np.random.default_rng(seed)
+        self.seen = 0
+        self.rows = None
+
+    def add(self, chunk):
+        chunk = chunk.reset_index(drop=True)
+        if self.rows is None:
+            self.rows = chunk.iloc[:0].copy()
+
+        fill = min(max(self.size - len(self.rows), 0), len(chunk))
+        if fill:
+            self.rows = pd.concat([self.rows, chunk.iloc[:fill]], ignore_index=True)
+        rest = chunk.iloc[fill:]
+        if len(rest):
+            positions = self.seen + fill + np.arange(len(rest))
+            slots = (self.rng.random(len(rest)) * (positions + 1)).astype(np.int64)
+            taken = np.flatnonzero(slots < self.size)
+            # Keep only the last row drawn for each slot
+            unique_slots, last = np.unique(slots[taken][::-1], return_index=True)
+            winners = taken[::-1][last]
+            for column in self.rows.columns:
+                values = self.rows[column].to_numpy(copy=True)
+                values[unique_slots] = rest[column].to_numpy()[winners]
+                self.rows[column] = values
+        self.seen += len(chunk)
+
+    def sample(self):
+        return self.rows.copy() if self.rows is not None else pd.DataFrame()
+
+# === Per-Movie Aggregates ===
+class RatingAggregates:
+    """Running per-movie rating sum and count, indexed directly by movieId"""
+
+    def __init__(self):
+        self.sums = np.zeros(0, dtype=np.float64)
+        self.counts = np.zeros(0, dtype=np.int64)
+
+    def add(self, chunk):
+        movie_ids = chunk['movieId'].to_numpy()
+        size = max(len(self.counts), int(movie_ids.max()) + 1) if len(movie_ids) else len(self.counts)
+        sums = np.bincount(movie_ids, weights=chunk['rating'].to_numpy(dtype=np.float64), minlength=size)
+        counts = np.bincount(movie_ids, minlength=size)
+        sums[:len(self.sums)] += self.sums
+        counts[:len(self.counts)] += self.counts
+        self.sums, self.counts = sums, counts
+
+    def frame(self):
+        """``movieId, avg_rating, rating_count`` for every rated movie, ordered by movieId"""
+        movie_ids = np.flatnonzero(self.counts)
+        return pd.DataFrame({
+            'movieId': movie_ids.astype(np.int32),
+            'avg_rating': self.sums[movie_ids] / self.counts[movie_ids],
+            'rating_count': self.counts[movie_ids],
+        })
+
+# === Rated Users ===
+class RatedUsers:
+    """Running set of user ids seen in the ratings, as a boolean array indexed by userId"""
+
+    def __init__(self):
+        self.seen = np.zeros(0, dtype=bool)
+
+    def add(self, chunk):
+        user_ids = chunk['userId'].to_numpy()
+        if len(user_ids) and user_ids.max() >= len(self.seen):
+            self.seen = np.concatenate([self.seen, np.zeros(int(user_ids.max()) + 1 - len(self.seen), dtype=bool)])
+        self.seen[user_ids] = True
+
+    def ids(self):
+        """Sorted ids of every user with at least one rating"""
+        return np.flatnonzero(self.seen).astype(np.int32)
+
+# === Streaming Readers ===
+def read_ratings_chunks(ratings_path, chunk_size=CHUNK_ROWS):
+    return pd.read_csv(ratings_path, usecols=list(RATING_DTYPES), dtype=RATING_DTYPES, chunksize=chunk_size)
+
+def stream_ratings(ratings_path, sample_size=None, chunk_size=CHUNK_ROWS, seed=42, users=None):
+    """One pass over ``ratings.csv``: a uniform row sample and the per-movie aggregates.
+
+    Returns ``(sample, aggregates)``; ``sample`` is None when ``sample_size``
+    is None. A ``RatedUsers`` passed as ``users`` collects every user id in
+    the same pass. Peak memory depends on ``chunk_size`` and ``sample_size`` only.
+    """
+    sampler = ReservoirSampler(sample_size, seed) if sample_size else None
+    aggregates = RatingAggregates()
+    for chunk in read_ratings_chunks(ratings_path, chunk_size):
+        aggregates.add(chunk)
+        if sampler is not None:
+            sampler.add(chunk)
+        if users is not None:
+            users.add(chunk)
+    return (sampler.sample() if sampler is not None else None), aggregates.frame()
+
+def rating_summary(ratings_path, chunk_size=CHUNK_ROWS):
+    """Per-movie ``avg_rating`` and ``rating_count`` without loading the ratings"""
+    return stream_ratings(ratings_path, chunk_size=chunk_size)[1]
+
+def relevant_tag_text(scores_path, tags_path, min_relevance=0.3, chunk_size=CHUNK_ROWS):
+    """``movieId, tag``: each movie's tags above ``min_relevance``, space-joined in file order.
+
+    Genome scores are filtered chunk by chunk, so only the relevant rows
+    (a small fraction of the file) are ever held at once.
+    """
+    chunks = pd.read_csv(scores_path, dtype=GENOME_DTYPES, chunksize=chunk_size)
+    relevant = pd.concat([chunk[chunk['relevance'] > min_relevance] for chunk in chunks], ignore_index=True)
+    tags = pd.read_csv(tags_path, dtype={'tagId': np.int32})
+    top_tags = relevant.merge(tags, on='tagId')
+    return top_tags.groupby('movieId')['tag'].apply(lambda tags: ' '.join(tags)).reset_index()
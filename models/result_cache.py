@@ -0,0 +1,187 @@
+import copy
+import functools
+import inspect
+import json
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+from models.sqlite_wal import WALConnection
+
+MISS = object()
+
+def normalize_query(query: str) -> str:
+    # Whitespace only: correction and ranking are case-sensitive, so case stays part of the key
+    return re.sub(r'\s+', ' ', query).strip()
+
+# === Shared Result Store ===
+class SharedResultStore:
+    """Search results in SQLite (WAL mode), so every worker reuses each other's work.
+
+    Rows hold the JSON result, the time it took to compute and an expiry
+    time. At most ``max_rows`` are kept; expired and oldest rows are pruned
+    every ``PRUNE_EVERY`` writes.
+    """
+
+    PRUNE_EVERY = 100
+
+    def __init__(self, path: str = "cache/result_cache.sqlite3", max_rows: int = 20000):
+        self.path = path
+        self.max_rows = max_rows
+        self._writes = 0
+        self._db = WALConnection(path, (
+            "CREATE TABLE IF NOT EXISTS results ("
+            " key TEXT PRIMARY KEY,"
+            " payload TEXT NOT NULL,"
+            " compute_seconds REAL NOT NULL,"
+            " expires_at REAL NOT NULL)"
+        ))
+
+    def _connect(self) -> sqlite3.Connection:
+        return self._db.get()
+
+    def get(self, key: str):
+        """(result, compute_seconds), or MISS if absent or expired"""
+        row = self._connect().execute(
+            "SELECT payload, compute_seconds, expires_at FROM results WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None or row[2] <= time.time():
+            return MISS
+        return json.loads(row[0]), row[1]
+
+    def put(self, key: str, result: Any, compute_seconds: float, ttl: float):
+        conn = self._connect()
+        conn.execute(
+            "INSERT OR REPLACE INTO results (key, payload, compute_seconds, expires_at) VALUES (?, ?, ?, ?)",
+            (key, json.dumps(result), compute_seconds, time.time() + ttl)
+        )
+        self._writes += 1
+        if self._writes % self.PRUNE_EVERY == 0:
+            conn.execute("DELETE FROM results WHERE expires_at <= ?", (time.time(),))
+            conn.execute(
+                "DELETE FROM results WHERE key IN ("
+                " SELECT key FROM results ORDER BY expires_at DESC LIMIT -1 OFFSET ?)", (self.max_rows,)
+            )
+        conn.commit()
+
+# === Result Cache ===
+class ResultCache:
+    """LRU + TTL cache for search and recommendation results.
+
+    Keys combine the endpoint kind, the normalized query, the remaining call
+    parameters and the build version of the data that produced the result,
+    so rebuilding an index (or editing the links file) makes old entries
+    unreachable instead of stale. An in-process LRU answers repeats without
+    I/O; the optional ``shared`` store lets workers reuse each other's
+    results. Each hit counts the compute time it saved.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 600, shared: Optional[SharedResultStore] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.shared = shared
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self.saved_seconds = 0.0
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                result, compute_seconds, expires_at = entry
+                if expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    self.saved_seconds += compute_seconds
+                    return copy.deepcopy(result)
+                del self._entries[key]
+
+        if self.shared is not None:
+            try:
+                found = self.shared.get(key)
+            except sqlite3.Error:
+                found = MISS
+            if found is not MISS:
+                result, compute_seconds = found
+                self._remember(key, copy.deepcopy(result), compute_seconds)
+                with self._lock:
+                    self.shared_hits += 1
+                    self.saved_seconds += compute_seconds
+                return result
+
+        with self._lock:
+            self.misses += 1
+        return MISS
+
+    def put(self, key: str, result: Any, compute_seconds: float):
+        self._remember(key, copy.deepcopy(result), compute_seconds)
+        if self.shared is not None:
+            try:
+                self.shared.put(key, result, compute_seconds, self.ttl)
+            except (sqlite3.Error, TypeError, ValueError):
+                pass  # Unshareable results still live in this worker's LRU
+
+    def _remember(self, key, result, compute_seconds):
+        with self._lock:
+            self._entries[key] = (result, compute_seconds, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def cached(self, kind: str, version: Callable[[Dict[str, Any]], Any]):
+        """Decorator caching ``fn(query, ...)`` by kind, normalized query, parameters and version.
+
+        The first parameter is taken as the query, and ``fn`` is called with
+        the normalized query: every spelling that shares a cache entry then
+        gets the same result, whichever of them was computed first.
+        ``version`` receives the bound call arguments and returns the build
+        version of whatever data the call reads.
+        """
+        def decorate(fn):
+            signature = inspect.signature(fn)
+            query_param = next(iter(signature.parameters))
+
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                bound = signature.bind(*args, **kwargs)
+                bound.apply_defaults()
+                bound.arguments[query_param] = normalize_query(bound.arguments[query_param])
+                params = dict(bound.arguments)
+                query = params.pop(query_param)
+                key = json.dumps([kind, query, params, version(bound.arguments)], sort_keys=True, default=str)
+
+                result = self.get(key)
+                if result is not MISS:
+                    return result
+                started = time.perf_counter()
+                result = fn(*bound.args, **bound.kwargs)
+                self.put(key, result, time.perf_counter() - started)
+                return result
+
+            wrapper.uncached = fn
+            return wrapper
+        return decorate
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.shared_hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'shared_hits': self.shared_hits,
+                'misses': self.misses,
+                'hit_ratio': (self.hits + self.shared_hits) / lookups if lookups else 0.0,
+                'saved_seconds': round(self.saved_seconds, 3),
+            }
+
+result_cache = ResultCache(shared=SharedResultStore())
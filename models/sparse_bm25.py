@@ -0,0 +1,206 @@
+import math
+import numpy as np
+
+from models.string_column import find_sorted
+
+# === Sparse BM25 Index ===
+class SparseBM25:
+    """BM25Okapi-compatible scorer backed by a CSR term -> postings matrix.
+
+    Only the postings of the query terms are touched, so scoring costs
+    O(postings of query terms) instead of O(corpus x query tokens).
+
+    The vocabulary is kept as a sorted fixed-width byte array searched with
+    a binary search rather than a dict of Python strings, so an index loaded
+    before ``fork`` is made of a handful of NumPy buffers that stay shared.
+    """
+
+    def __init__(self, vocab, idf, indptr, doc_ids, term_freqs, doc_len, k1=1.5, b=0.75, epsilon=0.25):
+        self.k1 = k1
+        self.b = b
+        self.epsilon = epsilon
+        terms = np.array([term.encode('utf-8') for term in vocab], dtype=bytes)
+        self.term_order = np.argsort(terms, kind='stable').astype(np.int32)
+        self.sorted_terms = terms[self.term_order]
+        self.idf = np.asarray(idf, dtype=np.float64)
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.doc_ids = np.asarray(doc_ids, dtype=np.int32)
+        self.term_freqs = np.asarray(term_freqs)
+        self.doc_len = np.asarray(doc_len, dtype=np.int64)
+        self.corpus_size = len(self.doc_len)
+        self.avgdl = self.doc_len.sum() / self.corpus_size
+
+        # Per-posting BM25 weights, evaluated in the same order as BM25Okapi.get_scores
+        # so the floating point results are identical
+        norm = self.k1 * (1 - self.b + self.b * self.doc_len / self.avgdl)
+        tf = self.term_freqs.astype(np.float64)
+        term_idf = np.repeat(self.idf, np.diff(self.indptr))
+        self.weights = term_idf * (tf * (self.k1 + 1) / (tf + norm[self.doc_ids]))
+
+    @classmethod
+    def from_corpus(cls, corpus, k1=1.5, b=0.75, epsilon=0.25):
+        """Build the index from a list of token lists"""
+        term_to_id = {}
+        coo_terms, coo_docs, coo_tfs = [], [], []
+        doc_len = np.zeros(len(corpus), dtype=np.int64)
+
+        for doc_id, document in enumerate(corpus):
+            doc_len[doc_id] = len(document)
+            frequencies = {}
+            for word in document:
+                frequencies[word] = frequencies.get(word, 0) + 1
+            for word, freq in frequencies.items():
+                coo_terms.append(term_to_id.setdefault(word, len(term_to_id)))
+                coo_docs.append(doc_id)
+                coo_tfs.append(freq)
+
+        coo_terms = np.asarray(coo_terms, dtype=np.int64)
+        # Stable sort keeps each posting list in ascending doc order
+        order = np.argsort(coo_terms, kind='stable')
+        doc_freqs = np.bincount(coo_terms, minlength=len(term_to_id))
+        indptr = np.zeros(len(term_to_id) + 1, dtype=np.int64)
+        np.cumsum(doc_freqs, out=indptr[1:])
+        doc_ids = np.asarray(coo_docs, dtype=np.int32)[order]
+        term_freqs = np.asarray(coo_tfs, dtype=np.int64)[order]
+        term_freqs = term_freqs.astype(np.min_scalar_type(term_freqs.max() if len(term_freqs) else 0))
+
+        vocab = list(term_to_id)
+        idf = cls._calc_idf(len(corpus), doc_freqs, epsilon)
+        return cls(vocab, idf, indptr, doc_ids, term_freqs, doc_len, k1=k1, b=b, epsilon=epsilon)
+
+    @staticmethod
+    def _calc_idf(corpus_size, doc_freqs, epsilon):
+        # Mirrors BM25Okapi._calc_idf term by term (math.log, first-seen order)
+        idf = np.empty(len(doc_freqs), dtype=np.float64)
+        idf_sum = 0
+        negative = []
+        for term_id, freq in enumerate(doc_freqs.tolist()):
+            value = math.log(corpus_size - freq + 0.5) - math.log(freq + 0.5)
+            idf[term_id] = value
+            idf_sum += value
+            if value < 0:
+                negative.append(term_id)
+        if len(idf):
+            average_idf = idf_sum / len(idf)
+            idf[negative] = epsilon * average_idf
+        return idf
+
+    @property
+    def vocab(self):
+        """Terms in id order"""
+        return [term.decode('utf-8') for term in self.sorted_terms[np.argsort(self.term_order)]]
+
+    # === Persistence ===
+    def save(self, path):
+        vocab_blob = np.frombuffer('\n'.join(self.vocab).encode('utf-8'), dtype=np.uint8)
+        with open(path, 'wb') as f:
+            np.savez(f, vocab=vocab_blob, idf=self.idf, indptr=self.indptr, doc_ids=self.doc_ids,
+                     term_freqs=self.term_freqs, doc_len=self.doc_len.astype(np.int32),
+                     params=np.array([self.k1, self.b, self.epsilon], dtype=np.float64))
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            blob = data['vocab'].tobytes().decode('utf-8')
+            vocab = blob.split('\n') if blob else []
+            k1, b, epsilon = data['params'].tolist()
+            return cls(vocab, data['idf'], data['indptr'], data['doc_ids'], data['term_freqs'],
+                       data['doc_len'], k1=k1, b=b, epsilon=epsilon)
+
+    # === Scoring ===
+    def term_id(self, term):
+        pos = int(find_sorted(self.sorted_terms, [term.encode('utf-8')])[0])
+        return int(self.term_order[pos]) if pos >= 0 else None
+
+    def _postings(self, term):
+        term_id = self.term_id(term)
+        if term_id is None:
+            return None
+        start, end = self.indptr[term_id], self.indptr[term_id + 1]
+        return self.doc_ids[start:end], self.weights[start:end]
+
+    def get_scores(self, query):
+        """Dense score vector over the whole corpus, same values as BM25Okapi.get_scores"""
+        scores = np.zeros(self.corpus_size)
+        for term in query:
+            postings = self._postings(term)
+            if postings is not None:
+                scores[postings[0]] += postings[1]
+        return scores
+
+    def get_sparse_scores(self, query, require_all=False, mask=None):
+        """Scores for only the documents that contain the query terms.
+
+        By default any query term qualifies a document (OR). With
+        ``require_all`` only documents containing every distinct query term
+        are scored (AND); the posting lists are intersected before scoring.
+        Documents where the boolean ``mask`` is False are dropped before any
+        weight is accumulated. Returns (doc_ids, scores) with doc_ids
+        ascending; scores equal the corresponding entries of get_scores.
+        """
+        if require_all:
+            return self._conjunctive_scores(query, mask)
+
+        postings = [p for p in map(self._postings, query) if p is not None]
+        if not postings:
+            return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float64)
+        ids = np.concatenate([p[0] for p in postings])
+        weights = np.concatenate([p[1] for p in postings])
+        if mask is not None:
+            keep = mask[ids]
+            ids, weights = ids[keep], weights[keep]
+        doc_ids, inverse = np.unique(ids, return_inverse=True)
+        return doc_ids, np.bincount(inverse, weights=weights, minlength=len(doc_ids))
+
+    # === Batched Scoring ===
+    def _query_postings(self, queries):
+        """Postings of every query term, flattened as (query row, doc id, weight).
+
+        Terms keep query order, so accumulating the weights in array order
+        adds them up exactly as get_scores does.
+        """
+        rows, ids, weights = [], [], []
+        for row, query in enumerate(queries):
+            for term in query:
+                postings = self._postings(term)
+                if postings is not None:
+                    rows.append(np.full(len(postings[0]), row, dtype=np.int64))
+                    ids.append(postings[0])
+                    weights.append(postings[1])
+        if not rows:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+        return np.concatenate(rows), np.concatenate(ids).astype(np.int64), np.concatenate(weights)
+
+    def get_scores_batch(self, queries):
+        """Dense (n_queries x corpus) scores: the sparse query matrix times the index.
+
+        All postings of all queries go through a single ``bincount`` over
+        (query, doc) cells. Row i equals get_scores(queries[i]) exactly; the
+        result holds n_queries x corpus floats, so callers batch in chunks.
+        """
+        rows, ids, weights = self._query_postings(queries)
+        cells = rows * self.corpus_size + ids
+        scores = np.bincount(cells, weights=weights, minlength=len(queries) * self.corpus_size)
+        return scores.reshape(len(queries), self.corpus_size)
+
+    def _conjunctive_scores(self, query, mask=None):
+        empty = np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float64)
+        postings = {term: self._postings(term) for term in query}
+        if not postings or any(p is None for p in postings.values()):
+            return empty
+
+        # Intersect shortest lists first so the candidate set shrinks fastest
+        doc_ids = None
+        for ids, _ in sorted(postings.values(), key=lambda p: len(p[0])):
+            doc_ids = ids if doc_ids is None else np.intersect1d(doc_ids, ids, assume_unique=True)
+            if not len(doc_ids):
+                return empty
+        if mask is not None:
+            doc_ids = doc_ids[mask[doc_ids]]
+
+        # Add weights in query order, exactly as get_scores does
+        scores = np.zeros(len(doc_ids))
+        for term in query:
+            ids, weights = postings[term]
+            scores += weights[np.searchsorted(ids, doc_ids)]
+        return doc_ids, scores
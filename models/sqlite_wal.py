@@ -0,0 +1,33 @@
+import os
+import sqlite3
+import threading
+
+# === Per-Thread SQLite Connections ===
+class WALConnection:
+    """A SQLite database in WAL mode, opened once per thread and per process.
+
+    ``get()`` returns the calling thread's connection, creating the file's
+    directory and running ``schema`` (idempotent ``CREATE ... IF NOT
+    EXISTS`` statements) on first use. A connection inherited across
+    ``fork()`` is never reused, and WAL lets readers proceed while another
+    process writes.
+    """
+
+    def __init__(self, path: str, schema: str):
+        self.path = path
+        self.schema = schema
+        self._local = threading.local()
+
+    def get(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(self.schema)
+            conn.commit()
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
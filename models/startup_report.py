@@ -0,0 +1,86 @@
+"""Cold-start report for a web worker: ``python -m models.startup_report``.
+
+Starts a fresh interpreter that imports the app and runs its warmup, as a
+gunicorn worker without ``preload_app`` does, then prints import time per
+package (from ``python -X importtime``) and the time of each warmup stage.
+Exits non-zero when the worker took longer than ``--budget`` seconds to
+become ready. Run it after ``python -m models.build``; before that the
+engines have nothing to load and their stages fail.
+"""
+import argparse
+import json
+import subprocess
+import sys
+from collections import defaultdict
+
+MARKER = "STARTUP_REPORT "
+
+# Runs in the child: everything it prints besides the marker line is the app's own output
+PROBE = f"""
+import json, time
+started = time.perf_counter()
+import app
+imported = time.perf_counter() - started
+stages = app.warmup()
+print({MARKER!r} + json.dumps({{'import': imported, 'stages': stages,
+                               'ready': time.perf_counter() - started}}))
+"""
+
+def parse_importtime(stderr):
+    """``(module, self_seconds, cumulative_seconds)`` for each line ``-X importtime`` wrote"""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # The column header
+        entries.append((fields[2].strip(), int(fields[0]) / 1e6, int(fields[1]) / 1e6))
+    return entries
+
+def package_of(module):
+    # This repo's modules are listed one by one; everything else by top-level package
+    parts = module.split(".")
+    return ".".join(parts[:2]) if parts[0] == "models" else parts[0]
+
+def import_time_by_package(entries):
+    """Self time summed per package, slowest first"""
+    totals = defaultdict(float)
+    for module, self_seconds, _ in entries:
+        totals[package_of(module)] += self_seconds
+    return sorted(totals.items(), key=lambda item: item[1], reverse=True)
+
+def measure(python=sys.executable):
+    """Import and warm the app in a new interpreter: ``(import entries, timings)``"""
+    proc = subprocess.run([python, "-X", "importtime", "-c", PROBE], capture_output=True, text=True)
+    lines = [line for line in proc.stdout.splitlines() if line.startswith(MARKER)]
+    if proc.returncode != 0 or not lines:
+        raise RuntimeError(f"Startup probe failed:\n{proc.stdout}{proc.stderr}")
+    return parse_importtime(proc.stderr), json.loads(lines[-1][len(MARKER):])
+
+def format_report(entries, timings, budget, top=15):
+    lines = [f"📦 Import time by package (top {top})"]
+    packages = import_time_by_package(entries)[:top]
+    width = max((len(name) for name, _ in packages), default=0)
+    lines += [f"  {name:<{width}}  {seconds:6.2f}s" for name, seconds in packages]
+
+    lines.append("🔥 Startup stages")
+    stages = [("import app", timings['import'])] + [tuple(stage) for stage in timings['stages']]
+    width = max(len(name) for name, _ in stages)
+    lines += [f"  {name:<{width}}  {seconds:6.2f}s" for name, seconds in stages]
+    verdict = "✅" if timings['ready'] <= budget else "❌ over budget"
+    lines.append(f"  {'ready':<{width}}  {timings['ready']:6.2f}s  (budget {budget:.2f}s) {verdict}")
+    return "\n".join(lines)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time a cold worker start: imports and warmup stages")
+    parser.add_argument("--budget", type=float, default=1.0, help="Seconds a worker may take to become ready")
+    parser.add_argument("--top", type=int, default=15, help="Packages listed by import time")
+    args = parser.parse_args(argv)
+
+    entries, timings = measure()
+    print(format_report(entries, timings, args.budget, args.top))
+    return 0 if timings['ready'] <= args.budget else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
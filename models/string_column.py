@@ -0,0 +1,90 @@
+import os
+import numpy as np
+
+from models.artifacts import atomic_write
+
+# === Sorted Fixed-Width Keys ===
+def find_sorted(sorted_keys, keys):
+    """Positions of ``keys`` in the sorted fixed-width array ``sorted_keys``, -1 where absent.
+
+    ``keys`` are bytes for an ``S`` array and str for a ``U`` array. Empty keys
+    and keys wider than the array's items (which the cast would truncate to a
+    possibly matching prefix) count as absent.
+    """
+    width = sorted_keys.dtype.itemsize // (4 if sorted_keys.dtype.kind == 'U' else 1)
+    keys = list(keys)
+    positions = np.full(len(keys), -1, dtype=np.int64)
+    fits = [i for i, key in enumerate(keys) if 0 < len(key) <= width]
+    if not fits or not len(sorted_keys):
+        return positions
+    packed = np.array([keys[i] for i in fits], dtype=sorted_keys.dtype)
+    pos = np.minimum(np.searchsorted(sorted_keys, packed), len(sorted_keys) - 1)
+    found = sorted_keys[pos] == packed
+    positions[np.asarray(fits)[found]] = pos[found]
+    return positions
+
+# === Flat String Column ===
+class StringColumn:
+    """A list of strings packed into one UTF-8 byte buffer plus an offsets array.
+
+    Two NumPy arrays instead of one Python object per string, so a column
+    loaded before ``fork`` stays in shared pages: reading an item decodes a
+    fresh ``str`` and never writes to the buffer. Saved columns are opened
+    with mmap and shared through the page cache as well.
+    """
+
+    def __init__(self, buffer, offsets):
+        self.buffer = buffer
+        self.offsets = offsets
+
+    @classmethod
+    def from_strings(cls, strings):
+        encoded = [s.encode('utf-8') for s in strings]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(s) for s in encoded], out=offsets[1:])
+        buffer = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+        return cls(buffer, offsets)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        return self.buffer[self.offsets[i]:self.offsets[i + 1]].tobytes().decode('utf-8')
+
+    def __iter__(self):
+        # A memoryview slices without copying; tobytes() would copy the whole buffer
+        data = memoryview(self.buffer)
+        offsets = self.offsets.tolist()
+        for start, end in zip(offsets, offsets[1:]):
+            yield str(data[start:end], 'utf-8')
+
+    def take(self, ids):
+        """The strings at ``ids``, decoded in one pass over the offsets"""
+        ids = np.asarray(ids, dtype=np.int64)
+        starts = self.offsets[ids].tolist()
+        ends = self.offsets[ids + 1].tolist()
+        data = memoryview(self.buffer)
+        return [str(data[start:end], 'utf-8') for start, end in zip(starts, ends)]
+
+    def tolist(self):
+        return list(self)
+
+    # === Persistence ===
+    @staticmethod
+    def paths(path):
+        base, _ = os.path.splitext(path)
+        return f"{base}.buffer.npy", f"{base}.offsets.npy"
+
+    def save(self, path):
+        for file_path, array in zip(self.paths(path), (self.buffer, self.offsets)):
+            with atomic_write(file_path) as tmp_path:
+                np.save(tmp_path, array)
+
+    @classmethod
+    def load(cls, path):
+        buffer_path, offsets_path = cls.paths(path)
+        return cls(np.load(buffer_path, mmap_mode='r'), np.load(offsets_path, mmap_mode='r'))
@@ -0,0 +1,96 @@
+import os
+import threading
+import numpy as np
+
+from models.string_column import StringColumn, find_sorted
+
+# === Shared Title -> Link Catalog ===
+class TitleCatalog:
+    """``movies_links.txt`` parsed once into string columns plus a sorted title key array.
+
+    Rows keep file order in three ``StringColumn``s (a missing link is stored
+    as an empty string), so a catalog loaded before ``fork`` stays in shared
+    pages instead of holding one refcounted object per title. ``keys`` holds
+    the lowercased UTF-8 titles sorted, and ``key_rows`` the row of each (the
+    last duplicate wins, like the old per-request dicts), so joining a ranked
+    title to its links is a binary search. A catalog never changes after it
+    is built; ``get_catalog`` swaps in a new one when the file's mtime
+    changes, so a request holding a catalog always sees consistent columns.
+    """
+
+    def __init__(self, txt_path="data/movies_links.txt", mtime=None, version=1,
+                 titles=None, link1=None, link2=None):
+        self.txt_path = txt_path
+        self.mtime = mtime
+        self.version = version
+        self.titles = titles if titles is not None else StringColumn.from_strings([])
+        self.link1 = link1 if link1 is not None else StringColumn.from_strings([])
+        self.link2 = link2 if link2 is not None else StringColumn.from_strings([])
+
+        # np.unique keeps the first of equal keys, so reverse to keep the last
+        lowered = np.array([title.lower().encode('utf-8') for title in self.titles][::-1], dtype=np.bytes_)
+        self.keys, first = np.unique(lowered, return_index=True)
+        self.key_rows = len(lowered) - 1 - first
+
+    @classmethod
+    def load(cls, txt_path="data/movies_links.txt", version=1):
+        mtime = file_mtime(txt_path)
+        if mtime is None:
+            return cls(txt_path, mtime, version)
+        titles, link1, link2 = [], [], []
+        with open(txt_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                parts = line.strip().split('|')
+                titles.append(parts[0].strip())
+                link1.append(cls._link(parts, 1))
+                link2.append(cls._link(parts, 2))
+        return cls(txt_path, mtime, version, StringColumn.from_strings(titles),
+                   StringColumn.from_strings(link1), StringColumn.from_strings(link2))
+
+    @staticmethod
+    def _link(parts, i):
+        if len(parts) <= i:
+            return ''
+        link = parts[i].strip()
+        return link if link.lower() != "null" else ''
+
+    def __len__(self):
+        return len(self.titles)
+
+    def find(self, title):
+        """Row of a title (case-insensitive), or None if it has no links"""
+        pos = int(find_sorted(self.keys, [title.strip().lower().encode('utf-8')])[0])
+        return int(self.key_rows[pos]) if pos >= 0 else None
+
+    def links(self, row):
+        """``(link1, link2)`` of a row, None where the file has no link"""
+        return self.link1[row] or None, self.link2[row] or None
+
+    def result(self, row):
+        """The dict shape the templates render, without a poster"""
+        link1, link2 = self.links(row)
+        return {
+            "title": self.titles[row],
+            "link1": link1,
+            "link2": link2,
+        }
+
+def file_mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+_catalogs = {}
+_catalogs_lock = threading.Lock()
+
+def get_catalog(txt_path="data/movies_links.txt"):
+    """Process-wide catalog for a links file, re-parsed only if its mtime changed"""
+    catalog = _catalogs.get(txt_path)
+    if catalog is None or catalog.mtime != file_mtime(txt_path):
+        with _catalogs_lock:
+            catalog = _catalogs.get(txt_path)
+            if catalog is None or catalog.mtime != file_mtime(txt_path):
+                version = catalog.version + 1 if catalog else 1
+                catalog = _catalogs[txt_path] = TitleCatalog.load(txt_path, version)
+    return catalog
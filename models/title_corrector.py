@@ -0,0 +1,117 @@
+import functools
+import numpy as np
+from rapidfuzz import process, fuzz
+
+from models.ranking import top_k_indices
+from models.string_column import StringColumn, find_sorted
+
+def sort_tokens(text):
+    """The string token_sort_ratio actually compares: whitespace tokens, sorted"""
+    return ' '.join(sorted(text.split()))
+
+def qgrams(text, q):
+    return {text[i:i + q] for i in range(len(text) - q + 1)}
+
+# === Indexed Fuzzy Query Correction ===
+class TitleCorrector:
+    """Spelling correction against catalogue titles via a character q-gram index.
+
+    Produces the same correction as ``process.extractOne(query, titles,
+    scorer=fuzz.token_sort_ratio)`` whenever the best score is above
+    ``min_score``, but only scores a shortlist exactly.  Every title gets an
+    upper bound on the Indel-based score (100 * (1 - d / (l1 + l2))) from two
+    exact bounds on the distance d:
+
+    * length: d >= |l1 - l2|;
+    * q-gram lemma: each edit destroys at most q grams, so
+      d >= (|grams(query)| - shared distinct grams) / q.
+
+    The best-bounded titles are scored first; after that only titles whose
+    bound can still reach the best exact score need scoring.
+
+    Corrections are memoized per (query, min_score).
+
+    Titles are held as a ``StringColumn`` and the gram vocabulary as a sorted
+    fixed-width array, so the index is flat NumPy buffers that forked workers
+    can share.
+    """
+
+    Q = 3
+    SHORTLIST = 256
+
+    def __init__(self, titles, cache_size=4096):
+        self.titles = titles if isinstance(titles, StringColumn) else StringColumn.from_strings(titles)
+        sorted_titles = [sort_tokens(t) for t in self.titles]
+        self.lengths = np.array([len(t) for t in sorted_titles], dtype=np.int64)
+
+        gram_to_id = {}
+        coo_grams, coo_titles = [], []
+        for title_id, text in enumerate(sorted_titles):
+            for gram in qgrams(text, self.Q):
+                coo_grams.append(gram_to_id.setdefault(gram, len(gram_to_id)))
+                coo_titles.append(title_id)
+
+        # Renumber grams in sorted order so a gram's id is its position in self.grams
+        grams = np.array(list(gram_to_id), dtype=f'U{self.Q}')
+        rank = np.empty(len(grams), dtype=np.int64)
+        rank[np.argsort(grams)] = np.arange(len(grams))
+        self.grams = np.sort(grams)
+
+        coo_grams = rank[np.asarray(coo_grams, dtype=np.int64)]
+        order = np.argsort(coo_grams, kind='stable')
+        self.indptr = np.zeros(len(gram_to_id) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(coo_grams, minlength=len(gram_to_id)), out=self.indptr[1:])
+        self.postings = np.asarray(coo_titles, dtype=np.int32)[order]
+
+        self._cached_correct = functools.lru_cache(maxsize=cache_size)(self._correct)
+
+    def gram_ids(self, grams):
+        """Ids of the grams that occur in some title"""
+        pos = find_sorted(self.grams, grams)
+        return pos[pos >= 0].tolist()
+
+    def upper_bounds(self, query):
+        """Upper bound on token_sort_ratio(query, title) for every title"""
+        text = sort_tokens(query)
+        grams = qgrams(text, self.Q)
+
+        ids = self.gram_ids(grams)
+        if len(ids):
+            hits = np.concatenate([self.postings[self.indptr[i]:self.indptr[i + 1]] for i in ids])
+            overlap = np.bincount(hits, minlength=len(self.titles))
+        else:
+            overlap = np.zeros(len(self.titles), dtype=np.int64)
+
+        length_sum = np.maximum(len(text) + self.lengths, 1)
+        min_distance = np.maximum(len(grams) - overlap, 0) / self.Q
+        by_length = 200 * np.minimum(len(text), self.lengths) / length_sum
+        by_grams = 100 * (1 - min_distance / length_sum)
+        return np.minimum(by_length, by_grams)
+
+    def _correct(self, query, min_score):
+        bounds = self.upper_bounds(query)
+        # Small tolerance so float rounding can only widen the search
+        reachable = bounds > min_score - 1e-6
+
+        # Score the most promising titles first, then only those whose bound
+        # can still match the best exact score found among them
+        first = np.sort(top_k_indices(bounds, self.SHORTLIST, mask=reachable))
+        best_score, best_id = self._best(query, first, -1.0, None)
+        if best_id is not None:
+            rest = np.flatnonzero(reachable & (bounds >= best_score - 1e-6))
+            best_score, best_id = self._best(query, np.setdiff1d(rest, first), best_score, best_id)
+
+        return self.titles[best_id] if best_id is not None and best_score > min_score else query
+
+    def _best(self, query, title_ids, best_score, best_id):
+        if not len(title_ids):
+            return best_score, best_id
+        scores = process.cdist([query], self.titles.take(title_ids), scorer=fuzz.token_sort_ratio)[0]
+        for title_id, score in zip(title_ids.tolist(), scores.tolist()):
+            # Ties go to the earliest title, like extractOne over the full list
+            if score > best_score or (score == best_score and title_id < best_id):
+                best_score, best_id = score, title_id
+        return best_score, best_id
+
+    def correct(self, query, min_score=85):
+        return self._cached_correct(query, min_score)
@@ -0,0 +1,65 @@
+import numpy as np
+
+# === Vectorized Substring Search over Titles ===
+class TitleText:
+    """Lowercased titles packed into one UTF-8 buffer for vectorized substring tests.
+
+    ``contains(needle)`` answers ``needle in title.lower()`` for every title at
+    once. The positions of each byte value in the buffer are precomputed, so a
+    search starts from the occurrences of the needle's rarest byte and checks
+    the remaining bytes with array gathers; matching byte runs are mapped back
+    to titles with ``searchsorted`` on the title offsets. UTF-8 is
+    self-synchronizing, so a byte-level match is exactly a character-level
+    one. Titles are separated by ``SEP``; a needle containing it could match
+    across two titles, so those fall back to testing each title.
+    """
+
+    SEP = b'\n'
+
+    def __init__(self, titles):
+        lowered = [title.lower().encode('utf-8', 'surrogatepass') for title in titles]
+        self.buffer = np.frombuffer(self.SEP.join(lowered) + self.SEP, dtype=np.uint8)
+        # offsets[i] is where title i starts; its text ends one byte before offsets[i + 1]
+        self.offsets = np.zeros(len(lowered) + 1, dtype=np.int64)
+        np.cumsum([len(title) + 1 for title in lowered], out=self.offsets[1:])
+
+        self.byte_positions = np.argsort(self.buffer, kind='stable').astype(np.int32)
+        self.byte_starts = np.zeros(257, dtype=np.int64)
+        np.cumsum(np.bincount(self.buffer, minlength=256), out=self.byte_starts[1:])
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def contains(self, needle):
+        """Boolean array: ``needle in title.lower()`` for each title (needle already lowercase)"""
+        encoded = needle.encode('utf-8', 'surrogatepass')
+        if not encoded:
+            return np.ones(len(self), dtype=bool)
+        if self.SEP in encoded:
+            return self._contains_slow(encoded)
+
+        needle_bytes = np.frombuffer(encoded, dtype=np.uint8).astype(np.int64)
+        counts = self.byte_starts[needle_bytes + 1] - self.byte_starts[needle_bytes]
+        anchor = int(np.argmin(counts))
+        byte = needle_bytes[anchor]
+        starts = self.byte_positions[self.byte_starts[byte]:self.byte_starts[byte + 1]].astype(np.int64) - anchor
+        starts = starts[(starts >= 0) & (starts <= len(self.buffer) - len(encoded))]
+        for k, value in enumerate(needle_bytes.tolist()):
+            if k != anchor and len(starts):
+                starts = starts[self.buffer[starts + k] == value]
+
+        mask = np.zeros(len(self), dtype=bool)
+        mask[np.searchsorted(self.offsets, starts, side='right') - 1] = True
+        return mask
+
+    def contains_any(self, needles):
+        """Boolean array: any of the needles occurs in the title"""
+        mask = np.zeros(len(self), dtype=bool)
+        for needle in set(needles):
+            mask |= self.contains(needle)
+        return mask
+
+    def _contains_slow(self, encoded):
+        data = self.buffer.tobytes()
+        offsets = self.offsets.tolist()
+        return np.array([encoded in data[start:end - 1] for start, end in zip(offsets, offsets[1:])], dtype=bool)
@@ -0,0 +1,183 @@
+import os
+import numpy as np
+
+from models.artifacts import ArtifactStore, atomic_write
+from models.ranking import top_k_indices
+from models.string_column import StringColumn
+
+# Movie features RankNet scores, in the model's input order
+FEATURES = ['text_len', 'genre_count', 'rating_norm']
+# Ratings rows sampled into the training frame
+SAMPLE_SIZE = 15000
+
+# === Artifact Namespaces ===
+def feature_artifacts(data_dir="data/ml-latest", cache_dir='cache', sample_size=SAMPLE_SIZE):
+    """The sampled feature frame and every rated user id, built from the MovieLens CSVs"""
+    sources = [os.path.join(data_dir, name) for name in ('ratings.csv', 'movies.csv', 'genome-scores.csv', 'genome-tags.csv')]
+    return ArtifactStore('ranknet_features', sources, {'sample_size': sample_size, 'features': FEATURES}, cache_dir)
+
+def ranknet_artifacts(feature_store, weights_path="cache/ranknet_weights.npz", cache_dir='cache'):
+    """The movie matrix and user table scored with the exported weights, which are a source too"""
+    return ArtifactStore('ranknet', feature_store.sources + [weights_path], {'features': feature_store.version}, cache_dir)
+
+# === Batched Scoring ===
+def score_in_batches(score_fn, features, batch_size=65536):
+    """``score_fn`` over the rows of ``features`` in batches, as one float32 vector"""
+    features = np.asarray(features, dtype=np.float32)
+    scores = np.empty(len(features), dtype=np.float32)
+    for start in range(0, len(features), batch_size):
+        scores[start:start + batch_size] = np.asarray(score_fn(features[start:start + batch_size])).reshape(-1)
+    return scores
+
+def top_movies(scores, movie_ids, top_n=200, mask=None):
+    """The ``top_n`` best-scored movie ids (optionally only where ``mask``), best first"""
+    best = top_k_indices(scores, top_n, mask=mask)
+    return np.asarray(movie_ids)[best].astype(np.int32), np.asarray(scores)[best].astype(np.float32)
+
+# === Candidate Movies ===
+class MovieMatrix:
+    """The movies RankNet ranks: int32 ids, float32 feature rows, a recency flag and titles.
+
+    Built once from the training frame and memory-mapped at serve time, so
+    ranking for a user is one batched forward pass plus a masked top-k.
+    """
+
+    ARRAYS = ('movie_ids', 'features', 'recent')
+
+    def __init__(self, movie_ids, features, recent, titles):
+        self.movie_ids = movie_ids
+        self.features = features
+        self.recent = recent
+        self.titles = titles
+
+    @classmethod
+    def from_frame(cls, df, features, min_year=1990):
+        movies = df.drop_duplicates('movieId')
+        years = movies['title'].str.extract(r'\((\d{4})\)')[0].astype(float).to_numpy()
+        return cls(movies['movieId'].to_numpy(dtype=np.int32), movies[features].to_numpy(dtype=np.float32),
+                   years >= min_year, StringColumn.from_strings(movies['title']))
+
+    def __len__(self):
+        return len(self.movie_ids)
+
+    def top(self, score_fn, top_n=200, batch_size=65536):
+        """``(movie_ids, scores)`` of the best recent movies under ``score_fn``"""
+        scores = score_in_batches(score_fn, self.features, batch_size)
+        return top_movies(scores, self.movie_ids, top_n, mask=np.asarray(self.recent))
+
+    def titles_of(self, movie_ids):
+        order = np.argsort(self.movie_ids, kind='stable')
+        rows = order[np.searchsorted(self.movie_ids, movie_ids, sorter=order)]
+        return self.titles.take(rows)
+
+    def titles_by_id(self):
+        return dict(zip(self.movie_ids.tolist(), self.titles.tolist()))
+
+    # === Persistence ===
+    @staticmethod
+    def exists(directory):
+        return os.path.exists(os.path.join(directory, 'titles.offsets.npy'))
+
+    def save(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        for name in self.ARRAYS:
+            with atomic_write(os.path.join(directory, f'{name}.npy')) as tmp_path:
+                np.save(tmp_path, getattr(self, name))
+        # Titles last: their presence marks a complete matrix
+        self.titles.save(os.path.join(directory, 'titles'))
+
+    @classmethod
+    def load(cls, directory):
+        arrays = [np.load(os.path.join(directory, f'{name}.npy'), mmap_mode='r') for name in cls.ARRAYS]
+        return cls(*arrays, StringColumn.load(os.path.join(directory, 'titles')))
+
+# === Compact Recommendation Table ===
+class UserRecTable:
+    """Per-user top-N recommendations as flat int32/float32 arrays, memory-mapped at serve time.
+
+    Users whose rankings are identical point at one shared list:
+    ``user_ids`` (sorted) -> ``user_list`` -> a row of ``list_movie_ids`` /
+    ``list_scores`` (padded with -1 / NaN past ``list_lengths``). Titles of
+    every listed movie are kept alongside, keyed by the sorted ``movie_ids``,
+    so serving needs no CSV.
+    """
+
+    ARRAYS = ('user_ids', 'user_list', 'list_movie_ids', 'list_scores', 'list_lengths', 'movie_ids')
+
+    def __init__(self, user_ids, user_list, list_movie_ids, list_scores, list_lengths, movie_ids, titles):
+        self.user_ids = user_ids
+        self.user_list = user_list
+        self.list_movie_ids = list_movie_ids
+        self.list_scores = list_scores
+        self.list_lengths = list_lengths
+        self.movie_ids = movie_ids
+        self.titles = titles
+
+    @classmethod
+    def from_lists(cls, user_ids, user_list, lists, titles_by_id):
+        """``lists`` is a sequence of ``(movie_ids, scores)``; ``user_list[i]`` picks the list of ``user_ids[i]``"""
+        width = max((len(ids) for ids, _ in lists), default=0)
+        list_movie_ids = np.full((len(lists), width), -1, dtype=np.int32)
+        list_scores = np.full((len(lists), width), np.nan, dtype=np.float32)
+        list_lengths = np.zeros(len(lists), dtype=np.int32)
+        for i, (ids, scores) in enumerate(lists):
+            list_movie_ids[i, :len(ids)] = ids
+            list_scores[i, :len(ids)] = scores
+            list_lengths[i] = len(ids)
+
+        order = np.argsort(user_ids, kind='stable')
+        movie_ids = np.unique(list_movie_ids[list_movie_ids >= 0]).astype(np.int32)
+        titles = StringColumn.from_strings([titles_by_id[movie_id] for movie_id in movie_ids.tolist()])
+        return cls(np.asarray(user_ids, dtype=np.int32)[order], np.asarray(user_list, dtype=np.int32)[order],
+                   list_movie_ids, list_scores, list_lengths, movie_ids, titles)
+
+    @classmethod
+    def shared(cls, user_ids, movie_ids, scores, titles_by_id):
+        """Every user gets the same list"""
+        user_ids = np.unique(user_ids)
+        return cls.from_lists(user_ids, np.zeros(len(user_ids), dtype=np.int32), [(movie_ids, scores)], titles_by_id)
+
+    def __len__(self):
+        return len(self.user_ids)
+
+    def __contains__(self, user_id):
+        return self._list_of(user_id) is not None
+
+    def _list_of(self, user_id):
+        try:
+            user_id = int(user_id)
+        except (TypeError, ValueError):
+            return None
+        i = int(np.searchsorted(self.user_ids, user_id))
+        if i < len(self.user_ids) and self.user_ids[i] == user_id:
+            return int(self.user_list[i])
+        return None
+
+    def recs(self, user_id):
+        """``(movie_ids, scores)`` of the user's list, best first, or None for an unknown user"""
+        row = self._list_of(user_id)
+        if row is None:
+            return None
+        length = self.list_lengths[row]
+        return self.list_movie_ids[row, :length], self.list_scores[row, :length]
+
+    def titles_of(self, movie_ids):
+        return self.titles.take(np.searchsorted(self.movie_ids, movie_ids))
+
+    # === Persistence ===
+    @staticmethod
+    def exists(directory):
+        return os.path.exists(os.path.join(directory, 'titles.offsets.npy'))
+
+    def save(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        for name in self.ARRAYS:
+            with atomic_write(os.path.join(directory, f'{name}.npy')) as tmp_path:
+                np.save(tmp_path, getattr(self, name))
+        # Titles last: their presence marks a complete table
+        self.titles.save(os.path.join(directory, 'titles'))
+
+    @classmethod
+    def load(cls, directory):
+        arrays = [np.load(os.path.join(directory, f'{name}.npy'), mmap_mode='r') for name in cls.ARRAYS]
+        return cls(*arrays, StringColumn.load(os.path.join(directory, 'titles')))
@@ -0,0 +1,273 @@
+import os
+import time
+import numpy as np
+
+from models.artifacts import atomic_write
+from models.ranking import top_k_indices
+
+QUANTIZATION_MODES = ('float32', 'float16', 'int8')
+
+def l2_normalize(vectors):
+    """Row-normalise to unit length; all-zero rows stay zero (like sklearn)"""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    norms[norms == 0] = 1
+    return vectors / norms
+
+# === Pre-Normalised Document Vectors ===
+class DocVectorIndex:
+    """Unit-length document vectors, so cosine similarity is a single mat-vec.
+
+    ``mode`` selects the storage type: float32 (exact), float16 (half the
+    memory) or int8 with one float32 scale per row (a quarter of the memory).
+    Quantised rows are dequantised in chunks while scanning, so the full
+    float32 matrix is never materialised.
+    """
+
+    CHUNK_ROWS = 16384
+
+    def __init__(self, vectors, scales=None, mode='float32'):
+        if mode not in QUANTIZATION_MODES:
+            raise ValueError(f"Unknown quantization mode '{mode}', expected one of {QUANTIZATION_MODES}")
+        self.vectors = vectors
+        self.scales = scales
+        self.mode = mode
+
+    def __len__(self):
+        return len(self.vectors)
+
+    @classmethod
+    def from_vectors(cls, vectors, mode='float32'):
+        normalized = l2_normalize(vectors)
+        if mode == 'float16':
+            return cls(normalized.astype(np.float16), mode=mode)
+        if mode == 'int8':
+            scales = np.abs(normalized).max(axis=1) / 127
+            scales[scales == 0] = 1
+            quantized = np.round(normalized / scales[:, None]).astype(np.int8)
+            return cls(quantized, scales.astype(np.float32), mode=mode)
+        return cls(normalized, mode=mode)
+
+    # === Persistence ===
+    @staticmethod
+    def paths(cache_file, mode):
+        base, _ = os.path.splitext(cache_file)
+        return f"{base}.{mode}.npy", f"{base}.{mode}.scales.npy"
+
+    def save(self, cache_file):
+        vectors_path, scales_path = self.paths(cache_file, self.mode)
+        with atomic_write(vectors_path) as tmp_path:
+            np.save(tmp_path, self.vectors)
+        if self.scales is not None:
+            with atomic_write(scales_path) as tmp_path:
+                np.save(tmp_path, self.scales)
+
+    @classmethod
+    def load(cls, cache_file, mode='float32'):
+        vectors_path, scales_path = cls.paths(cache_file, mode)
+        vectors = np.load(vectors_path, mmap_mode='r')
+        scales = np.load(scales_path, mmap_mode='r') if mode == 'int8' else None
+        return cls(vectors, scales, mode=mode)
+
+    def rows(self, ids):
+        """Unit-length float32 vectors of the given documents, dequantised"""
+        rows = np.asarray(self.vectors[ids], dtype=np.float32)
+        if self.scales is not None:
+            rows *= np.asarray(self.scales[ids])[:, None]
+        return rows
+
+    # === Scoring ===
+    def cosine(self, query_vec):
+        """Cosine similarity of every document against one query vector"""
+        return self.cosine_matrix(np.asarray(query_vec).reshape(1, -1))[:, 0]
+
+    def cosine_matrix(self, query_vecs):
+        """Cosine similarity of every document against each query (n_docs x n_queries)"""
+        queries = l2_normalize(np.asarray(query_vecs).reshape(len(query_vecs), -1)).T
+        if self.mode == 'float32':
+            return np.asarray(self.vectors @ queries)
+
+        out = np.empty((len(self.vectors), queries.shape[1]), dtype=np.float32)
+        for start in range(0, len(self.vectors), self.CHUNK_ROWS):
+            end = start + self.CHUNK_ROWS
+            out[start:end] = self.vectors[start:end].astype(np.float32) @ queries
+        if self.scales is not None:
+            out *= np.asarray(self.scales)[:, None]
+        return out
+
+# === Approximate Nearest Neighbours ===
+def default_n_lists(n_docs):
+    return max(1, int(np.sqrt(n_docs)))
+
+def train_centroids(vectors, n_lists, iterations=20, sample_size=256, seed=0):
+    """Spherical k-means on a sample of ``sample_size`` rows per list; returns unit centroids"""
+    rng = np.random.default_rng(seed)
+    sample_ids = np.sort(rng.choice(len(vectors), size=min(len(vectors), n_lists * sample_size), replace=False))
+    sample = vectors.rows(sample_ids)
+    centroids = sample[rng.choice(len(sample), size=n_lists, replace=False)]
+    for _ in range(iterations):
+        assign = np.argmax(sample @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assign, sample)
+        # Lists that lost every member restart from a random sample row
+        empty = np.flatnonzero(np.bincount(assign, minlength=n_lists) == 0)
+        sums[empty] = sample[rng.choice(len(sample), size=len(empty))]
+        centroids = l2_normalize(sums)
+    return centroids
+
+class IVFIndex:
+    """Inverted-file ANN index over a ``DocVectorIndex``.
+
+    Documents are clustered offline into ``n_lists`` lists by spherical
+    k-means. A query is compared with the centroids first and only the
+    documents of the ``nprobe`` closest lists are scored exactly, so
+    ``nprobe`` trades recall for speed: ``nprobe == n_lists`` is an exact
+    scan. Only the list layout is stored; scoring reads the document vectors
+    themselves, in whatever quantisation mode they use.
+    """
+
+    def __init__(self, doc_vectors, centroids, offsets, list_ids, nprobe=8):
+        self.doc_vectors = doc_vectors
+        self.centroids = centroids
+        self.offsets = offsets
+        self.list_ids = list_ids
+        self.nprobe = nprobe
+
+    def __len__(self):
+        return len(self.doc_vectors)
+
+    @property
+    def n_lists(self):
+        return len(self.centroids)
+
+    @classmethod
+    def build(cls, doc_vectors, n_lists=None, nprobe=8, seed=0):
+        n_lists = min(n_lists or default_n_lists(len(doc_vectors)), len(doc_vectors))
+        centroids = train_centroids(doc_vectors, n_lists, seed=seed)
+
+        assign = np.empty(len(doc_vectors), dtype=np.int64)
+        for start in range(0, len(doc_vectors), DocVectorIndex.CHUNK_ROWS):
+            ids = np.arange(start, min(start + DocVectorIndex.CHUNK_ROWS, len(doc_vectors)))
+            assign[ids] = np.argmax(doc_vectors.rows(ids) @ centroids.T, axis=1)
+
+        offsets = np.zeros(n_lists + 1, dtype=np.int64)
+        np.cumsum(np.bincount(assign, minlength=n_lists), out=offsets[1:])
+        list_ids = np.argsort(assign, kind='stable').astype(np.int32)
+        return cls(doc_vectors, centroids, offsets, list_ids, nprobe)
+
+    def save(self, path):
+        with atomic_write(path) as tmp_path:
+            np.savez(tmp_path, centroids=self.centroids, offsets=self.offsets, list_ids=self.list_ids)
+
+    @classmethod
+    def load(cls, path, doc_vectors, nprobe=8):
+        with np.load(path) as data:
+            return cls(doc_vectors, data['centroids'], data['offsets'], data['list_ids'], nprobe)
+
+    # === Scoring ===
+    def candidates(self, query_vec, nprobe=None):
+        """Ids of the documents in the ``nprobe`` lists closest to the query"""
+        nprobe = min(nprobe or self.nprobe, self.n_lists)
+        probe = top_k_indices(self.centroids @ query_vec, nprobe)
+        return np.concatenate([self.list_ids[self.offsets[i]:self.offsets[i + 1]] for i in probe])
+
+    def search(self, query_vec, top_n=100, nprobe=None):
+        """Approximate top ``top_n`` documents by cosine, best first: ``(ids, scores)``"""
+        query = l2_normalize(np.asarray(query_vec).reshape(1, -1))[0]
+        ids = self.candidates(query, nprobe)
+        scores = self.doc_vectors.rows(ids) @ query
+        best = top_k_indices(scores, top_n)
+        return ids[best], scores[best]
+
+    def cosine(self, query_vec):
+        return self.cosine_matrix(np.asarray(query_vec).reshape(1, -1))[:, 0]
+
+    def cosine_matrix(self, query_vecs):
+        """Drop-in for ``DocVectorIndex.cosine_matrix`` scoring only the probed lists.
+
+        Probed documents get their exact cosine; every other document gets the
+        lowest probed score, so they rank last and min-max normalisation stays
+        within the scored range.
+        """
+        queries = l2_normalize(np.asarray(query_vecs).reshape(len(query_vecs), -1))
+        out = np.empty((len(self), len(queries)), dtype=np.float32)
+        for i, query in enumerate(queries):
+            ids = self.candidates(query)
+            scores = self.doc_vectors.rows(ids) @ query
+            out[:, i] = scores.min() if len(scores) else 0
+            out[ids, i] = scores
+        return out
+
+# === Recall Report ===
+def sample_queries(vectors, n_queries=200, seed=42):
+    """Perturbed document vectors to use as queries, so reports need nothing but the vectors"""
+    rng = np.random.default_rng(seed)
+    sample = rng.choice(len(vectors), size=min(n_queries, len(vectors)), replace=False)
+    return vectors[sample] + rng.normal(scale=0.05, size=(len(sample), vectors.shape[1])).astype(np.float32)
+
+def quantization_report(vectors, k=10, n_queries=200, seed=42):
+    """Recall@k and memory of each storage mode against exact float32 search.
+
+    A random sample of the document vectors (lightly perturbed) is used as the
+    query set, so the report needs nothing beyond the vectors themselves.
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+    queries = sample_queries(vectors, n_queries, seed)
+
+    exact = DocVectorIndex.from_vectors(vectors, 'float32')
+    k = min(k, len(vectors))
+    truth = np.argpartition(-exact.cosine_matrix(queries), k - 1, axis=0)[:k].T
+
+    report = {}
+    for mode in QUANTIZATION_MODES:
+        index = exact if mode == 'float32' else DocVectorIndex.from_vectors(vectors, mode)
+        found = np.argpartition(-index.cosine_matrix(queries), k - 1, axis=0)[:k].T
+        hits = sum(len(np.intersect1d(t, f)) for t, f in zip(truth, found))
+        nbytes = index.vectors.nbytes + (index.scales.nbytes if index.scales is not None else 0)
+        report[mode] = {f'recall@{k}': hits / (k * len(truth)), 'megabytes': nbytes / 2 ** 20}
+    return report
+
+def ivf_report(doc_vectors, nprobes=(1, 2, 4, 8, 16, 32), k=10, n_lists=None, n_queries=200, seed=42):
+    """Recall@k, share of documents scanned and latency of IVF search per ``nprobe``.
+
+    The ``exact`` row is the brute-force scan the IVF results are compared with.
+    """
+    queries = sample_queries(doc_vectors.rows(np.arange(len(doc_vectors))), n_queries, seed)
+    k = min(k, len(doc_vectors))
+
+    started = time.perf_counter()
+    truth = [top_k_indices(doc_vectors.cosine(query), k) for query in queries]
+    report = {'exact': {f'recall@{k}': 1.0, 'scanned': 1.0,
+                        'ms_per_query': (time.perf_counter() - started) * 1000 / len(queries)}}
+
+    index = IVFIndex.build(doc_vectors, n_lists, seed=seed)
+    for nprobe in nprobes:
+        if nprobe > index.n_lists:
+            break
+        started = time.perf_counter()
+        found = [index.search(query, k, nprobe)[0] for query in queries]
+        elapsed = time.perf_counter() - started
+        hits = sum(len(np.intersect1d(t, f)) for t, f in zip(truth, found))
+        scanned = float(np.mean([len(index.candidates(l2_normalize(q[None])[0], nprobe)) for q in queries]))
+        report[f'nprobe={nprobe}'] = {f'recall@{k}': hits / (k * len(truth)),
+                                      'scanned': scanned / len(doc_vectors),
+                                      'ms_per_query': elapsed * 1000 / len(queries)}
+    return report
+
+if __name__ == "__main__":
+    import argparse
+    from models.artifacts import committed_path
+
+    parser = argparse.ArgumentParser(description="Recall@k of quantised storage and of the IVF index against exact search")
+    parser.add_argument("cache_file", nargs="?", default=None,
+                        help="float32 doc_vectors.npy (default: the committed build)")
+    parser.add_argument("--ivf", action="store_true", help="Report IVF recall/speed per nprobe instead")
+    parser.add_argument("--n-lists", type=int, default=None)
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32])
+    args = parser.parse_args()
+
+    cache_file = args.cache_file or committed_path('glove_doc_vectors_float32', 'doc_vectors.npy')
+    index = DocVectorIndex.load(cache_file, 'float32')
+    report = ivf_report(index, args.nprobe, n_lists=args.n_lists) if args.ivf else quantization_report(index.vectors)
+    for name, stats in report.items():
+        print(f"{name:12s} " + "  ".join(f"{stat}={value:.4f}" for stat, value in stats.items()))
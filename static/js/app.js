@@ -17,8 +17,58 @@ function showLinks(link1, link2) {
   }
 }
 
+// Posters are resolved after the results page renders, a few titles per request
+const POSTER_BATCH_SIZE = 5;
+
+async function loadPosterBatch(images) {
+    const byTitle = new Map();
+    images.forEach(img => {
+        const title = img.dataset.posterTitle;
+        if (!byTitle.has(title)) byTitle.set(title, []);
+        byTitle.get(title).push(img);
+    });
+
+    const response = await fetch('/api/posters', {
+        method: 'POST',
+        headers: {'Content-Type': 'application/json'},
+        body: JSON.stringify({titles: Array.from(byTitle.keys())})
+    });
+    if (!response.ok || !response.body) return;
+
+    // NDJSON: one {title, poster_url} line per title, in the order lookups finish
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffered = '';
+    const applyLine = line => {
+        if (!line.trim()) return;
+        const poster = JSON.parse(line);
+        (byTitle.get(poster.title) || []).forEach(img => {
+            if (poster.poster_url) img.src = poster.poster_url;
+            img.removeAttribute('data-poster-title');
+        });
+    };
+    while (true) {
+        const {done, value} = await reader.read();
+        if (done) break;
+        buffered += decoder.decode(value, {stream: true});
+        const lines = buffered.split('\n');
+        buffered = lines.pop();
+        lines.forEach(applyLine);
+    }
+    applyLine(buffered);
+}
+
+function loadPosters() {
+    const images = Array.from(document.querySelectorAll('img[data-poster-title]'));
+    for (let i = 0; i < images.length; i += POSTER_BATCH_SIZE) {
+        loadPosterBatch(images.slice(i, i + POSTER_BATCH_SIZE)).catch(() => {});
+    }
+}
+
 // Add click functionality to sample ID items
 document.addEventListener('DOMContentLoaded', function() {
+    loadPosters();
+
     // Make sample ID items clickable
     const idItems = document.querySelectorAll('.id-item');
     idItems.forEach(item => {
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Test script for the JSON search API
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import json
+import pytest
+
+import app
+import models.bm25_search
+import models.hybrid_search
+from models.facets import DEFAULT_YEAR_RANGE
+
+def fake_searches(monkeypatch):
+    """Search functions that record their arguments instead of searching"""
+    calls = []
+
+    def search_specific(query, year_range, genres, fetch_posters):
+        calls.append((query, year_range, genres))
+        return [{'title': query, 'link1': None, 'link2': None}]
+
+    def search_specific_batch(queries, year_range, genres, fetch_posters):
+        calls.append((queries, year_range, genres))
+        return [[{'title': query, 'link1': None, 'link2': None}] for query in queries]
+
+    def search_general(query, year_range, genres, fetch_posters):
+        calls.append(('general', query))
+        return []
+
+    def search_general_batch(queries, year_range, genres, fetch_posters):
+        calls.append(('general', queries))
+        return [[] for _ in queries]
+
+    monkeypatch.setattr(models.bm25_search, "search_specific", search_specific)
+    monkeypatch.setattr(models.bm25_search, "search_specific_batch", search_specific_batch)
+    monkeypatch.setattr(models.hybrid_search, "search_general", search_general)
+    monkeypatch.setattr(models.hybrid_search, "search_general_batch", search_general_batch)
+    return calls
+
+def test_search(monkeypatch):
+    calls = fake_searches(monkeypatch)
+    client = app.app.test_client()
+
+    response = client.get("/api/search", query_string={'query': "heat"})
+    assert response.status_code == 200
+    assert response.get_json() == {'results': [{'title': "heat", 'link1': None, 'link2': None}]}
+    assert calls[-1] == ("heat", DEFAULT_YEAR_RANGE, [])
+
+    # Form posts work too, and search_type picks the engine
+    response = client.post("/api/search", data={'query': "heat", 'search_type': "general"})
+    assert response.status_code == 200
+    assert response.get_json() == {'results': []}
+    assert calls[-1] == ('general', "heat")
+
+    for params in ({}, {'query': "   "}):
+        response = client.get("/api/search", query_string=params)
+        assert response.status_code == 400
+        assert response.get_json() == {'error': "'query' is required"}
+
+def test_batch_search(monkeypatch):
+    calls = fake_searches(monkeypatch)
+    client = app.app.test_client()
+
+    response = client.post("/api/search/batch", json={'queries': ["heat", "alien"]})
+    assert response.status_code == 200
+    assert response.get_json() == {'results': [[{'title': "heat", 'link1': None, 'link2': None}],
+                                               [{'title': "alien", 'link1': None, 'link2': None}]]}
+    response = client.post("/api/search/batch", json={'queries': ["heat"], 'search_type': "general"})
+    assert response.get_json() == {'results': [[]]}
+    assert calls[-1] == ('general', ["heat"])
+
+    for body in (["heat"], {'queries': "heat"}, {'queries': ["heat", 3]},
+                 {'queries': ["q"] * (app.MAX_BATCH_QUERIES + 1)}):
+        response = client.post("/api/search/batch", json=body)
+        assert response.status_code == 400, body
+        assert set(response.get_json()) == {'error'}
+    response = client.post("/api/search/batch", data="not json", content_type="application/json")
+    assert response.status_code == 400
+    assert len(calls) == 2
+
+def test_posters_stream_ndjson(monkeypatch):
+    import models.omdb_poster
+    requested = []
+
+    def iter_movie_posters(titles):
+        requested.append(titles)
+        for title in dict.fromkeys(titles):
+            yield title, None if title == "Unknown" else f"https://posters/{title}.jpg"
+
+    monkeypatch.setattr(models.omdb_poster, "iter_movie_posters", iter_movie_posters)
+    client = app.app.test_client()
+
+    response = client.post("/api/posters", json={'titles': ["Heat (1995)", "Unknown", "Heat (1995)"]})
+    assert response.status_code == 200
+    assert response.mimetype == "application/x-ndjson"
+    lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert lines == [{'title': "Heat (1995)", 'poster_url': "https://posters/Heat (1995).jpg"},
+                     {'title': "Unknown", 'poster_url': None}]
+
+    for body in ({}, {'titles': "Heat"}, {'titles': [1]}, {'titles': ["t"] * (app.MAX_POSTER_TITLES + 1)}):
+        response = client.post("/api/posters", json=body)
+        assert response.status_code == 400, body
+        assert set(response.get_json()) == {'error'}
+    assert len(requested) == 1
+
+def test_batch_validates_facets(monkeypatch):
+    calls = fake_searches(monkeypatch)
+    client = app.app.test_client()
+    for body in ({'queries': ["heat"], 'genres': [1]},
+                 {'queries': ["heat"], 'genres': {'Crime': True}},
+                 {'queries': ["heat"], 'year_from': "nineties"},
+                 {'queries': ["heat"], 'year_to': 1999.5},
+                 {'queries': ["heat"], 'year_from': True}):
+        response = client.post("/api/search/batch", json=body)
+        assert response.status_code == 400, body
+        assert 'error' in response.get_json()
+    assert calls == []
+
+    response = client.post("/api/search/batch", json={'queries': ["heat"], 'genres': "Crime", 'year_from': "1990",
+                                                      'year_to': 2000})
+    assert response.status_code == 200
+    assert calls[-1] == (["heat"], (1990, 2000), ["Crime"])
+    client.post("/api/search/batch", json={'queries': ["heat"], 'year_to': None, 'genres': []})
+    assert calls[-1] == (["heat"], (None, None), [])
+    client.post("/api/search/batch", json={'queries': ["heat"]})
+    assert calls[-1] == (["heat"], DEFAULT_YEAR_RANGE, [])
+
+def test_search_validates_years(monkeypatch):
+    calls = fake_searches(monkeypatch)
+    client = app.app.test_client()
+    response = client.get("/api/search", query_string={'query': "heat", 'year_from': "199x"})
+    assert response.status_code == 400
+    assert "year_from" in response.get_json()['error']
+    assert calls == []
+
+    response = client.get("/api/search", query_string={'query': "heat", 'year_from': "1990", 'year_to': ""})
+    assert response.status_code == 200
+    assert calls[-1] == ("heat", (1990, None), [])
+
+if __name__ == "__main__":
+    for test in (test_search, test_batch_search, test_posters_stream_ndjson):
+        with pytest.MonkeyPatch.context() as mp:
+            test(mp)
+    with pytest.MonkeyPatch.context() as mp:
+        test_batch_validates_facets(mp)
+    with pytest.MonkeyPatch.context() as mp:
+        test_search_validates_years(mp)
+    print("✅ Search API returns the documented status codes and shapes")
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Test script for the fingerprinted artifact store
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+from models.artifacts import ArtifactStore, committed_path
+
+def write_source(path, text, mtime_ns):
+    with open(path, 'w') as f:
+        f.write(text)
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+def builder(store, content, calls):
+    def build():
+        calls.append(store.version)
+        with store.writing('data.txt') as tmp_path:
+            with open(tmp_path, 'w') as f:
+                f.write(content)
+    return build
+
+def read(path):
+    with open(path) as f:
+        return f.read()
+
+def test_rebuilds_only_on_change(tmp_path):
+    source = str(tmp_path / 'movies.csv')
+    write_source(source, 'a', 1_000_000_000)
+    cache_dir = str(tmp_path / 'cache')
+    calls = []
+
+    store = ArtifactStore('demo', [source], {'k1': 1.5}, cache_dir)
+    assert store.ensure(builder(store, 'v1', calls)) is True
+    # Nothing changed: a new store for the same inputs reuses the build
+    same = ArtifactStore('demo', [source], {'k1': 1.5}, cache_dir)
+    assert same.version == store.version and same.is_valid()
+    assert same.ensure(builder(same, 'unused', calls)) is False
+    assert len(calls) == 1
+
+    # Params change
+    tuned = ArtifactStore('demo', [source], {'k1': 2.0}, cache_dir)
+    assert not tuned.is_valid()
+    assert tuned.ensure(builder(tuned, 'v2', calls)) is True
+
+    # Same size and contents, new mtime
+    os.utime(source, ns=(2_000_000_000, 2_000_000_000))
+    touched = ArtifactStore('demo', [source], {'k1': 2.0}, cache_dir)
+    assert touched.version != tuned.version
+    assert touched.ensure(builder(touched, 'v3', calls)) is True
+    assert len(calls) == 3
+    assert read(committed_path('demo', 'data.txt', cache_dir)) == 'v3'
+
+def test_crash_before_manifest_keeps_previous_build(tmp_path):
+    source = str(tmp_path / 'movies.csv')
+    write_source(source, 'a', 1_000_000_000)
+    cache_dir = str(tmp_path / 'cache')
+    old = ArtifactStore('demo', [source], None, cache_dir)
+    old.ensure(builder(old, 'old', []))
+
+    write_source(source, 'ab', 2_000_000_000)
+    new = ArtifactStore('demo', [source], None, cache_dir)
+
+    def crash():
+        with new.writing('data.txt') as tmp_path:
+            with open(tmp_path, 'w') as f:
+                f.write('half')
+        raise RuntimeError("build died")
+
+    with pytest.raises(RuntimeError):
+        new.ensure(crash)
+    # The manifest still names the old build, whose files are intact
+    assert old.is_valid() and not new.is_valid()
+    assert read(committed_path('demo', 'data.txt', cache_dir)) == 'old'
+
+    # The next attempt builds and publishes the new version
+    assert new.ensure(builder(new, 'new', [])) is True
+    assert read(committed_path('demo', 'data.txt', cache_dir)) == 'new'
+
+def test_commit_removes_old_versions(tmp_path):
+    source = str(tmp_path / 'movies.csv')
+    write_source(source, 'a', 1_000_000_000)
+    cache_dir = str(tmp_path / 'cache')
+    versions = []
+    for k1 in (1.0, 1.5, 2.0):
+        store = ArtifactStore('demo', [source], {'k1': k1}, cache_dir)
+        store.ensure(builder(store, str(k1), []))
+        versions.append(store.version)
+
+    dirs = sorted(e for e in os.listdir(os.path.join(cache_dir, 'demo'))
+                  if os.path.isdir(os.path.join(cache_dir, 'demo', e)))
+    assert dirs == [versions[-1]]
+    assert store.read_manifest()['files'] == ['data.txt']
+
+if __name__ == "__main__":
+    import tempfile
+    import pathlib
+    for test in (test_rebuilds_only_on_change, test_crash_before_manifest_keeps_previous_build,
+                 test_commit_removes_old_versions):
+        with tempfile.TemporaryDirectory() as tmp:
+            test(pathlib.Path(tmp))
+    print("✅ Artifact store rebuilds, reuses and publishes builds atomically")
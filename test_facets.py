@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Test script for the year and genre facet filters
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from models.facets import Facets, DEFAULT_YEAR_RANGE
+
+def make_facets():
+    return Facets.from_frame(pd.DataFrame({
+        'title': ["Heat (1995)", "Alien (1979)", "Up (2009)", "Untitled", "Se7en (1995)"],
+        'genres': ["Action|Crime|Thriller", "Horror|Sci-Fi", "Animation|Children", "Drama", "Crime|Mystery"],
+    }))
+
+def test_year_bounds_are_inclusive():
+    facets = make_facets()
+    assert facets.mask((1995, 2009)).tolist() == [True, False, True, False, True]
+    assert facets.mask((None, 1995)).tolist() == [True, True, False, False, True]
+    assert facets.mask((2000, None)).tolist() == [False, False, True, False, False]
+    # No year range drops the filter, titles without a year included
+    assert facets.mask(None).tolist() == [True] * 5
+    assert facets.mask(DEFAULT_YEAR_RANGE).tolist() == [True, False, True, False, True]
+
+def test_genres_match_any():
+    facets = make_facets()
+    assert facets.mask(None, ["crime"]).tolist() == [True, False, False, False, True]
+    assert facets.mask(None, ["Horror", "Animation"]).tolist() == [False, True, True, False, False]
+    # Combined with a year range, both filters apply
+    assert facets.mask((1990, None), ["Sci-Fi", "Mystery"]).tolist() == [False, False, False, False, True]
+
+def test_default_mask_is_shared():
+    facets = make_facets()
+    assert facets.mask() is facets.default_mask
+    assert facets.mask(DEFAULT_YEAR_RANGE, []) is facets.default_mask
+
+def test_unknown_genre_is_rejected(monkeypatch):
+    facets = make_facets()
+    with pytest.raises(ValueError, match="Unknown genre 'Cartoon'"):
+        facets.mask(None, ["Horror", "Cartoon"])
+
+    # The API reports it as a bad request
+    import app
+    import models.bm25_search
+
+    def search_specific(query, year_range, genres, fetch_posters):
+        return [{'row': int(i)} for i in np.flatnonzero(facets.mask(year_range, genres))]
+
+    monkeypatch.setattr(models.bm25_search, "search_specific", search_specific)
+    client = app.app.test_client()
+    response = client.get("/api/search", query_string={'query': "heat", 'genres': ["Cartoon"]})
+    assert response.status_code == 400
+    assert "Unknown genre" in response.get_json()['error']
+    response = client.get("/api/search", query_string={'query': "heat", 'genres': ["Crime"]})
+    assert response.status_code == 200
+    assert response.get_json() == {'results': [{'row': 0}, {'row': 4}]}
+
+if __name__ == "__main__":
+    test_year_bounds_are_inclusive()
+    test_genres_match_any()
+    test_default_mask_is_shared()
+    with pytest.MonkeyPatch.context() as mp:
+        test_unknown_genre_is_rejected(mp)
+    print("✅ Facet masks filter by year and genre")
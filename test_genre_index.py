@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Test script for the precompiled genre index against the per-movie scoring loop
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import re
+
+from models.fast_genre_recommend import create_genre_keywords, get_genre_index, parse_user_preferences
+from models.title_catalog import get_catalog
+
+PREFERENCES = [
+    "action comedy latest",
+    "classic horror 1980s",
+    "sci-fi 2015",
+    "indian bollywood 2000s 1990s",
+    "xyz",
+]
+
+# === Reference: the per-movie scoring the index replaced ===
+def load_movies_from_links(txt_path="data/movies_links.txt"):
+    movies, title_keywords = [], {}
+    for title in get_catalog(txt_path).titles:
+        year_match = re.search(r'\((\d{4})\)', title)
+        clean_title = re.sub(r'\(\d{4}\)', '', title).strip()
+        movies.append({'title': title, 'clean_title': clean_title,
+                       'year': int(year_match.group(1)) if year_match else 1900})
+        title_keywords[title] = set(re.findall(r'\b\w+\b', clean_title.lower()))
+    return {'movies': movies, 'title_keywords': title_keywords}
+
+def calculate_movie_score(movie, user_genres, user_years, title_keywords):
+    score = 0
+    movie_title = movie['clean_title'].lower()
+    movie_year = movie['year']
+    movie_keywords = title_keywords.get(movie['title'], set())
+
+    for genre in user_genres:
+        for keyword in create_genre_keywords().get(genre, []):
+            if keyword in movie_title or keyword in movie_keywords:
+                score += 2
+                break
+
+    for year in user_years:
+        try:
+            if abs(movie_year - int(year)) <= 5:
+                score += 1
+        except ValueError:
+            continue
+
+    if 'latest' in user_genres and movie_year >= 2020:
+        score += 3
+    if 'classic' in user_genres and movie_year < 2000:
+        score += 3
+    if movie_year >= 2010:
+        score += 0.5
+    if len(movie['clean_title']) < 30:
+        score += 0.3
+    return score
+
+def reference_top(preferences, n=20):
+    """The original per-movie loop: score, stable sort, de-duplicate"""
+    processed = load_movies_from_links()
+    user_genres, user_years = parse_user_preferences(preferences)
+    if not user_genres and not user_years:
+        user_genres = ['action', 'comedy', 'drama']
+
+    scored = [(movie, calculate_movie_score(movie, user_genres, user_years, processed['title_keywords']))
+              for movie in processed['movies']]
+    scored = [(movie, score) for movie, score in scored if score > 0]
+    scored.sort(key=lambda x: x[1], reverse=True)
+
+    seen, top = set(), []
+    for movie, score in scored:
+        if movie['title'].lower() not in seen and len(top) < n:
+            seen.add(movie['title'].lower())
+            top.append((movie['title'], score))
+    return top
+
+def test_genre_index_matches_reference():
+    """Vectorized scores and ranking equal the per-movie loop"""
+    index = get_genre_index()
+    for preferences in PREFERENCES:
+        user_genres, user_years = parse_user_preferences(preferences)
+        if not user_genres and not user_years:
+            user_genres = ['action', 'comedy', 'drama']
+        rows, scores = index.top(user_genres, user_years, 20)
+        top = [(index.catalog.titles[row], score) for row, score in zip(rows, scores.tolist())]
+        assert top == reference_top(preferences), preferences
+
+if __name__ == "__main__":
+    test_genre_index_matches_reference()
+    print("✅ Genre index matches the per-movie scoring loop")
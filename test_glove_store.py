@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Test script for the memory-mapped GloVe store
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+import pytest
+
+from models.glove_store import GloVeStore
+
+GLOVE_TEXT = """the 0.1 0.2 0.3
+dark 1.0 0.0 -1.0
+darkness 2.0 2.0 2.0
+knight 0.5 0.5 0.5
+café 3.0 0.0 0.0
+dark 9.0 9.0 9.0
+"""
+
+def build_store(tmp_path):
+    path = tmp_path / "glove.txt"
+    path.write_text(GLOVE_TEXT, encoding="utf-8")
+    return GloVeStore.build(str(path), str(tmp_path / "store"))
+
+def test_lookup_exact_words_only(tmp_path):
+    store = build_store(tmp_path)
+    assert isinstance(store.matrix, np.memmap)
+
+    # Input order is kept and unknown words are dropped
+    ids = store.lookup(["knight", "unknown", "the", ""])
+    assert [store.vocab[i].decode() for i in ids] == ["knight", "the"]
+
+    # "darkness" is the widest key; a longer word must not match it as a truncated prefix
+    assert "darknesses" not in store and "darkn" not in store
+    assert "darkness" in store and "café" in store
+    assert store["darkness"].tolist() == [2.0, 2.0, 2.0]
+    # Later duplicates win
+    assert store["dark"].tolist() == [9.0, 9.0, 9.0]
+    with pytest.raises(KeyError):
+        store["missing"]
+
+def test_mean_vector(tmp_path):
+    store = build_store(tmp_path)
+    assert np.allclose(store.mean_vector(["the", "knight", "nope"]), [0.3, 0.35, 0.4])
+    assert store.mean_vector(["nope"]) is None
+    assert store.mean_vector([]) is None
+
+if __name__ == "__main__":
+    import tempfile
+    import pathlib
+    for test in (test_lookup_exact_words_only, test_mean_vector):
+        with tempfile.TemporaryDirectory() as tmp:
+            test(pathlib.Path(tmp))
+    print("✅ GloVe lookups match exact words only")
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Test script for concurrent OMDB poster fetching against a local stub server
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+from models.omdb_poster import OMDBPosterFetcher
+from models.poster_cache import PosterCache
+
+STUB_DELAY = 0.2
+
+class StubOMDBHandler(BaseHTTPRequestHandler):
+    """Answers like OMDB: a poster for every title except 'Unknown'"""
+
+    def do_GET(self):
+        params = parse_qs(urlparse(self.path).query)
+        title = params.get('t', [''])[0]
+        year = params.get('y', [''])[0]
+        time.sleep(STUB_DELAY)
+
+        if title == 'Unknown':
+            body = {'Response': 'False', 'Error': 'Movie not found!'}
+        else:
+            body = {'Response': 'True', 'Title': title, 'Poster': f'http://posters/{title}/{year}.jpg'}
+
+        payload = json.dumps(body).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+def start_stub_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubOMDBHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def test_batch_posters_in_input_order():
+    """Results follow input order, duplicates are fetched once, misses are None"""
+    server = start_stub_server()
+    try:
+        fetcher = OMDBPosterFetcher(base_url=f"http://127.0.0.1:{server.server_port}/",
+                                    max_workers=8, requests_per_second=100, burst=10)
+        titles = [f"Movie {i} (20{i:02d})" for i in range(8)] + ["Unknown", "Movie 0 (2000)"]
+
+        started = time.monotonic()
+        posters = fetcher.fetch_movie_posters(titles)
+        elapsed = time.monotonic() - started
+
+        assert posters[:8] == [f"http://posters/Movie {i}/20{i:02d}.jpg" for i in range(8)]
+        assert posters[8] is None
+        assert posters[9] == posters[0]
+        # 9 distinct lookups served serially would take 9 * STUB_DELAY
+        assert elapsed < 4 * STUB_DELAY, elapsed
+    finally:
+        server.shutdown()
+
+def test_iter_posters_yields_as_lookups_finish(tmp_path):
+    """Cached titles come out first; every distinct title appears once"""
+    server = start_stub_server()
+    try:
+        fetcher = OMDBPosterFetcher(base_url=f"http://127.0.0.1:{server.server_port}/",
+                                    requests_per_second=100, burst=10,
+                                    cache=PosterCache(str(tmp_path / "omdb.sqlite3")))
+        fetcher.fetch_movie_poster("Heat (1995)")
+
+        streamed = list(fetcher.iter_movie_posters(["Movie 1 (2001)", "Heat (1995)", "Unknown", "Heat (1995)"]))
+        assert streamed[0] == ("Heat (1995)", "http://posters/Heat/1995.jpg")
+        assert dict(streamed) == {"Movie 1 (2001)": "http://posters/Movie 1/2001.jpg",
+                                  "Heat (1995)": "http://posters/Heat/1995.jpg", "Unknown": None}
+        assert len(streamed) == 3
+    finally:
+        server.shutdown()
+
+def test_rate_limiter_spaces_requests():
+    """The token bucket caps throughput once the burst is spent"""
+    server = start_stub_server()
+    try:
+        fetcher = OMDBPosterFetcher(base_url=f"http://127.0.0.1:{server.server_port}/",
+                                    max_workers=8, requests_per_second=10, burst=1)
+        started = time.monotonic()
+        fetcher.fetch_movie_posters([f"Movie {i}" for i in range(6)])
+        # The first request uses the burst token, the other five wait 0.1 s each
+        assert time.monotonic() - started >= 0.45
+    finally:
+        server.shutdown()
+
+def test_poster_cache_serves_repeats_and_misses(tmp_path):
+    """Found and not-found answers are both served from the on-disk cache"""
+    server = start_stub_server()
+    try:
+        cache = PosterCache(str(tmp_path / "omdb.sqlite3"))
+        fetcher = OMDBPosterFetcher(base_url=f"http://127.0.0.1:{server.server_port}/",
+                                    requests_per_second=100, burst=10, cache=cache)
+        first = fetcher.fetch_movie_posters(["Heat (1995)", "Unknown"])
+        # Normalized key: case and spacing differences hit the same entry
+        second = fetcher.fetch_movie_posters(["heat  (1995)", "Unknown"])
+
+        assert first == second == ["http://posters/Heat/1995.jpg", None]
+        assert cache.stats()['misses'] == 2
+        assert cache.stats()['hits'] == 1 and cache.stats()['negative_hits'] == 1
+
+        # An expired negative entry is looked up again
+        cache.negative_ttl = 0
+        fetcher.fetch_movie_poster("Unknown")
+        assert cache.stats()['misses'] == 3
+    finally:
+        server.shutdown()
+
+if __name__ == "__main__":
+    import tempfile
+    import pathlib
+    test_batch_posters_in_input_order()
+    test_rate_limiter_spaces_requests()
+    with tempfile.TemporaryDirectory() as tmp:
+        test_iter_posters_yields_as_lookups_finish(pathlib.Path(tmp))
+    with tempfile.TemporaryDirectory() as tmp:
+        test_poster_cache_serves_repeats_and_misses(pathlib.Path(tmp))
+    print("✅ Batch poster fetching works against the stub server")
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Test script for top-k selection
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+
+from models.ranking import top_k_indices
+
+def stable_top(scores, k, mask=None):
+    """The reference: first k rows of a stable descending sort"""
+    order = [i for i in np.argsort(-np.asarray(scores), kind='stable') if mask is None or mask[i]]
+    return order[:k]
+
+def test_ties_keep_position_order():
+    scores = np.array([1.0, 3.0, 2.0, 3.0, 2.0, 2.0, 0.0, 3.0])
+    # The third 3.0 and the first two 2.0s make the cut, in position order
+    assert top_k_indices(scores, 5).tolist() == [1, 3, 7, 2, 4]
+    assert top_k_indices(scores, 4).tolist() == [1, 3, 7, 2]
+    assert top_k_indices(np.zeros(6), 3).tolist() == [0, 1, 2]
+
+def test_matches_stable_sort_with_mask():
+    rng = np.random.default_rng(0)
+    for _ in range(50):
+        scores = rng.integers(0, 5, 40).astype(float)  # Many ties
+        mask = rng.random(40) < 0.6
+        for k in (0, 1, 7, 40, 100):
+            assert top_k_indices(scores, k).tolist() == stable_top(scores, k)
+            assert top_k_indices(scores, k, mask=mask).tolist() == stable_top(scores, k, mask)
+
+if __name__ == "__main__":
+    test_ties_keep_position_order()
+    test_matches_stable_sort_with_mask()
+    print("✅ top_k_indices equals a stable descending sort")
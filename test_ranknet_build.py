@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Test script for building the RankNet recommendation table without torch
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+import pandas as pd
+
+from models.build import StageTimer, build_ranknet
+from models.ranknet_numpy import NumpyRankNet
+from models.ranknet_engine import RankNetEngine
+from models.user_recs import UserRecTable, MovieMatrix, feature_artifacts, ranknet_artifacts
+
+def write_movielens(data_dir, n_movies=60, n_users=25, seed=0):
+    rng = np.random.default_rng(seed)
+    os.makedirs(data_dir, exist_ok=True)
+    movie_ids = np.arange(1, n_movies + 1) * 2
+    pd.DataFrame({
+        'movieId': movie_ids,
+        'title': [f"Movie {i} ({1980 + i % 40})" for i in range(n_movies)],
+        'genres': ['|'.join(['Action', 'Drama', 'Comedy'][:1 + i % 3]) for i in range(n_movies)],
+    }).to_csv(os.path.join(data_dir, "movies.csv"), index=False)
+    pd.DataFrame({
+        'userId': rng.integers(1, n_users + 1, 400),
+        'movieId': rng.choice(movie_ids, 400),
+        'rating': rng.integers(1, 11, 400) / 2,
+        'timestamp': 0,
+    }).to_csv(os.path.join(data_dir, "ratings.csv"), index=False)
+    pd.DataFrame({'tagId': [1, 2], 'tag': ['dark', 'funny']}).to_csv(os.path.join(data_dir, "genome-tags.csv"), index=False)
+    pd.DataFrame({
+        'movieId': np.repeat(movie_ids, 2),
+        'tagId': np.tile([1, 2], n_movies),
+        'relevance': rng.random(2 * n_movies),
+    }).to_csv(os.path.join(data_dir, "genome-scores.csv"), index=False)
+
+def test_builds_table_without_training_stack(tmp_path, monkeypatch):
+    """With exported weights, the ranknet stage needs neither torch, skorch nor scikit-learn"""
+    for module in ('torch', 'skorch', 'sklearn'):
+        monkeypatch.setitem(sys.modules, module, None)  # Any import of it raises ImportError
+    monkeypatch.chdir(tmp_path)
+    write_movielens(os.path.join("data", "ml-latest"))
+
+    rng = np.random.default_rng(1)
+    net = NumpyRankNet([rng.normal(size=(8, 3)), rng.normal(size=(1, 8))], [rng.normal(size=8), rng.normal(size=1)])
+    os.makedirs("cache")
+    net.save(os.path.join("cache", "ranknet_weights.npz"))
+
+    build_ranknet(StageTimer(), "cache")
+
+    weights_path = os.path.join("cache", "ranknet_weights.npz")
+    store = ranknet_artifacts(feature_artifacts(os.path.join("data", "ml-latest"), "cache"), weights_path, "cache")
+    assert store.is_valid()
+
+    # Paths come from the arguments: a second data set builds its own table
+    write_movielens(os.path.join("other", "ml"), n_users=7, seed=3)
+    build_ranknet(StageTimer(), "other_cache", data_dir=os.path.join("other", "ml"), weights_path=weights_path)
+    other = ranknet_artifacts(feature_artifacts(os.path.join("other", "ml"), "other_cache"), weights_path, "other_cache")
+    other_ratings = pd.read_csv(os.path.join("other", "ml", "ratings.csv"))
+    assert UserRecTable.load(other.path("user_recs")).user_ids.tolist() == sorted(other_ratings['userId'].unique().tolist())
+    table = UserRecTable.load(store.path("user_recs"))
+    movies = MovieMatrix.load(store.path("movies"))
+    ratings = pd.read_csv(os.path.join("data", "ml-latest", "ratings.csv"))
+    # Every user of the full ratings file, not only those in the feature sample
+    assert table.user_ids.tolist() == sorted(ratings['userId'].unique().tolist())
+
+    # The table holds the weights' own ranking of the recent movies
+    expected_ids, _ = movies.top(net, 200)
+    user = int(table.user_ids[0])
+    assert table.recs(user)[0].tolist() == expected_ids.tolist()
+
+    engine = RankNetEngine(cache_dir="cache", weights_path=weights_path)
+    assert engine.ranked_titles(user) == movies.titles_of(expected_ids)
+    assert engine.ranked_titles(10_000) is None
+    assert engine.build_version == store.version
+
+def test_rebuilds_only_when_sources_change(tmp_path, monkeypatch):
+    """An up-to-date table is reused without reading any CSV; new weights rebuild it"""
+    monkeypatch.chdir(tmp_path)
+    write_movielens(os.path.join("data", "ml-latest"))
+    rng = np.random.default_rng(2)
+    weights_path = os.path.join("cache", "ranknet_weights.npz")
+    os.makedirs("cache")
+    NumpyRankNet([rng.normal(size=(4, 3)), rng.normal(size=(1, 4))], [rng.normal(size=4), rng.normal(size=1)]).save(weights_path)
+    build_ranknet(StageTimer(), "cache")
+    version = ranknet_artifacts(feature_artifacts(os.path.join("data", "ml-latest"), "cache"), weights_path, "cache").version
+
+    import models.ranknet_features as rf
+
+    def no_reads(*args, **kwargs):
+        raise AssertionError("data read for an up-to-date table")
+
+    # Neither the CSVs nor the cached features are opened
+    with monkeypatch.context() as mp:
+        mp.setattr(rf, "load_features", no_reads)
+        build_ranknet(StageTimer(), "cache")
+
+    # New weights rescore the table from the cached features, without another pass over the CSVs
+    NumpyRankNet([rng.normal(size=(4, 3)), rng.normal(size=(1, 4))], [rng.normal(size=4), rng.normal(size=1)]).save(weights_path)
+    os.utime(weights_path, ns=(0, os.stat(weights_path).st_mtime_ns + 1_000_000_000))
+    with monkeypatch.context() as mp:
+        mp.setattr(rf, "load_data", no_reads)
+        build_ranknet(StageTimer(), "cache")
+    store = ranknet_artifacts(feature_artifacts(os.path.join("data", "ml-latest"), "cache"), weights_path, "cache")
+    assert store.is_valid() and store.version != version
+    assert RankNetEngine(cache_dir="cache", weights_path=weights_path).warmup().build_version == store.version
+
+def test_skips_without_weights_or_training_stack(tmp_path, monkeypatch):
+    for module in ('torch', 'skorch', 'sklearn'):
+        monkeypatch.setitem(sys.modules, module, None)
+    monkeypatch.chdir(tmp_path)
+    write_movielens(os.path.join("data", "ml-latest"))
+
+    build_ranknet(StageTimer(), "cache")
+    weights_path = os.path.join("cache", "ranknet_weights.npz")
+    assert not ranknet_artifacts(feature_artifacts(os.path.join("data", "ml-latest"), "cache"), weights_path, "cache").is_valid()
+
+if __name__ == "__main__":
+    import tempfile
+    import pathlib
+    import pytest
+    with tempfile.TemporaryDirectory() as tmp:
+        with pytest.MonkeyPatch.context() as mp:
+            test_builds_table_without_training_stack(pathlib.Path(tmp), mp)
+    with tempfile.TemporaryDirectory() as tmp:
+        with pytest.MonkeyPatch.context() as mp:
+            test_rebuilds_only_when_sources_change(pathlib.Path(tmp), mp)
+    with tempfile.TemporaryDirectory() as tmp:
+        with pytest.MonkeyPatch.context() as mp:
+            test_skips_without_weights_or_training_stack(pathlib.Path(tmp), mp)
+    print("✅ RankNet table builds from exported weights without torch")
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Test script for the torch-free RankNet forward pass
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+import pytest
+
+from models.ranknet_numpy import NumpyRankNet
+
+def random_state_dict(seed=0, num_features=3, hidden=32):
+    rng = np.random.default_rng(seed)
+    return {
+        'hidden.0.weight': rng.normal(size=(hidden, num_features)).astype(np.float32),
+        'hidden.0.bias': rng.normal(size=hidden).astype(np.float32),
+        'hidden.2.weight': rng.normal(size=(1, hidden)).astype(np.float32),
+        'hidden.2.bias': rng.normal(size=1).astype(np.float32),
+    }
+
+def test_forward_matches_reference_mlp(tmp_path):
+    """Linear -> ReLU -> Linear, identical after a save/load roundtrip"""
+    state = random_state_dict()
+    net = NumpyRankNet.from_state_dict(state)
+    batch = np.random.default_rng(1).normal(size=(100, 3)).astype(np.float32)
+
+    hidden = np.maximum(batch @ state['hidden.0.weight'].T + state['hidden.0.bias'], 0)
+    expected = hidden @ state['hidden.2.weight'].T + state['hidden.2.bias']
+    scores = net(batch)
+    assert scores.shape == (100, 1) and scores.dtype == np.float32
+    assert np.allclose(scores, expected, atol=1e-6)
+
+    net.save(str(tmp_path / "weights.npz"))
+    loaded = NumpyRankNet.load(str(tmp_path / "weights.npz"))
+    assert loaded.num_features == 3
+    assert np.array_equal(loaded(batch), scores)
+
+def test_committed_weights_load():
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "ranknet_weights.npz")
+    if not os.path.exists(path):
+        pytest.skip("no exported weights")
+    net = NumpyRankNet.load(path)
+    assert net.num_features == 3 and net(np.zeros((2, 3))).shape == (2, 1)
+
+def test_matches_torch_module():
+    """Within float32 tolerance of the torch RankNet it was exported from"""
+    torch = pytest.importorskip("torch")
+    from models.ranknet_recommend import RankNet
+
+    torch.manual_seed(0)
+    model = RankNet(num_features=3)
+    net = NumpyRankNet.from_state_dict(model.state_dict())
+    batch = np.random.default_rng(2).normal(size=(1000, 3)).astype(np.float32)
+    with torch.no_grad():
+        expected = model(torch.from_numpy(batch)).numpy()
+    assert np.allclose(net(batch), expected, atol=1e-5)
+
+if __name__ == "__main__":
+    import tempfile
+    import pathlib
+    with tempfile.TemporaryDirectory() as tmp:
+        test_forward_matches_reference_mlp(pathlib.Path(tmp))
+    test_committed_weights_load()
+    try:
+        test_matches_torch_module()
+    except pytest.skip.Exception:
+        pass
+    print("✅ NumPy RankNet matches the reference forward pass")
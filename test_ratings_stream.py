@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Test script for the chunked ratings and genome-score readers
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+import pandas as pd
+
+from models.ratings_stream import ReservoirSampler, RatedUsers, stream_ratings, relevant_tag_text
+
+def write_ratings(path, n_rows=5000, seed=0):
+    rng = np.random.default_rng(seed)
+    ratings = pd.DataFrame({
+        'userId': rng.integers(1, 300, n_rows),
+        'movieId': rng.integers(1, 2000, n_rows),
+        'rating': rng.integers(1, 11, n_rows) / 2,
+        'timestamp': rng.integers(10 ** 9, 2 * 10 ** 9, n_rows),
+    })
+    ratings.to_csv(path, index=False)
+    return ratings
+
+def test_aggregates_match_groupby(tmp_path):
+    """Chunked per-movie mean and count (and the rating users) equal a full-file groupby"""
+    path = str(tmp_path / "ratings.csv")
+    ratings = write_ratings(path)
+    users = RatedUsers()
+    sample, aggregates = stream_ratings(path, sample_size=100, chunk_size=700, users=users)
+    assert users.ids().tolist() == sorted(ratings['userId'].unique().tolist())
+
+    expected = ratings.groupby('movieId').agg(avg_rating=('rating', 'mean'), rating_count=('userId', 'count')).reset_index()
+    assert aggregates['movieId'].tolist() == expected['movieId'].tolist()
+    assert aggregates['rating_count'].tolist() == expected['rating_count'].tolist()
+    assert np.allclose(aggregates['avg_rating'], expected['avg_rating'])
+
+    assert len(sample) == 100 and sample['userId'].dtype == np.int32 and sample['rating'].dtype == np.float32
+    # Every sampled row is a real row of the file
+    rows = set(map(tuple, ratings[['userId', 'movieId', 'rating']].to_numpy().tolist()))
+    assert all(tuple(row) in rows for row in sample[['userId', 'movieId', 'rating']].to_numpy().tolist())
+
+def test_reservoir_is_uniform():
+    """Each stream position is kept with probability size / n, whatever the chunking"""
+    n, size, trials = 200, 20, 2000
+    stream = pd.DataFrame({'position': np.arange(n)})
+    kept = np.zeros(n)
+    for seed in range(trials):
+        sampler = ReservoirSampler(size, seed=seed)
+        for start in range(0, n, 37):
+            sampler.add(stream.iloc[start:start + 37])
+        sample = sampler.sample()['position'].to_numpy()
+        assert len(np.unique(sample)) == size
+        kept[sample] += 1
+    frequency = kept / trials
+    assert np.abs(frequency - size / n).max() < 0.04
+    # Early and late rows are equally likely to survive
+    assert abs(frequency[:n // 2].mean() - frequency[n // 2:].mean()) < 0.01
+
+def test_tag_text_matches_full_read(tmp_path):
+    scores_path, tags_path = str(tmp_path / "genome-scores.csv"), str(tmp_path / "genome-tags.csv")
+    rng = np.random.default_rng(1)
+    movie_ids, tag_ids = np.meshgrid(np.arange(1, 40), np.arange(1, 25), indexing='ij')
+    pd.DataFrame({'movieId': movie_ids.ravel(), 'tagId': tag_ids.ravel(),
+                  'relevance': rng.random(movie_ids.size).round(5)}).to_csv(scores_path, index=False)
+    pd.DataFrame({'tagId': np.arange(1, 25), 'tag': [f"tag{i}" for i in range(1, 25)]}).to_csv(tags_path, index=False)
+
+    scores, tags = pd.read_csv(scores_path), pd.read_csv(tags_path)
+    top_tags = scores[scores['relevance'] > 0.3].merge(tags, on='tagId')
+    expected = top_tags.groupby('movieId')['tag'].apply(lambda tags: ' '.join(tags)).reset_index()
+
+    streamed = relevant_tag_text(scores_path, tags_path, chunk_size=100)
+    assert streamed['movieId'].tolist() == expected['movieId'].tolist()
+    assert streamed['tag'].tolist() == expected['tag'].tolist()
+
+if __name__ == "__main__":
+    import tempfile
+    import pathlib
+    with tempfile.TemporaryDirectory() as tmp:
+        test_aggregates_match_groupby(pathlib.Path(tmp))
+        test_tag_text_matches_full_read(pathlib.Path(tmp))
+    test_reservoir_is_uniform()
+    print("✅ Streaming ratings ingestion matches the in-memory results")
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Test script for the search result cache
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from models.result_cache import ResultCache, SharedResultStore
+
+def make_search(cache, version):
+    calls = []
+
+    @cache.cached('test', version=lambda args: version[0])
+    def search(query, top_k=10):
+        calls.append(query)
+        return [{'title': query.strip(), 'rank': i} for i in range(top_k)]
+
+    return search, calls
+
+def test_normalized_hits_and_version_invalidation():
+    """Spacing variants share an entry; a new build version misses"""
+    version = ['v1']
+    cache = ResultCache(maxsize=8, ttl=60)
+    search, calls = make_search(cache, version)
+
+    first = search("Dark  Knight")
+    assert search(" Dark Knight ") == first
+    assert search("Dark Knight", top_k=3) != first
+    # Case is kept: correction and ranking can differ by case
+    assert search("dark knight")[0]['title'] == "dark knight"
+    assert len(calls) == 3
+
+    # The function sees the normalized query, so a hit equals a fresh computation
+    assert calls == ["Dark Knight", "Dark Knight", "dark knight"]
+    assert first == search.uncached("Dark Knight")
+
+    # Returned results are copies; mutating one does not poison the cache
+    first[0]['title'] = 'changed'
+    assert search("Dark Knight")[0]['title'] == "Dark Knight"
+
+    version[0] = 'v2'
+    search("Dark Knight")
+    assert len(calls) == 5
+    stats = cache.stats()
+    assert stats['hits'] == 2 and stats['misses'] == 4
+
+def test_lru_and_ttl_eviction():
+    """The oldest entry goes first and expired entries are recomputed"""
+    cache = ResultCache(maxsize=2, ttl=60)
+    search, calls = make_search(cache, ['v1'])
+    search("a"), search("b"), search("a"), search("c")
+    search("a")
+    assert calls == ["a", "b", "c"]
+    search("b")
+    assert calls == ["a", "b", "c", "b"]
+
+    cache.ttl = -1
+    search("x"), search("x")
+    assert calls[-2:] == ["x", "x"]
+
+def test_shared_store_serves_other_workers(tmp_path):
+    """A second cache (another worker) reuses results through SQLite"""
+    path = str(tmp_path / "results.sqlite3")
+    worker_a = ResultCache(shared=SharedResultStore(path))
+    worker_b = ResultCache(shared=SharedResultStore(path))
+    search_a, calls_a = make_search(worker_a, ['v1'])
+    search_b, calls_b = make_search(worker_b, ['v1'])
+
+    expected = search_a("heat")
+    assert search_b("heat") == expected
+    assert calls_a == ["heat"] and calls_b == []
+    assert worker_b.stats()['shared_hits'] == 1
+
+if __name__ == "__main__":
+    import tempfile
+    import pathlib
+    test_normalized_hits_and_version_invalidation()
+    test_lru_and_ttl_eviction()
+    with tempfile.TemporaryDirectory() as tmp:
+        test_shared_store_serves_other_workers(pathlib.Path(tmp))
+    print("✅ Result cache works")
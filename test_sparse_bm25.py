@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Test script for the sparse BM25 index
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+from rank_bm25 import BM25Okapi
+
+from models.sparse_bm25 import SparseBM25
+
+CORPUS = [
+    ['toy', 'stori', '1995'],
+    ['toy', 'stori', '2', '1999'],
+    ['jumanji', '1995'],
+    ['grumpier', 'old', 'men', '1995'],
+    ['dark', 'knight', '2008'],
+    ['dark', 'knight', 'rise', '2012'],
+    ['knight', 'knight', 'day', '2010'],
+    [],
+]
+
+QUERIES = [
+    ['toy', 'stori'],
+    ['dark', 'knight'],
+    ['knight', 'knight'],
+    ['1995'],
+    ['unknown'],
+    [],
+]
+
+def test_scores_match_bm25okapi():
+    """Dense and sparse scores must equal BM25Okapi exactly"""
+    reference = BM25Okapi(CORPUS)
+    index = SparseBM25.from_corpus(CORPUS)
+
+    for query in QUERIES:
+        expected = reference.get_scores(query)
+        assert np.array_equal(index.get_scores(query), expected), query
+
+        doc_ids, scores = index.get_sparse_scores(query)
+        dense = np.zeros(len(CORPUS))
+        dense[doc_ids] = scores
+        assert np.array_equal(dense, expected), query
+
+def test_conjunctive_mode_keeps_only_full_matches():
+    """AND mode ranks exactly the documents containing every query term"""
+    index = SparseBM25.from_corpus(CORPUS)
+
+    for query in QUERIES:
+        doc_ids, scores = index.get_sparse_scores(query, require_all=True)
+        expected = [i for i, doc in enumerate(CORPUS) if query and all(t in doc for t in query)]
+        assert doc_ids.tolist() == expected, query
+        assert np.array_equal(scores, index.get_scores(query)[doc_ids]), query
+
+def test_mask_filters_before_scoring():
+    """A document mask removes documents without changing the others' scores"""
+    index = SparseBM25.from_corpus(CORPUS)
+    mask = np.array([i % 2 == 0 for i in range(len(CORPUS))])
+
+    for require_all in (False, True):
+        for query in QUERIES:
+            doc_ids, scores = index.get_sparse_scores(query, require_all=require_all)
+            masked_ids, masked_scores = index.get_sparse_scores(query, require_all=require_all, mask=mask)
+            assert masked_ids.tolist() == doc_ids[mask[doc_ids]].tolist(), query
+            assert np.array_equal(masked_scores, scores[mask[doc_ids]]), query
+
+def test_batch_scoring_matches_single_queries():
+    """Batched dense scores equal the per-query results exactly"""
+    index = SparseBM25.from_corpus(CORPUS)
+
+    dense = index.get_scores_batch(QUERIES)
+    for row, query in enumerate(QUERIES):
+        assert np.array_equal(dense[row], index.get_scores(query)), query
+
+def test_save_and_load_roundtrip(tmp_path):
+    """The on-disk form must reload to the same scorer"""
+    index = SparseBM25.from_corpus(CORPUS)
+    path = tmp_path / "bm25.npz"
+    index.save(path)
+    loaded = SparseBM25.load(path)
+
+    assert loaded.vocab == index.vocab
+    for query in QUERIES:
+        assert np.array_equal(loaded.get_scores(query), index.get_scores(query)), query
+
+if __name__ == "__main__":
+    import tempfile
+    import pathlib
+    test_scores_match_bm25okapi()
+    test_conjunctive_mode_keeps_only_full_matches()
+    test_mask_filters_before_scoring()
+    test_batch_scoring_matches_single_queries()
+    with tempfile.TemporaryDirectory() as tmp:
+        test_save_and_load_roundtrip(pathlib.Path(tmp))
+    print("✅ Sparse BM25 matches BM25Okapi")
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Test script for cold start: cheap app import and offline NLTK resources
+"""
+
+import sys
+import os
+import subprocess
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+from models import nltk_resources
+from models.startup_report import parse_importtime, import_time_by_package
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+def test_app_import_defers_engines():
+    """Importing the app loads no engine, NLTK, pandas or HTTP client"""
+    heavy = ['nltk', 'pandas', 'sklearn', 'requests', 'models.bm25_search', 'models.hybrid_search',
+             'models.fast_genre_recommend', 'models.ranknet_engine']
+    code = f"import sys, app; print([m for m in {heavy!r} if m in sys.modules])"
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert out.stdout.strip().splitlines()[-1] == "[]"
+
+def test_engine_modules_defer_their_dependencies():
+    """Engine modules load NLTK, pandas and rapidfuzz only when they tokenize, build or correct"""
+    code = ("import sys, models.bm25_search, models.hybrid_search, models.fast_genre_recommend, "
+            "models.ranknet_engine; "
+            "print([m for m in ('nltk', 'pandas', 'rapidfuzz', 'requests', 'sklearn') if m in sys.modules])")
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert out.stdout.strip().splitlines()[-1] == "[]"
+
+def test_missing_nltk_data_never_downloads(monkeypatch):
+    nltk = pytest.importorskip("nltk")
+
+    def not_found(resource):
+        raise LookupError(resource)
+
+    def no_network(*args, **kwargs):
+        raise AssertionError("nltk.download called at runtime")
+
+    monkeypatch.setattr(nltk.data, "find", not_found)
+    monkeypatch.setattr(nltk, "download", no_network)
+    nltk_resources.stop_words.cache_clear()
+    with pytest.raises(LookupError, match="models.build --stages nltk"):
+        nltk_resources.stop_words()
+    assert nltk_resources.missing(['punkt', 'stopwords']) == ['punkt', 'stopwords']
+
+def test_import_time_by_package():
+    stderr = "\n".join([
+        "import time: self [us] | cumulative | imported package",
+        "import time:       300 |        300 |     numpy.core",
+        "import time:       200 |        500 |   numpy",
+        "import time:      1000 |       1000 |   models.bm25_search",
+        "import time:        50 |       1550 | app",
+    ])
+    entries = parse_importtime(stderr)
+    assert entries[0] == ('numpy.core', 0.0003, 0.0003)
+    packages = import_time_by_package(entries)
+    assert [name for name, _ in packages] == ['models.bm25_search', 'numpy', 'app']
+    assert packages[1][1] == pytest.approx(0.0005)
+
+if __name__ == "__main__":
+    test_app_import_defers_engines()
+    test_engine_modules_defer_their_dependencies()
+    test_import_time_by_package()
+    print("✅ App imports without loading its engines")
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Test script for the packed, memory-mapped string column
+"""
+
+import sys
+import os
+import tracemalloc
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+
+from models.string_column import StringColumn, find_sorted
+
+STRINGS = ["Toy Story (1995)", "", "Amélie (2001)", "ΣΟΦΙΑ (2010)", "Heat (1995)"]
+
+def test_roundtrip_through_mmap(tmp_path):
+    column = StringColumn.from_strings(STRINGS)
+    column.save(str(tmp_path / "titles"))
+    loaded = StringColumn.load(str(tmp_path / "titles"))
+    for col in (column, loaded):
+        assert len(col) == len(STRINGS)
+        assert list(col) == STRINGS
+        assert [col[i] for i in range(len(STRINGS))] == STRINGS
+        assert col[-1] == STRINGS[-1]
+        assert col.take([3, 0, 1, 3]) == [STRINGS[3], STRINGS[0], STRINGS[1], STRINGS[3]]
+
+def test_reads_do_not_copy_the_buffer(tmp_path):
+    column = StringColumn.from_strings([f"Movie number {i} ({1900 + i % 120})" for i in range(200_000)])
+    column.save(str(tmp_path / "big"))
+    loaded = StringColumn.load(str(tmp_path / "big"))
+
+    tracemalloc.start()
+    try:
+        loaded.take([5, 100_000, 199_999])
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert peak < loaded.buffer.nbytes // 10
+
+def test_find_sorted_fixed_width_keys():
+    """Exact matches only: no prefix matches from truncated keys, empty keys absent"""
+    keys = np.array(sorted([b"ab", b"abc", b"b", b"zz"]), dtype=bytes)
+    queries = [b"abc", b"abcd", b"a", b"", b"zz", b"zzz", b"b"]
+    assert find_sorted(keys, queries).tolist() == [1, -1, -1, -1, 3, -1, 2]
+
+    grams = np.sort(np.array(["ark", "dar", "kni"], dtype="U3"))
+    assert find_sorted(grams, ["kni", "darkness", "xyz"]).tolist() == [2, -1, -1]
+    assert find_sorted(np.array([], dtype="S1"), [b"a"]).tolist() == [-1]
+
+if __name__ == "__main__":
+    import tempfile
+    import pathlib
+    for test in (test_roundtrip_through_mmap, test_reads_do_not_copy_the_buffer):
+        with tempfile.TemporaryDirectory() as tmp:
+            test(pathlib.Path(tmp))
+    test_find_sorted_fixed_width_keys()
+    print("✅ String column reads without copying its buffer")
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Test script for the shared title -> links catalog
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from models.title_catalog import TitleCatalog, get_catalog
+from models.fast_genre_recommend import get_genre_index
+
+LINES = [
+    "Alpha (2000)|https://a/1|null",
+    "Beta (1999)|null|https://b/2",
+    "Café Society (2016)|https://c/1|https://c/2",
+    "ALPHA (2000)|https://a/dup|null",
+    "Gamma (2010)",
+]
+
+def write_links(path, lines):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+
+def test_find_and_result(tmp_path):
+    path = str(tmp_path / "links.txt")
+    write_links(path, LINES)
+    catalog = TitleCatalog.load(path)
+
+    assert len(catalog) == len(LINES)
+    assert list(catalog.titles) == [line.split("|")[0] for line in LINES]
+    # Case-insensitive, and the last duplicate wins
+    assert catalog.find("alpha (2000)") == 3
+    assert catalog.find("  Alpha (2000) ") == 3
+    assert catalog.find("café society (2016)") == 2
+    assert catalog.find("Alpha") is None
+    assert catalog.find("Alpha (2000) and more") is None
+
+    assert catalog.result(1) == {"title": "Beta (1999)", "link1": None, "link2": "https://b/2"}
+    assert catalog.links(4) == (None, None)
+
+def test_missing_file(tmp_path):
+    catalog = TitleCatalog.load(str(tmp_path / "missing.txt"))
+    assert len(catalog) == 0
+    assert catalog.mtime is None
+    assert catalog.find("Alpha (2000)") is None
+
+def test_reloads_when_mtime_changes(tmp_path):
+    path = str(tmp_path / "links.txt")
+    write_links(path, LINES)
+    catalog = get_catalog(path)
+    assert get_catalog(path) is catalog
+    index = get_genre_index(path)
+    assert get_genre_index(path) is index
+
+    write_links(path, LINES + ["Delta (2021)|https://d/1|null"])
+    # Set the mtime explicitly; a rewrite can land within the filesystem's timestamp granularity
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, catalog.mtime + 1_000_000_000))
+
+    reloaded = get_catalog(path)
+    assert reloaded is not catalog
+    assert reloaded.version == catalog.version + 1
+    assert reloaded.find("delta (2021)") == len(LINES)
+    # A request still holding the old catalog sees its own consistent columns
+    assert catalog.find("delta (2021)") is None and len(catalog) == len(LINES)
+    assert get_genre_index(path).catalog is reloaded
+
+if __name__ == "__main__":
+    import tempfile
+    import pathlib
+    with tempfile.TemporaryDirectory() as tmp:
+        test_find_and_result(pathlib.Path(tmp))
+        test_missing_file(pathlib.Path(tmp))
+        test_reloads_when_mtime_changes(pathlib.Path(tmp))
+    print("✅ Title catalog finds rows by title")
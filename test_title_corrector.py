@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Test script for the q-gram indexed query correction
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+from rapidfuzz import process, fuzz
+
+from models.title_corrector import TitleCorrector
+
+LINKS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "movies_links.txt")
+
+# Equal-scoring candidates: extractOne keeps the earliest, and so must the index
+TIES = [
+    "Alpha (2000)",
+    "Alpha (2001)",
+    "Alpha (2000)",
+    "Beta Gamma (1999)",
+    "Gamma Beta (1999)",
+    "X (2010)",
+]
+
+def reference(query, titles, min_score=85):
+    """The baseline: a full extractOne scan, no processor, so case counts"""
+    best_match, score, _ = process.extractOne(query, titles, scorer=fuzz.token_sort_ratio)
+    return best_match if score > min_score else query
+
+def catalog_titles(limit=3000):
+    with open(LINKS_PATH, encoding="utf-8") as f:
+        return [line.split("|", 1)[0] for line in f if line.strip()][:limit]
+
+def misspell(title, rng):
+    """Drop, double or swap one or two characters"""
+    chars = list(title)
+    for _ in range(rng.integers(1, 3)):
+        if len(chars) < 3:
+            break
+        i = int(rng.integers(0, len(chars) - 1))
+        edit = rng.integers(0, 3)
+        if edit == 0:
+            del chars[i]
+        elif edit == 1:
+            chars.insert(i, chars[i])
+        else:
+            chars[i], chars[i + 1] = chars[i + 1], chars[i]
+    return "".join(chars)
+
+def test_correct_matches_extract_one():
+    titles = catalog_titles() + TIES
+    corrector = TitleCorrector(titles)
+    rng = np.random.default_rng(0)
+
+    queries = [misspell(titles[int(i)], rng) for i in rng.integers(0, len(titles), 300)]
+    # Exact titles, ties, reordered tokens and queries below the threshold
+    queries += ["Alpha (2000)", "alpha (2000)", "Alpha", "Beta Gamma", "Gamma Beta (1999)",
+                "X", "qwertyuiop", "", "the", "Knight Dark The"]
+    for query in queries:
+        for min_score in (85, 60):
+            assert corrector.correct(query, min_score) == reference(query, titles, min_score), (query, min_score)
+
+def test_case_variants_match_baseline():
+    """Lowercased and uppercased queries correct exactly as the baseline scan does"""
+    titles = catalog_titles(limit=None) + TIES
+    corrector = TitleCorrector(titles)
+    rng = np.random.default_rng(1)
+    picked = [titles[int(i)] for i in rng.integers(0, len(titles), 20)]
+    queries = ["the dark knight (2008)", "Dark Knight The (2008)", "DARK KNIGHT THE (2008)", "alpha (2000)"]
+    queries += [variant for title in picked for variant in (title.lower(), title.upper(), misspell(title.lower(), rng))]
+    for query in queries:
+        assert corrector.correct(query) == reference(query, titles), query
+
+def test_memoized_corrections_are_stable():
+    corrector = TitleCorrector(TIES)
+    assert corrector.correct("Alpa (2000)") == "Alpha (2000)"
+    assert corrector.correct("Alpa (2000)") == "Alpha (2000)"
+    assert corrector.correct("zzzz") == "zzzz"
+
+if __name__ == "__main__":
+    test_correct_matches_extract_one()
+    test_case_variants_match_baseline()
+    test_memoized_corrections_are_stable()
+    print("✅ Indexed correction matches extractOne")
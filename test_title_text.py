@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Test script for the vectorized title substring search
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+
+from models.title_text import TitleText
+
+TITLES = [
+    "Toy Story (1995)",
+    "The Dark Knight (2008)",
+    "Dark Knight Rises, The (2012)",
+    "Amélie (Fabuleux destin d'Amélie Poulain, Le) (2001)",
+    "ΣΟΦΙΑ (2010)",
+    "",
+    "Knight and Day (2010)",
+]
+
+NEEDLES = ["dark", "knight", "the dark knight", "a", "é", "amélie", "σοφια", ")\nthe", "(2010)",
+           "zzz", "", "\n", "y (1995)\nthe"]
+
+def test_contains_matches_python_substring():
+    """contains() must equal `needle in title.lower()` for every title"""
+    text = TitleText(TITLES)
+    for needle in NEEDLES:
+        expected = np.array([needle in title.lower() for title in TITLES])
+        assert np.array_equal(text.contains(needle), expected), needle
+
+def test_contains_any_matches_python_loop():
+    """contains_any() must equal any(token in title.lower())"""
+    text = TitleText(TITLES)
+    for needles in (["dark", "toy"], ["zzz"], [], ["", "zzz"], ["knight", "knight"]):
+        expected = np.array([any(n in title.lower() for n in needles) for title in TITLES])
+        assert np.array_equal(text.contains_any(needles), expected), needles
+
+if __name__ == "__main__":
+    test_contains_matches_python_substring()
+    test_contains_any_matches_python_loop()
+    print("✅ Title substring search matches Python's `in`")
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Test script for batched user-recommendation scoring and the compact table
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from models.user_recs import (UserRecTable, MovieMatrix, score_in_batches, top_movies,
+                              feature_artifacts, ranknet_artifacts)
+from models.ranknet_engine import RankNetEngine
+from models.ranknet_numpy import NumpyRankNet
+
+def movies_frame(n=500, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'movieId': np.arange(1, n + 1) * 3,
+        'title': [f"Movie {i} ({rng.integers(1960, 2020)})" for i in range(n)],
+        'text_len': rng.integers(1, 40, n).astype(float),
+        'genre_count': rng.integers(1, 6, n).astype(float),
+        'rating_norm': rng.random(n),
+    })
+
+def linear_model(batch):
+    return batch @ np.array([[0.02], [-0.1], [1.0]], dtype=np.float32)
+
+def test_batched_top_movies_match_sorted_frame():
+    """Batch scoring + masked top-k equals the per-user DataFrame filter and sort"""
+    movies = movies_frame()
+    features = ['text_len', 'genre_count', 'rating_norm']
+    scores = score_in_batches(linear_model, movies[features].to_numpy(), batch_size=64)
+    assert np.array_equal(scores, linear_model(movies[features].to_numpy(dtype=np.float32))[:, 0])
+
+    years = movies['title'].str.extract(r'\((\d{4})\)')[0].astype(float).to_numpy()
+    movie_ids, top_scores = top_movies(scores, movies['movieId'].to_numpy(), 200, mask=years >= 1990)
+
+    expected = movies.assign(score=scores, year=years)
+    expected = expected[expected['year'] >= 1990].sort_values('score', ascending=False, kind='stable').head(200)
+    assert movie_ids.tolist() == expected['movieId'].tolist()
+    assert movie_ids.dtype == np.int32 and top_scores.dtype == np.float32
+
+def test_table_roundtrip_and_lookup(tmp_path):
+    movies = movies_frame()
+    titles_by_id = dict(zip(movies['movieId'], movies['title']))
+    lists = [(np.array([3, 6, 9]), np.array([0.9, 0.5, 0.1])), (np.array([12]), np.array([0.7]))]
+    table = UserRecTable.from_lists(np.array([40, 7, 12]), np.array([1, 0, 0]), lists, titles_by_id)
+    table.save(str(tmp_path / "user_recs"))
+
+    assert UserRecTable.exists(str(tmp_path / "user_recs"))
+    loaded = UserRecTable.load(str(tmp_path / "user_recs"))
+    assert isinstance(loaded.list_movie_ids, np.memmap)
+    assert len(loaded) == 3 and 7 in loaded and "12" in loaded and 8 not in loaded and "x" not in loaded
+
+    movie_ids, scores = loaded.recs(7)
+    assert movie_ids.tolist() == [3, 6, 9] and np.allclose(scores, [0.9, 0.5, 0.1])
+    assert loaded.recs(40)[0].tolist() == [12]
+    assert loaded.recs(99) is None
+    assert loaded.titles_of(movie_ids) == [titles_by_id[3], titles_by_id[6], titles_by_id[9]]
+
+def test_shared_table_stores_one_list():
+    movies = movies_frame()
+    titles_by_id = dict(zip(movies['movieId'], movies['title']))
+    table = UserRecTable.shared(np.array([5, 1, 5, 3]), np.array([9, 3]), np.array([2.0, 1.0]), titles_by_id)
+    assert table.user_ids.tolist() == [1, 3, 5]
+    assert table.list_movie_ids.shape == (1, 2)
+    assert all(table.recs(u)[0].tolist() == [9, 3] for u in (1, 3, 5))
+
+def test_movie_matrix_ranks_recent_movies(tmp_path):
+    movies = movies_frame()
+    features = ['text_len', 'genre_count', 'rating_norm']
+    matrix = MovieMatrix.from_frame(movies, features)
+    matrix.save(str(tmp_path / "movies"))
+    loaded = MovieMatrix.load(str(tmp_path / "movies"))
+
+    movie_ids, scores = loaded.top(linear_model, 50)
+    years = movies.set_index('movieId').loc[movie_ids, 'title'].str.extract(r'\((\d{4})\)')[0].astype(int)
+    assert (years >= 1990).all() and np.all(np.diff(scores) <= 0)
+    assert loaded.titles_of(movie_ids[:3]) == movies.set_index('movieId').loc[movie_ids[:3], 'title'].tolist()
+
+def test_engine_ranks_once_or_falls_back(tmp_path, monkeypatch):
+    """Model scores when available, the precomputed table otherwise; unknown users get None"""
+    movies = movies_frame()
+    matrix = MovieMatrix.from_frame(movies, ['text_len', 'genre_count', 'rating_norm'])
+    table_ids, table_scores = matrix.top(lambda batch: -batch[:, 2], 200)
+    links = tmp_path / "links.txt"
+    links.write_text("".join(f"{title}|l1|l2\n" for title in movies['title']), encoding='utf-8')
+
+    def engine_for(weights_path):
+        cache_dir, data_dir = str(tmp_path / "cache"), str(tmp_path / "data")
+        store = ranknet_artifacts(feature_artifacts(data_dir, cache_dir), weights_path, cache_dir)
+        store.ensure(lambda: (matrix.save(store.path("movies")),
+                              UserRecTable.shared([1, 2], table_ids, table_scores,
+                                                  matrix.titles_by_id()).save(store.path("user_recs"))))
+        engine = RankNetEngine(cache_dir=cache_dir, weights_path=weights_path, data_dir=data_dir).warmup()
+        assert engine.build_version == store.version
+        return engine
+
+    engine = engine_for(str(tmp_path / "missing.npz"))
+    assert engine.score_fn is None
+    fallback = engine.recommend("1", top_k=5, txt_path=str(links))
+    assert [r['title'] for r in fallback] == matrix.titles_of(table_ids[:5])
+    assert engine.recommend("3", txt_path=str(links)) is None
+
+    rng = np.random.default_rng(3)
+    net = NumpyRankNet([rng.normal(size=(4, 3)), rng.normal(size=(1, 4))], [rng.normal(size=4), rng.normal(size=1)])
+    net.save(str(tmp_path / "weights.npz"))
+    forward_passes = []
+    top = MovieMatrix.top
+    monkeypatch.setattr(MovieMatrix, "top", lambda self, *args, **kwargs: forward_passes.append(1) or top(self, *args, **kwargs))
+    engine = engine_for(str(tmp_path / "weights.npz"))
+    # The ranking is user-independent: scored once in warmup, shared by every known user
+    expected = matrix.titles_of(top(matrix, net, 5)[0])
+    for user_id in (1, "2", 2):
+        assert [r['title'] for r in engine.recommend(user_id, top_k=5, txt_path=str(links))] == expected
+    assert engine.recommend(3, txt_path=str(links)) is None
+    assert len(forward_passes) == 1
+
+if __name__ == "__main__":
+    import tempfile
+    import pathlib
+    test_batched_top_movies_match_sorted_frame()
+    with tempfile.TemporaryDirectory() as tmp:
+        test_table_roundtrip_and_lookup(pathlib.Path(tmp))
+    test_shared_table_stores_one_list()
+    with tempfile.TemporaryDirectory() as tmp:
+        test_movie_matrix_ranks_recent_movies(pathlib.Path(tmp))
+    with tempfile.TemporaryDirectory() as tmp:
+        with pytest.MonkeyPatch.context() as mp:
+            test_engine_ranks_once_or_falls_back(pathlib.Path(tmp), mp)
+    print("✅ Batched user recommendations match the per-user loop")